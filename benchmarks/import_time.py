@@ -0,0 +1,74 @@
+"""Cold import time of the djust_auth package.
+
+Each run imports the package in a fresh interpreter, the way a new worker
+or management command does. Usage::
+
+    python -m benchmarks.import_time --runs 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+_SNIPPET = """
+import sys, time
+before = set(sys.modules)
+start = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - start) * 1000
+print(elapsed, len(set(sys.modules) - before))
+"""
+
+
+def time_import(module="djust_auth"):
+    """Return (milliseconds, modules loaded) for one cold import."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (os.path.abspath(SRC_DIR), env.get("PYTHONPATH")) if p
+    )
+    output = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", _SNIPPET.format(module=module)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    return float(output[0]), int(output[1])
+
+
+def measure_import(runs, module="djust_auth"):
+    """Result dict in the format of ``benchmarks.run.measure``."""
+    from benchmarks.run import percentile
+
+    samples = [time_import(module) for _ in range(runs)]
+    timings = sorted(ms for ms, _ in samples)
+    return {
+        "iterations": runs,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "max_ms": round(timings[-1], 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": 0,
+        "modules": max(count for _, count in samples),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--module", default="djust_auth")
+    args = parser.parse_args(argv)
+    result = measure_import(args.runs, args.module)
+    print(
+        f"import {args.module}: p50 {result['p50_ms']:.3f}ms  "
+        f"p99 {result['p99_ms']:.3f}ms  {result['modules']} modules"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""Run the djust-auth benchmark suite.
+
+Usage (from the repository root)::
+
+    python -m benchmarks.run --users 10000 --output benchmarks/results/local.json
+    python -m benchmarks.run --users 1000000 --compare benchmarks/results/baseline.json
+
+The SQLite database for each dataset size is kept under ``benchmarks/.data``
+and only seeded once. Each scenario reports latency percentiles (ms) and
+the number of queries per iteration, and scenarios that send LiveView
+patches also their size in bytes. With ``--compare`` the run fails (exit
+status 1) if any scenario's p50 latency regressed by more than
+``--threshold`` percent or it issues more queries or sends a larger payload
+than the baseline.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from benchmarks import settings as bench_settings  # noqa: E402
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def measure(case, env, iterations, warmup):
+    from django.db import connection
+
+    queries = []
+
+    def count_queries(execute, sql, params, many, context):
+        queries[-1] += 1
+        return execute(sql, params, many, context)
+
+    for _ in range(warmup):
+        if case.setup:
+            case.setup(env)
+        case.func(env)
+
+    timings = []
+    payloads = []
+    for _ in range(iterations):
+        if case.setup:
+            case.setup(env)
+        queries.append(0)
+        with connection.execute_wrapper(count_queries):
+            start = time.perf_counter()
+            payload = case.func(env)
+            timings.append((time.perf_counter() - start) * 1000)
+        if payload is not None:
+            payloads.append(payload)
+
+    timings.sort()
+    result = {
+        "iterations": iterations,
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p90_ms": round(percentile(timings, 90), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "max_ms": round(timings[-1], 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "queries": max(queries),
+    }
+    if payloads:
+        result["payload_bytes"] = max(payloads)
+    return result
+
+
+def compare(results, baseline, threshold):
+    """Return a list of regression messages against ``baseline``."""
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            continue
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: {before['queries']} -> {result['queries']} queries"
+            )
+        if result.get("payload_bytes", 0) > before.get("payload_bytes", math.inf):
+            regressions.append(
+                f"{name}: {before['payload_bytes']} -> {result['payload_bytes']} "
+                "payload bytes"
+            )
+        limit = before["p50_ms"] * (1 + threshold / 100)
+        if result["p50_ms"] > limit:
+            regressions.append(
+                f"{name}: p50 {before['p50_ms']}ms -> {result['p50_ms']}ms"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument(
+        "--accounts", type=int, help="Social accounts to seed (default: = users)."
+    )
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", help="Run scenarios whose name contains this.")
+    parser.add_argument(
+        "--import-runs",
+        type=int,
+        default=10,
+        help="Fresh interpreters for the cold import scenario (0 to skip).",
+    )
+    parser.add_argument("--output", help="Write results to this JSON file.")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=20.0,
+        help="Allowed p50 slowdown in percent (default: 20).",
+    )
+    args = parser.parse_args(argv)
+    accounts = args.users if args.accounts is None else args.accounts
+
+    os.makedirs(bench_settings.DATA_DIR, exist_ok=True)
+    db_path = os.path.join(bench_settings.DATA_DIR, f"bench-{args.users}-{accounts}.sqlite3")
+    bench_settings.configure(db_path)
+
+    import django
+
+    import djust_auth
+    from benchmarks.scenarios import SCENARIOS, make_env
+    from benchmarks.seed import ensure_dataset
+
+    ensure_dataset(args.users, accounts, stdout=sys.stdout)
+    env = make_env()
+
+    results = {}
+    if args.import_runs and (not args.only or args.only in "import.djust_auth"):
+        from benchmarks.import_time import measure_import
+
+        results["import.djust_auth"] = result = measure_import(args.import_runs)
+        print(
+            f"{'import.djust_auth':40} p50 {result['p50_ms']:9.3f}ms  "
+            f"p99 {result['p99_ms']:9.3f}ms  {result['modules']:3d} modules"
+        )
+    for case in SCENARIOS:
+        if args.only and args.only not in case.name:
+            continue
+        results[case.name] = result = measure(case, env, args.iterations, args.warmup)
+        line = (
+            f"{case.name:40} p50 {result['p50_ms']:9.3f}ms  "
+            f"p99 {result['p99_ms']:9.3f}ms  {result['queries']:3d} queries"
+        )
+        if "payload_bytes" in result:
+            line += f"  {result['payload_bytes']:7d} bytes"
+        print(line)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "djust_auth": getattr(djust_auth, "__version__", "unknown"),
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "users": args.users,
+            "social_accounts": accounts,
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as fh:
+            json.dump(report, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+
+    if args.compare:
+        with open(args.compare) as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
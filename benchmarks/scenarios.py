@@ -0,0 +1,287 @@
+"""Benchmarked code paths.
+
+Each scenario is a function taking the benchmark environment; an optional
+``setup`` runs before every iteration, outside the timed region (for
+example to clear caches for a cold measurement). A scenario may return a
+number of bytes it sent, which is reported as ``payload_bytes``.
+"""
+
+import json
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.views import View
+
+SCENARIOS = []
+
+
+def scenario(name, setup=None):
+    def register(func):
+        SCENARIOS.append(SimpleNamespace(name=name, func=func, setup=setup))
+        return func
+
+    return register
+
+
+def make_env():
+    User = get_user_model()
+    admin = User.objects.get(username="bench-admin")
+    member = User.objects.exclude(pk=admin.pk).order_by("pk").first()
+    member.user_permissions.add(
+        *Permission.objects.filter(codename__in=["view_user", "change_user"])
+    )
+    return SimpleNamespace(
+        rf=RequestFactory(), User=User, admin=admin, member_pk=member.pk
+    )
+
+
+def _request(env, user, path="/"):
+    request = env.rf.get(path)
+    request.user = user
+    return request
+
+
+def _clear_cache(env):
+    from django.core.cache import cache
+
+    from djust_auth.social import invalidate_provider_cache
+
+    cache.clear()
+    invalidate_provider_cache()
+
+
+# ---- social_auth_providers ----
+
+
+@scenario("social_auth_providers.cold", setup=_clear_cache)
+def social_auth_providers_cold(env):
+    from djust_auth.social import social_auth_providers
+
+    list(social_auth_providers(_request(env, env.admin))["oauth_providers"])
+
+
+@scenario("social_auth_providers.warm")
+def social_auth_providers_warm(env):
+    from djust_auth.social import social_auth_providers
+
+    list(social_auth_providers(_request(env, env.admin))["oauth_providers"])
+
+
+@scenario("oauth_buttons.render")
+def oauth_buttons_render(env):
+    from django.template.loader import render_to_string
+
+    from djust_auth.social import social_auth_providers
+
+    render_to_string(
+        "djust_auth/includes/oauth_buttons.html",
+        social_auth_providers(_request(env, env.admin)),
+    )
+
+
+@scenario("oauth_buttons.fragment")
+def oauth_buttons_fragment(env):
+    from djust_auth.social import render_oauth_buttons
+
+    render_oauth_buttons()
+
+
+# ---- AuthSummaryWidget ----
+
+
+@scenario("auth_summary_widget.cold", setup=_clear_cache)
+def auth_summary_widget_cold(env):
+    from djust_auth.djust_admin import AuthSummaryWidget
+
+    AuthSummaryWidget().get_context(_request(env, env.admin))
+
+
+@scenario("auth_summary_widget.warm")
+def auth_summary_widget_warm(env):
+    from djust_auth.djust_admin import AuthSummaryWidget
+
+    AuthSummaryWidget().get_context(_request(env, env.admin))
+
+
+# ---- Admin LiveViews ----
+
+
+def _render(view_class, env, **attrs):
+    view = view_class()
+    view.request = _request(env, env.admin, "/admin/auth/")
+    view.get_admin_context = dict
+    # Measure the queries; social_accounts_view.cached_page covers the cache
+    view.page_cache_ttl = 0
+    for name, value in attrs.items():
+        setattr(view, name, value)
+    return view.get_context_data()
+
+
+@scenario("oauth_providers_view.cold", setup=_clear_cache)
+def oauth_providers_view_cold(env):
+    from djust_auth.admin_views import OAuthProvidersView
+
+    _render(OAuthProvidersView, env)
+
+
+@scenario("oauth_providers_view.warm")
+def oauth_providers_view_warm(env):
+    from djust_auth.admin_views import OAuthProvidersView
+
+    _render(OAuthProvidersView, env)
+
+
+@scenario("social_accounts_view.first_page")
+def social_accounts_first_page(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env)
+
+
+@scenario("social_accounts_view.deep_page")
+def social_accounts_deep_page(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env, current_page=200)
+
+
+@scenario("social_accounts_view.sort_username")
+def social_accounts_sort(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env, ordering="user__username")
+
+
+@scenario("social_accounts_view.search")
+def social_accounts_search(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env, search_query="user00012")
+
+
+@scenario("social_accounts_view.filter_provider")
+def social_accounts_filter(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env, filter_provider="gitlab", current_page=3)
+
+
+@scenario("social_accounts_view.cursor_page")
+def social_accounts_cursor(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env, pagination_mode="cursor")
+
+
+@scenario("social_accounts_view.cached_page")
+def social_accounts_cached_page(env):
+    from djust_auth.admin_views import SocialAccountsView
+
+    _render(SocialAccountsView, env, page_cache_ttl=30, current_page=3)
+
+
+# ---- Admin LiveView events ----
+#
+# One mounted view handles an event and renders the diff, as it would for a
+# WebSocket message. These scenarios return the size of the JSON patches,
+# reported as ``payload_bytes``. Each starts from a rendered first page with
+# an empty page cache except for the next page. The background prefetch is
+# off, so no thread queries while an event is timed; page 2 is loaded up
+# front as the prefetch would have done.
+
+
+def _live_client(env):
+    if getattr(env, "live_client", None) is None:
+        from djust.testing import LiveViewTestClient
+        from djust_admin import site
+
+        from djust_auth.admin_views import SocialAccountsView
+
+        class BenchSocialAccountsView(SocialAccountsView):
+            _admin_site = site
+            prefetch_next = False
+
+        env.live_client = LiveViewTestClient(BenchSocialAccountsView, user=env.admin)
+        env.live_client.mount()
+    return env.live_client
+
+
+def _reset_live_view(env):
+    from djust_auth.pagination import social_account_pages
+
+    client = _live_client(env)
+    view = client.view_instance
+    view.ordering = "-date_joined"
+    view.filter_provider = ""
+    view.current_page = 1
+    social_account_pages.clear()
+    client.render_with_patches()
+    pagination = view._get_page()[1]
+    view._next_page_view(pagination)._get_page()
+
+
+def _send(env, event, **params):
+    client = _live_client(env)
+    client.send_event(event, **params)
+    _html, patches, _version = client.render_with_patches()
+    return len(json.dumps(patches, separators=(",", ":")))
+
+
+@scenario("social_accounts_live.sort", setup=_reset_live_view)
+def social_accounts_live_sort(env):
+    return _send(env, "sort_by", field="user__username")
+
+
+@scenario("social_accounts_live.next_page", setup=_reset_live_view)
+def social_accounts_live_next_page(env):
+    return _send(env, "go_to_page", page=2)
+
+
+@scenario("social_accounts_live.filter", setup=_reset_live_view)
+def social_accounts_live_filter(env):
+    return _send(env, "filter_by_provider", value="github")
+
+
+# ---- Mixin dispatch ----
+
+
+def _protected_views():
+    from djust_auth.mixins import (
+        LoginRequiredLiveViewMixin,
+        PermissionRequiredLiveViewMixin,
+    )
+
+    class LoginView(LoginRequiredLiveViewMixin, View):
+        def get(self, request):
+            return HttpResponse("OK")
+
+    class PermissionView(PermissionRequiredLiveViewMixin, View):
+        permission_required = ["auth.view_user", "auth.change_user"]
+
+        def get(self, request):
+            return HttpResponse("OK")
+
+    return LoginView.as_view(), PermissionView.as_view()
+
+
+_VIEWS = {}
+
+
+def _fresh_request(env):
+    if not _VIEWS:
+        _VIEWS["login"], _VIEWS["permission"] = _protected_views()
+    # A fresh user object per request, as the auth middleware provides
+    env.pending_request = _request(env, env.User.objects.get(pk=env.member_pk))
+
+
+@scenario("login_mixin.dispatch", setup=_fresh_request)
+def login_mixin_dispatch(env):
+    _VIEWS["login"](env.pending_request)
+
+
+@scenario("permission_mixin.dispatch", setup=_fresh_request)
+def permission_mixin_dispatch(env):
+    _VIEWS["permission"](env.pending_request)
@@ -0,0 +1,76 @@
+"""Seed the benchmark database with synthetic users and social accounts."""
+
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import transaction
+from django.utils import timezone
+
+from .settings import PROVIDERS
+
+# Any valid hash will do: benchmarks never check passwords
+PASSWORD_HASH = "md5$benchmark$0a3f1d4e5c6b7a8990a1b2c3d4e5f607"
+CHUNK_SIZE = 10000
+
+
+def ensure_dataset(users, accounts, seed=1, stdout=None):
+    """Migrate and seed the database unless it already holds this dataset."""
+    call_command("migrate", verbosity=0, interactive=False)
+    User = get_user_model()
+    from allauth.socialaccount.models import SocialAccount
+
+    if User.objects.count() == users + 1 and SocialAccount.objects.count() == accounts:
+        return False
+    if stdout:
+        stdout.write(f"Seeding {users} users and {accounts} social accounts...\n")
+
+    SocialAccount.objects.all().delete()
+    User.objects.all().delete()
+    rng = random.Random(seed)
+    now = timezone.now()
+
+    User.objects.create(
+        username="bench-admin",
+        email="admin@example.com",
+        password=PASSWORD_HASH,
+        is_staff=True,
+        is_superuser=True,
+    )
+    for start in range(0, users, CHUNK_SIZE):
+        batch = []
+        for i in range(start, min(start + CHUNK_SIZE, users)):
+            joined = now - timedelta(minutes=rng.randrange(2 * 365 * 24 * 60))
+            batch.append(User(
+                username=f"user{i:07d}",
+                email=f"user{i:07d}@example.com",
+                password=PASSWORD_HASH,
+                is_staff=rng.random() < 0.01,
+                date_joined=joined,
+                last_login=joined + timedelta(days=rng.randrange(365)),
+            ))
+        with transaction.atomic():
+            User.objects.bulk_create(batch)
+
+    user_ids = list(
+        User.objects.exclude(username="bench-admin")
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    for start in range(0, accounts, CHUNK_SIZE):
+        batch = []
+        for i in range(start, min(start + CHUNK_SIZE, accounts)):
+            joined = now - timedelta(minutes=rng.randrange(365 * 24 * 60))
+            batch.append(SocialAccount(
+                user_id=user_ids[(i * 7919) % len(user_ids)],
+                # Skewed towards the first providers, like real traffic
+                provider=PROVIDERS[min(int(rng.expovariate(0.8)), len(PROVIDERS) - 1)],
+                uid=str(i),
+                date_joined=joined,
+                last_login=joined,
+                extra_data={},
+            ))
+        with transaction.atomic():
+            SocialAccount.objects.bulk_create(batch)
+    return True
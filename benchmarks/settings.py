@@ -0,0 +1,62 @@
+"""Django settings for the benchmark suite (SQLite, allauth, djust-admin)."""
+
+import os
+
+import django
+from django.conf import settings
+
+PROVIDERS = ["github", "google", "gitlab", "microsoft", "discord"]
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_DIR = os.path.join(BENCHMARK_DIR, ".data")
+
+
+def configure(db_path):
+    settings.configure(
+        SECRET_KEY="benchmark-secret-key-for-djust-auth",
+        DEBUG=False,
+        ALLOWED_HOSTS=["testserver"],
+        DATABASES={
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": db_path,
+            }
+        },
+        INSTALLED_APPS=[
+            "django.contrib.auth",
+            "django.contrib.contenttypes",
+            "django.contrib.sessions",
+            "allauth",
+            "allauth.account",
+            "allauth.socialaccount",
+            *(f"allauth.socialaccount.providers.{p}" for p in PROVIDERS),
+            "djust_admin",
+            "djust_auth",
+        ],
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "APP_DIRS": True,
+                "OPTIONS": {
+                    "context_processors": [
+                        "django.template.context_processors.request",
+                    ],
+                },
+            }
+        ],
+        SOCIALACCOUNT_PROVIDERS={
+            p: {"APP": {"client_id": f"{p}-client-id", "secret": "secret"}}
+            for p in PROVIDERS
+        },
+        ROOT_URLCONF="benchmarks.urls",
+        MIDDLEWARE=[
+            "django.contrib.sessions.middleware.SessionMiddleware",
+            "django.contrib.auth.middleware.AuthenticationMiddleware",
+            "allauth.account.middleware.AccountMiddleware",
+        ],
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+        PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+        DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+        USE_TZ=True,
+    )
+    django.setup()
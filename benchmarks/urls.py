@@ -0,0 +1,8 @@
+from django.urls import include, path
+from djust_admin import site
+
+urlpatterns = [
+    path("accounts/", include("allauth.urls")),
+    path("auth/", include("djust_auth.urls")),
+    path("admin/", site.urls),
+]
@@ -16,12 +16,38 @@ warnings.warn(
     stacklevel=2,
 )
 
-# Re-export everything from the new djust location
-from djust.auth import *  # noqa: F401, F403, E402
-
-try:
-    from djust.auth import __all__  # noqa: E402, F401
-except ImportError:
-    __all__ = []
+# Names re-exported from djust.auth. They are resolved on first access so
+# that importing djust_auth (at startup, via INSTALLED_APPS) does not load the
+# djust.auth module graph. Keep in sync with djust.auth.__all__.
+__all__ = [
+    "check_view_auth",
+    "check_view_auth_lightweight",
+    "check_object_permission",
+    "check_handler_permission",
+    "run_pre_mount_auth",
+    "LoginRequiredMixin",
+    "PermissionRequiredMixin",
+    "SignupView",
+    "DjustLoginView",
+    "logout_view",
+    "SignupForm",
+    "LoginRequiredLiveViewMixin",
+    "PermissionRequiredLiveViewMixin",
+    "social_auth_providers",
+]
 
 __version__ = "99.0.0"
+
+
+def __getattr__(name):
+    if name in __all__:
+        import importlib
+
+        value = getattr(importlib.import_module("djust.auth"), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,7 +1,49 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 
 
 class DjustAuthConfig(AppConfig):
     name = "djust_auth"
     default_auto_field = "django.db.models.BigAutoField"
     verbose_name = "Djust Auth"
+
+    def ready(self):
+        from django.conf import settings
+        from django.core import checks
+
+        from .counters import check_rollups_enabled
+        from .permissions import connect_signals as connect_permission_signals
+        from .revocation import check_shared_cache
+        from .revocation import connect_signals as connect_revocation_signals
+        from .stats import connect_signals as connect_stats_signals
+
+        connect_stats_signals()
+        connect_permission_signals()
+        connect_revocation_signals()
+        checks.register(check_shared_cache, checks.Tags.caches)
+        checks.register(check_rollups_enabled)
+
+        if getattr(settings, "DJUST_AUTH_COUNTERS", False):
+            from .counters import connect_signals
+
+            connect_signals()
+
+        if getattr(settings, "DJUST_AUTH_SEARCH_INDEX", False):
+            from .search import connect_signals as connect_search_signals
+
+            connect_search_signals()
+
+        if getattr(settings, "DJUST_AUTH_ROLLUPS", False):
+            from .rollups import connect_signals as connect_rollup_signals
+
+            connect_rollup_signals()
+
+        from .snapshot import connect_signals as connect_snapshot_signals
+        from .snapshot import is_configured as user_snapshots_configured
+
+        if user_snapshots_configured():
+            connect_snapshot_signals()
+
+        if apps.is_installed("allauth.socialaccount"):
+            from .providers import compile_provider_config
+
+            compile_provider_config()
@@ -0,0 +1,302 @@
+"""Bulk import of users and their linked social accounts.
+
+Used by ``manage.py import_auth_users``. Records are streamed from CSV or
+JSONL, validated a batch at a time (one query per batch for existing
+usernames and emails, one per provider for existing social accounts), and
+written with ``bulk_create`` inside one transaction per batch, so memory is
+bounded by the batch size and an interrupted import can resume after the
+last committed batch.
+
+Record fields: ``username`` (required), ``email``, ``password`` (an
+already-hashed value such as ``pbkdf2_sha256$...``; empty means an unusable
+password), ``first_name``, ``last_name``, ``is_active``, ``is_staff``,
+``is_superuser``, ``date_joined`` (ISO 8601) and ``social_accounts``. In
+JSONL ``social_accounts`` is a list of ``{"provider", "uid", "extra_data"}``
+objects; in CSV it is ``provider:uid`` pairs separated by ``;``.
+
+Users whose username already exists, ignoring case, are skipped with their
+accounts, so re-running an import is safe. An email that matches another
+user's, ignoring case, is reported as an error, as ``SignupForm`` would
+reject it.
+
+Bulk inserts send no model signals. Daily rollups are updated per batch when
+``DJUST_AUTH_ROLLUPS`` is on; run ``rebuild_auth_counters`` and
+``rebuild_auth_search_index`` afterwards if those features are enabled.
+"""
+
+import csv
+import json
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.dateparse import parse_datetime
+
+from .rollups import record_bulk_insert, rollups_enabled
+
+_BOOLEAN_FIELDS = ("is_active", "is_staff", "is_superuser")
+_TRUE = {"1", "true", "yes", "y", "t"}
+
+
+class ImportStats:
+    """Running totals of an import."""
+
+    def __init__(self):
+        self.users = 0
+        self.social_accounts = 0
+        self.skipped = 0
+        self.errors = 0
+        self.last_line = 0
+
+
+def read_records(stream, fmt, start_after=0):
+    """Yield ``(line_number, record)`` pairs from a CSV or JSONL stream.
+
+    Records up to line ``start_after`` are skipped without being parsed
+    (JSONL) or validated. Unparseable JSONL lines yield an error string
+    instead of a dict.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            if reader.line_num <= start_after:
+                continue
+            accounts = []
+            for pair in filter(None, (row.pop("social_accounts", "") or "").split(";")):
+                provider, _, uid = pair.strip().partition(":")
+                accounts.append({"provider": provider, "uid": uid})
+            row["social_accounts"] = accounts
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if line_number <= start_after or not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            record = "expected a JSON object"
+        yield line_number, record
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _as_bool(value, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in _TRUE
+
+
+def build_user(record):
+    """Return an unsaved user for ``record``; raise ValidationError if invalid."""
+    User = get_user_model()
+    username_field = User.USERNAME_FIELD
+    username = (record.get("username") or "").strip()
+    if not username:
+        raise ValidationError("username is required")
+    max_length = User._meta.get_field(username_field).max_length
+    if max_length and len(username) > max_length:
+        raise ValidationError(f"username is longer than {max_length} characters")
+
+    password = record.get("password") or ""
+    if password:
+        try:
+            identify_hasher(password)
+        except ValueError:
+            raise ValidationError("password must be an already-hashed value")
+    else:
+        password = make_password(None)
+
+    fields = {username_field: username, "password": password}
+    email = (record.get("email") or "").strip()
+    if email:
+        validate_email(email)
+        fields[User.get_email_field_name()] = email
+    for name in ("first_name", "last_name"):
+        if record.get(name):
+            fields[name] = record[name]
+    for name in _BOOLEAN_FIELDS:
+        if record.get(name) not in (None, ""):
+            fields[name] = _as_bool(record[name], False)
+    if record.get("date_joined"):
+        date_joined = parse_datetime(record["date_joined"])
+        if date_joined is None:
+            raise ValidationError("date_joined is not an ISO 8601 datetime")
+        fields["date_joined"] = date_joined
+
+    user = User(**fields)
+    accounts = []
+    for account in record.get("social_accounts") or []:
+        provider = (account.get("provider") or "").strip()
+        uid = str(account.get("uid") or "").strip()
+        if not provider or not uid:
+            raise ValidationError("social accounts need a provider and a uid")
+        accounts.append((provider, uid, account.get("extra_data") or {}))
+    return user, accounts
+
+
+def _email_key(user, email_field):
+    return (getattr(user, email_field, "") or "").lower()
+
+
+def import_batch(batch, stats, on_error=None):
+    """Validate and insert one batch of ``(line_number, record)`` pairs."""
+    User = get_user_model()
+    username_field = User.USERNAME_FIELD
+    valid = []
+    for line_number, record in batch:
+        stats.last_line = line_number
+        try:
+            if isinstance(record, str):
+                raise ValidationError(record)
+            user, accounts = build_user(record)
+        except ValidationError as exc:
+            stats.errors += 1
+            if on_error is not None:
+                on_error(line_number, "; ".join(exc.messages))
+            continue
+        valid.append((line_number, user, accounts))
+
+    usernames = {getattr(user, username_field).lower() for _, user, _ in valid}
+    email_field = User.get_email_field_name()
+    has_email = any(f.name == email_field for f in User._meta.concrete_fields)
+    emails = {_email_key(user, email_field) for _, user, _ in valid} - {""}
+    existing, existing_emails = set(), set()
+    users = User._default_manager.annotate(username_lower=Lower(username_field))
+    if has_email:
+        condition = Q(username_lower__in=usernames)
+        if emails:
+            condition |= Q(email_lower__in=emails)
+        rows = (
+            users.annotate(email_lower=Lower(email_field))
+            .filter(condition)
+            .values_list("username_lower", "email_lower")
+        )
+        for username, email in rows:
+            existing.add(username)
+            existing_emails.add(email)
+    else:
+        existing.update(
+            users.filter(username_lower__in=usernames)
+            .values_list("username_lower", flat=True)
+        )
+    SocialAccount = None
+    if apps.is_installed("allauth.socialaccount"):
+        from allauth.socialaccount.models import SocialAccount
+
+    seen_users, seen_emails, seen_accounts, to_create = set(), set(), set(), []
+    for line_number, user, accounts in valid:
+        username = getattr(user, username_field)
+        if username.lower() in existing:
+            stats.skipped += 1
+            continue
+        if username.lower() in seen_users:
+            stats.errors += 1
+            if on_error is not None:
+                on_error(line_number, f"duplicate username {username!r}")
+            continue
+        email = _email_key(user, email_field)
+        if email and (email in existing_emails or email in seen_emails):
+            stats.errors += 1
+            if on_error is not None:
+                reason = "already exists" if email in existing_emails else "is duplicated"
+                on_error(line_number, f"email {email!r} {reason}")
+            continue
+        if accounts and SocialAccount is None:
+            stats.errors += 1
+            if on_error is not None:
+                on_error(line_number, "social accounts need allauth.socialaccount")
+            continue
+        duplicate = next((a[:2] for a in accounts if a[:2] in seen_accounts), None)
+        if duplicate is not None:
+            stats.errors += 1
+            if on_error is not None:
+                on_error(line_number, f"duplicate social account {duplicate!r}")
+            continue
+        seen_users.add(username.lower())
+        if email:
+            seen_emails.add(email)
+        seen_accounts.update(a[:2] for a in accounts)
+        to_create.append((line_number, user, accounts))
+
+    if SocialAccount is not None and seen_accounts:
+        taken = set()
+        by_provider = {}
+        for provider, uid in seen_accounts:
+            by_provider.setdefault(provider, []).append(uid)
+        for provider, uids in by_provider.items():
+            taken.update(
+                SocialAccount.objects.filter(provider=provider, uid__in=uids)
+                .values_list("provider", "uid")
+            )
+        if taken:
+            kept = []
+            for line_number, user, accounts in to_create:
+                clash = next((a[:2] for a in accounts if a[:2] in taken), None)
+                if clash is None:
+                    kept.append((line_number, user, accounts))
+                    continue
+                stats.errors += 1
+                if on_error is not None:
+                    on_error(line_number, f"social account {clash!r} already exists")
+            to_create = kept
+
+    if not to_create:
+        return
+    with transaction.atomic():
+        users = User._default_manager.bulk_create([user for _, user, _ in to_create])
+        if any(user.pk is None for user in users):
+            # Backends that cannot return ids from a bulk insert (MySQL)
+            pks = dict(
+                User._default_manager.filter(
+                    **{f"{username_field}__in": [getattr(u, username_field) for u in users]}
+                ).values_list(username_field, "pk")
+            )
+            for user in users:
+                user.pk = pks[getattr(user, username_field)]
+        social_accounts = [
+            SocialAccount(user_id=user.pk, provider=provider, uid=uid, extra_data=extra)
+            for user, (_, _, accounts) in zip(users, to_create)
+            for provider, uid, extra in accounts
+        ]
+        if social_accounts:
+            SocialAccount.objects.bulk_create(social_accounts)
+        if rollups_enabled():
+            record_bulk_insert(users, social_accounts)
+    stats.users += len(users)
+    stats.social_accounts += len(social_accounts)
+
+
+def import_records(records, batch_size=1000, on_error=None, on_batch=None):
+    """Import ``(line_number, record)`` pairs; return :class:`ImportStats`.
+
+    ``on_batch(stats)`` is called after each committed batch, e.g. to write
+    a checkpoint of ``stats.last_line``.
+    """
+    stats = ImportStats()
+    for batch in _chunks(records, batch_size):
+        import_batch(batch, stats, on_error=on_error)
+        if on_batch is not None:
+            on_batch(stats)
+
+    from .pagination import social_account_pages
+    from .stats import invalidate_linked_providers
+
+    invalidate_linked_providers()
+    social_account_pages.clear()
+    return stats
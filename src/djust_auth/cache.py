@@ -0,0 +1,72 @@
+"""Cache helpers shared by djust-auth.
+
+All cached data goes through the cache alias named by the
+``DJUST_AUTH_CACHE`` setting (default: ``"default"``).
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from .instrumentation import record_cache
+
+
+def get_cache():
+    """Return the cache backend djust-auth stores its data in."""
+    return caches[getattr(settings, "DJUST_AUTH_CACHE", "default")]
+
+
+def _spawn(func):
+    """Run ``func`` in a daemon thread that closes its DB connections."""
+
+    def run():
+        try:
+            func()
+        finally:
+            connections.close_all()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def get_or_refresh(key, compute, ttl, stale_ttl=0):
+    """Return ``compute()``, cached for ``ttl`` seconds.
+
+    After ``ttl`` the value is served stale for up to ``stale_ttl`` more
+    seconds while a single background refresh (guarded by a cache lock, so
+    only one process recomputes) replaces it. A ``ttl`` of 0 disables
+    caching entirely.
+    """
+    if not ttl:
+        return compute()
+
+    cache = get_cache()
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None:
+        fresh_until, value = entry
+        record_cache(True)
+        if now < fresh_until:
+            return value
+        lock_key = f"{key}:refresh"
+        if cache.add(lock_key, 1, timeout=max(int(ttl), 1)):
+
+            def refresh():
+                try:
+                    _store(cache, key, compute(), ttl, stale_ttl)
+                finally:
+                    cache.delete(lock_key)
+
+            _spawn(refresh)
+        return value
+
+    record_cache(False)
+    value = compute()
+    _store(cache, key, value, ttl, stale_ttl)
+    return value
+
+
+def _store(cache, key, value, ttl, stale_ttl):
+    cache.set(key, (time.time() + ttl, value), timeout=ttl + stale_ttl)
@@ -0,0 +1,288 @@
+"""Signal-maintained auth counters.
+
+When ``DJUST_AUTH_COUNTERS = True`` the receivers below keep
+:class:`~djust_auth.models.AuthCounter` rows up to date as users and social
+accounts are created, changed and deleted, so admin statistics can be read
+without scanning the user or social account tables.
+
+Every change is applied with an atomic ``F()`` update inside the caller's
+transaction. Bulk operations that bypass model signals (``bulk_create``,
+``QuerySet.update``) are not tracked; run ``manage.py rebuild_auth_counters``
+after them, or whenever the counters drift.
+
+Social accounts are tracked with the model signals rather than allauth's
+``social_account_added``/``social_account_removed``: those are only sent
+when a user connects or disconnects an account, not for accounts created by
+a social signup or deleted with their user or from the admin.
+
+The counters hold totals only. Enable ``DJUST_AUTH_ROLLUPS`` as well for
+the 7-day signup count; the ``djust_auth.W002`` system check warns when it
+is missing.
+"""
+
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import checks
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Q
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from .models import AuthCounter
+
+_FLAG_FIELDS = ("is_staff", "is_superuser")
+
+# Social accounts whose pre_delete has fired but whose post_delete has not:
+# {user_id: {account_pk: provider}} for the delete started by
+# ``_pending.origin`` (see _social_account_pre_delete).
+_pending = threading.local()
+
+
+def _pending_deletes(origin=None):
+    """Return the pending accounts, starting afresh for a new ``origin``.
+
+    A delete that is rolled back after pre_delete never sends post_delete;
+    its entries are dropped when the next delete on this thread starts.
+    """
+    if origin is not None and getattr(_pending, "origin", None) is not origin:
+        _pending.origin = origin
+        _pending.accounts = {}
+    if not hasattr(_pending, "accounts"):
+        _pending.accounts = {}
+    return _pending.accounts
+
+
+def _bump(scope, last_linked=None, **deltas):
+    """Atomically add ``deltas`` to the counter row for ``scope``."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if last_linked is not None:
+        # Never move backwards (e.g. for an imported, older account)
+        updates["last_linked"] = Greatest(
+            Coalesce(F("last_linked"), last_linked), last_linked
+        )
+    if AuthCounter.objects.filter(scope=scope).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            AuthCounter.objects.create(
+                scope=scope, last_linked=last_linked, **deltas
+            )
+    except IntegrityError:
+        # Another process created the row first
+        AuthCounter.objects.filter(scope=scope).update(**updates)
+
+
+def get_counters():
+    """Return all counter rows keyed by scope (a single query)."""
+    return AuthCounter.objects.in_bulk()
+
+
+def check_rollups_enabled(app_configs=None, **kwargs):
+    """System check: warn when counters are enabled without rollups."""
+    if not getattr(settings, "DJUST_AUTH_COUNTERS", False):
+        return []
+    if getattr(settings, "DJUST_AUTH_ROLLUPS", False):
+        return []
+    return [
+        checks.Warning(
+            "DJUST_AUTH_COUNTERS is enabled without DJUST_AUTH_ROLLUPS.",
+            hint=(
+                "The counters hold totals only, so the auth summary cannot "
+                "show signups for the last 7 days. Set DJUST_AUTH_ROLLUPS = True "
+                "and run manage.py rebuild_auth_rollups."
+            ),
+            id="djust_auth.W002",
+        )
+    ]
+
+
+# ---- User receivers ----
+
+
+def _user_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not set(update_fields) & set(_FLAG_FIELDS):
+        return
+    instance._djust_auth_prev_flags = (
+        sender._default_manager.filter(pk=instance.pk)
+        .values_list(*_FLAG_FIELDS)
+        .first()
+    )
+
+
+def _user_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    is_staff = int(bool(getattr(instance, "is_staff", False)))
+    is_superuser = int(bool(getattr(instance, "is_superuser", False)))
+    if created:
+        _bump(
+            AuthCounter.GLOBAL,
+            users=1,
+            staff_users=is_staff,
+            superusers=is_superuser,
+        )
+        return
+    previous = instance.__dict__.pop("_djust_auth_prev_flags", None)
+    if previous is None:
+        return
+    _bump(
+        AuthCounter.GLOBAL,
+        staff_users=is_staff - int(bool(previous[0])),
+        superusers=is_superuser - int(bool(previous[1])),
+    )
+
+
+def _user_post_delete(sender, instance, **kwargs):
+    _bump(
+        AuthCounter.GLOBAL,
+        users=-1,
+        staff_users=-int(bool(getattr(instance, "is_staff", False))),
+        superusers=-int(bool(getattr(instance, "is_superuser", False))),
+    )
+
+
+# ---- SocialAccount receivers ----
+
+
+def _social_account_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    other_providers = set(
+        sender._default_manager.filter(user_id=instance.user_id)
+        .exclude(pk=instance.pk)
+        .values_list("provider", flat=True)
+    )
+    _bump(
+        AuthCounter.GLOBAL,
+        social_accounts=1,
+        oauth_users=int(not other_providers),
+    )
+    _bump(
+        instance.provider,
+        last_linked=instance.date_joined,
+        social_accounts=1,
+        oauth_users=int(instance.provider not in other_providers),
+    )
+
+
+def _social_account_pre_delete(sender, instance, origin=None, **kwargs):
+    # Django deletes a batch of rows (e.g. all accounts of a deleted user)
+    # in one query and only then sends post_delete for each of them. Track
+    # the batch so "user has no accounts left" is only counted once.
+    pending = _pending_deletes(origin if origin is not None else instance)
+    pending.setdefault(instance.user_id, {})[instance.pk] = instance.provider
+
+
+def _social_account_post_delete(sender, instance, **kwargs):
+    pending = _pending_deletes()
+    user_pending = pending.get(instance.user_id, {})
+    user_pending.pop(instance.pk, None)
+    if not user_pending:
+        pending.pop(instance.user_id, None)
+    if not pending:
+        _pending.origin = None
+
+    remaining = set(
+        sender._default_manager.filter(user_id=instance.user_id).values_list(
+            "provider", flat=True
+        )
+    )
+    # Only the last account of the batch for a user/provider decrements the
+    # distinct-user counters.
+    last_for_user = not user_pending
+    last_for_provider = instance.provider not in user_pending.values()
+    _bump(
+        AuthCounter.GLOBAL,
+        social_accounts=-1,
+        oauth_users=-int(last_for_user and not remaining),
+    )
+    _bump(
+        instance.provider,
+        social_accounts=-1,
+        oauth_users=-int(last_for_provider and instance.provider not in remaining),
+    )
+
+
+def connect_signals():
+    """Connect the counter receivers (called from ``AppConfig.ready()``)."""
+    User = get_user_model()
+    pre_save.connect(_user_pre_save, sender=User, dispatch_uid="djust_auth_counters")
+    post_save.connect(_user_post_save, sender=User, dispatch_uid="djust_auth_counters")
+    post_delete.connect(
+        _user_post_delete, sender=User, dispatch_uid="djust_auth_counters"
+    )
+    if apps.is_installed("allauth.socialaccount"):
+        from allauth.socialaccount.models import SocialAccount
+
+        post_save.connect(
+            _social_account_post_save,
+            sender=SocialAccount,
+            dispatch_uid="djust_auth_counters",
+        )
+        pre_delete.connect(
+            _social_account_pre_delete,
+            sender=SocialAccount,
+            dispatch_uid="djust_auth_counters",
+        )
+        post_delete.connect(
+            _social_account_post_delete,
+            sender=SocialAccount,
+            dispatch_uid="djust_auth_counters",
+        )
+
+
+def disconnect_signals():
+    """Disconnect the counter receivers."""
+    User = get_user_model()
+    pre_save.disconnect(sender=User, dispatch_uid="djust_auth_counters")
+    post_save.disconnect(sender=User, dispatch_uid="djust_auth_counters")
+    post_delete.disconnect(sender=User, dispatch_uid="djust_auth_counters")
+    if apps.is_installed("allauth.socialaccount"):
+        from allauth.socialaccount.models import SocialAccount
+
+        post_save.disconnect(sender=SocialAccount, dispatch_uid="djust_auth_counters")
+        pre_delete.disconnect(sender=SocialAccount, dispatch_uid="djust_auth_counters")
+        post_delete.disconnect(sender=SocialAccount, dispatch_uid="djust_auth_counters")
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Recompute every counter row from the user and social account tables.
+
+    Returns the number of rows written.
+    """
+    User = get_user_model()
+    totals = User.objects.aggregate(
+        users=Count("pk"),
+        staff_users=Count("pk", filter=Q(is_staff=True)),
+        superusers=Count("pk", filter=Q(is_superuser=True)),
+    )
+    rows = [AuthCounter(scope=AuthCounter.GLOBAL, **totals)]
+
+    if apps.is_installed("allauth.socialaccount"):
+        from allauth.socialaccount.models import SocialAccount
+
+        accounts = SocialAccount.objects.order_by()
+        global_row = rows[0]
+        global_row.social_accounts = accounts.count()
+        global_row.oauth_users = accounts.values("user").distinct().count()
+        global_row.last_linked = accounts.aggregate(last=Max("date_joined"))["last"]
+        for row in accounts.values("provider").annotate(
+            social_accounts=Count("pk"),
+            oauth_users=Count("user", distinct=True),
+            last_linked=Max("date_joined"),
+        ):
+            rows.append(AuthCounter(scope=row.pop("provider"), **row))
+
+    AuthCounter.objects.all().delete()
+    AuthCounter.objects.bulk_create(rows)
+    return len(rows)
+
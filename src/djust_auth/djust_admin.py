@@ -7,17 +7,19 @@ Registers an Authentication plugin with:
 - SocialAccount model registration (when allauth is installed)
 """
 
-from datetime import timedelta
-
 from django.apps import apps
-from django.contrib.auth import get_user_model
-from django.utils import timezone
 
 from djust_admin import DjustModelAdmin, site
 from djust_admin.decorators import register
 from djust_admin.plugins import AdminPage, AdminPlugin, AdminWidget
 
-from .admin_views import OAuthProvidersView, SocialAccountsView
+from .admin_views import (
+    OAuthProvidersView,
+    SocialAccountsExportView,
+    SocialAccountsView,
+)
+from .instrumentation import instrument
+from .stats import get_auth_summary
 
 
 # ---- Conditional model registration ----
@@ -45,35 +47,9 @@ class AuthSummaryWidget(AdminWidget):
     order = 5
     size = "lg"
 
+    @instrument("admin.auth_summary_widget")
     def get_context(self, request):
-        User = get_user_model()
-        week_ago = timezone.now() - timedelta(days=7)
-
-        # Count configured OAuth providers and OAuth users
-        oauth_count = 0
-        oauth_users = 0
-        try:
-            if apps.is_installed("allauth.socialaccount"):
-                from allauth.socialaccount.models import SocialAccount
-                from allauth.socialaccount.providers import registry
-
-                if not registry.loaded:
-                    registry.load()
-                oauth_count = len(registry.get_class_list())
-                oauth_users = (
-                    SocialAccount.objects.values("user").distinct().count()
-                )
-        except Exception:
-            pass
-
-        return {
-            "total_users": User.objects.count(),
-            "recent_signups": User.objects.filter(date_joined__gte=week_ago).count(),
-            "staff_users": User.objects.filter(is_staff=True).count(),
-            "superusers": User.objects.filter(is_superuser=True).count(),
-            "oauth_users": oauth_users,
-            "oauth_providers": oauth_count,
-        }
+        return get_auth_summary()
 
 
 # ---- Plugin ----
@@ -107,6 +83,14 @@ class AuthAdminPlugin(AdminPlugin):
                     nav_order=20,
                 )
             )
+            pages.append(
+                AdminPage(
+                    url_path="auth/accounts/export",
+                    url_name="auth_social_accounts_export",
+                    view_class=SocialAccountsExportView,
+                    show_in_nav=False,
+                )
+            )
         return pages
 
     def get_widgets(self):
@@ -1,13 +1,87 @@
+from functools import reduce
+from operator import or_
+
 from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.core.exceptions import ValidationError
+from django.db.models import BooleanField, ExpressionWrapper, Q, Value
+from django.db.models.functions import Lower
 
 User = get_user_model()
 
 
 class SignupForm(UserCreationForm):
+    """Signup form with case-insensitive username and email uniqueness.
+
+    Both are checked in a single ``LOWER()`` query, served by the indexes
+    migration 0003 adds to the user table. Those indexes are unique where
+    they can be, so a concurrent signup differing only in case fails with an
+    ``IntegrityError`` (see ``SignupView.form_valid``). For a custom user
+    model they are only added with ``DJUST_AUTH_USER_LOWER_INDEXES = True``.
+    """
+
     email = forms.EmailField(required=True)
 
+    error_messages = {
+        **UserCreationForm.error_messages,
+        "duplicate_email": "A user with that email address already exists.",
+    }
+
     class Meta:
         model = User
         fields = ("username", "email", "password1", "password2")
+
+    def clean_username(self):
+        # Checked together with the email in validate_unique()
+        return self.cleaned_data.get("username")
+
+    def validate_unique(self):
+        exclude = self._get_validation_exclusions()
+        exclude.update({"username", "email"})
+        try:
+            self.instance.validate_unique(exclude=exclude)
+        except ValidationError as e:
+            self._update_errors(e)
+        self.validate_case_insensitive_unique()
+
+    def validate_case_insensitive_unique(self):
+        lookups = {}
+        if self.cleaned_data.get("username"):
+            lookups["username_taken"] = Q(
+                username_lower=Lower(Value(self.cleaned_data["username"]))
+            )
+        if self.cleaned_data.get("email"):
+            # The blank-email condition matches the partial index
+            lookups["email_taken"] = Q(
+                email_lower=Lower(Value(self.cleaned_data["email"]))
+            ) & ~Q(email="")
+        if not lookups:
+            return
+        queryset = (
+            self._meta.model._default_manager.alias(
+                username_lower=Lower("username"), email_lower=Lower("email")
+            )
+            .filter(reduce(or_, lookups.values()))
+            .annotate(**{
+                name: ExpressionWrapper(q, output_field=BooleanField())
+                for name, q in lookups.items()
+            })
+        )
+        if self.instance.pk is not None:
+            queryset = queryset.exclude(pk=self.instance.pk)
+        taken = set()
+        for row in queryset.values(*lookups):
+            taken.update(name for name, value in row.items() if value)
+        if "username_taken" in taken:
+            self.add_error(
+                "username",
+                self.instance.unique_error_message(self._meta.model, ["username"]),
+            )
+        if "email_taken" in taken:
+            self.add_error(
+                "email",
+                ValidationError(
+                    self.error_messages["duplicate_email"], code="unique"
+                ),
+            )
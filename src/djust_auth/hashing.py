@@ -0,0 +1,164 @@
+"""Bounded concurrency for password hashing in the login and signup views.
+
+Password hashers are deliberately slow. Left unbounded, a burst of logins
+or signups runs one hash per request worker and starves every other page
+of CPU. With the limiter enabled, at most ``DJUST_AUTH_HASHING_LIMIT``
+requests hash at once; further requests wait in a bounded queue, and are
+turned away with a ``503`` when the queue is full or their wait times out.
+
+Settings:
+
+``DJUST_AUTH_HASHING_LIMIT``
+    Concurrent hashing requests per process: an int, ``True`` for the
+    number of CPU cores, or ``None`` (default) to disable the limiter.
+``DJUST_AUTH_HASHING_QUEUE``
+    Requests allowed to wait for a slot (default: 4 x the limit).
+``DJUST_AUTH_HASHING_TIMEOUT``
+    Seconds a request may wait for a slot (default 2.0).
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+
+class HashingBusy(Exception):
+    """Raised when no hashing slot is available in time."""
+
+
+class HashingLimiter:
+    """A semaphore with a bounded wait queue and wait-time metrics."""
+
+    def __init__(self, limit, max_queue=None, timeout=2.0):
+        self.limit = limit
+        self.max_queue = limit * 4 if max_queue is None else max_queue
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquired = 0
+        self._rejected = 0
+        self._timed_out = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @contextmanager
+    def slot(self):
+        """Hold a hashing slot; raise :class:`HashingBusy` if none frees up."""
+        if self._slots.acquire(blocking=False):
+            self._record_acquired(0.0)
+        else:
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    self._rejected += 1
+                    raise HashingBusy("Hashing queue is full.")
+                self._waiting += 1
+                self._max_waiting = max(self._max_waiting, self._waiting)
+            started = time.monotonic()
+            try:
+                acquired = self._slots.acquire(timeout=self.timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self._timed_out += 1
+                raise HashingBusy("Timed out waiting for a hashing slot.")
+            self._record_acquired(time.monotonic() - started)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    def _record_acquired(self, waited):
+        with self._lock:
+            self._in_flight += 1
+            self._acquired += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+
+    def stats(self):
+        """Return a snapshot of the limiter's gauges and counters."""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queue_depth": self._waiting,
+                "max_queue_depth": self._max_waiting,
+                "acquired": self._acquired,
+                "rejected": self._rejected,
+                "timed_out": self._timed_out,
+                "wait_seconds_total": self._wait_total,
+                "wait_seconds_max": self._wait_max,
+                "wait_seconds_avg": (
+                    self._wait_total / self._acquired if self._acquired else 0.0
+                ),
+            }
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_hashing_limiter():
+    """Return the process-wide limiter, or None if it is disabled."""
+    global _limiter
+    limit = getattr(settings, "DJUST_AUTH_HASHING_LIMIT", None)
+    if not limit:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                if limit is True:
+                    limit = os.cpu_count() or 1
+                _limiter = HashingLimiter(
+                    limit,
+                    max_queue=getattr(settings, "DJUST_AUTH_HASHING_QUEUE", None),
+                    timeout=getattr(settings, "DJUST_AUTH_HASHING_TIMEOUT", 2.0),
+                )
+    return _limiter
+
+
+def get_hashing_stats():
+    """Return the limiter's :meth:`~HashingLimiter.stats`, or None."""
+    limiter = get_hashing_limiter()
+    return limiter.stats() if limiter is not None else None
+
+
+@receiver(setting_changed)
+def _reset_limiter(setting, **kwargs):
+    global _limiter
+    if setting.startswith("DJUST_AUTH_HASHING_"):
+        _limiter = None
+
+
+class HashingLimitMixin:
+    """Run ``post()`` (where the password is hashed) under the limiter."""
+
+    def hashing_busy(self, request):
+        response = HttpResponse(
+            "The server is busy. Please try again shortly.", status=503
+        )
+        response["Retry-After"] = "1"
+        return response
+
+    def post(self, request, *args, **kwargs):
+        limiter = get_hashing_limiter()
+        if limiter is None:
+            return super().post(request, *args, **kwargs)
+        try:
+            with limiter.slot():
+                return super().post(request, *args, **kwargs)
+        except HashingBusy:
+            return self.hashing_busy(request)
@@ -0,0 +1,250 @@
+"""Opt-in timing, query and cache instrumentation for djust-auth hot paths.
+
+With ``DJUST_AUTH_INSTRUMENTATION = True`` each instrumented path (context
+processors, admin widget and pages, mixin dispatch, login/signup/logout)
+is measured: wall time, database queries, and hits and misses of the
+djust-auth caches. Every measurement is passed to the configured recorders
+and sent as the :data:`hot_path_measured` signal.
+
+When instrumentation is off an instrumented call costs one attribute check.
+Queries are counted by a wrapper installed on every database connection as
+it is opened (the ``connection_created`` signal), whether or not
+instrumentation is on, so queries an async path runs through
+``sync_to_async`` are counted without a thread switch to set them up. While
+nothing is measured the wrapper costs one context variable read per query.
+
+Settings:
+
+``DJUST_AUTH_INSTRUMENTATION``
+    Enable measurements (default False).
+``DJUST_AUTH_INSTRUMENTATION_RECORDERS``
+    Dotted paths of recorder classes (default: :class:`MemoryRecorder`,
+    whose per-path percentiles are shown on the OAuth providers admin page).
+"""
+
+import abc
+import functools
+import inspect
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import Signal, receiver
+from django.utils.module_loading import import_string
+
+# Sent with sender=<path name> and sample=<Sample>
+hot_path_measured = Signal()
+
+DEFAULT_RECORDERS = ["djust_auth.instrumentation.MemoryRecorder"]
+
+_active = ContextVar("djust_auth_instrumentation", default=())
+
+
+class _State:
+    enabled = None  # Resolved from settings on first use
+    recorders = None
+
+
+_state = _State()
+
+
+class Sample:
+    """One measurement of an instrumented path."""
+
+    __slots__ = ("path", "duration_ms", "queries", "cache_hits", "cache_misses")
+
+    def __init__(self, path):
+        self.path = path
+        self.duration_ms = 0.0
+        self.queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def is_enabled():
+    if _state.enabled is None:
+        _state.enabled = bool(getattr(settings, "DJUST_AUTH_INSTRUMENTATION", False))
+    return _state.enabled
+
+
+def get_recorders():
+    if _state.recorders is None:
+        paths = getattr(
+            settings, "DJUST_AUTH_INSTRUMENTATION_RECORDERS", DEFAULT_RECORDERS
+        )
+        _state.recorders = [_get_recorder_instance(path) for path in paths]
+    return _state.recorders
+
+
+_instances = {}
+
+
+def _get_recorder_instance(path):
+    # One instance per class for the process, so settings changes keep data
+    if path not in _instances:
+        _instances[path] = import_string(path)()
+    return _instances[path]
+
+
+@receiver(setting_changed)
+def _reset_state(setting, **kwargs):
+    if setting.startswith("DJUST_AUTH_INSTRUMENTATION"):
+        _state.enabled = None
+        _state.recorders = None
+
+
+def record_cache(hit):
+    """Count a djust-auth cache hit or miss against the active measurements."""
+    for sample in _active.get():
+        if hit:
+            sample.cache_hits += 1
+        else:
+            sample.cache_misses += 1
+
+
+def _count_query(execute, sql, params, many, context):
+    for sample in _active.get():
+        sample.queries += 1
+    return execute(sql, params, many, context)
+
+
+def _watch(connection):
+    """Install the query counter on ``connection`` (once)."""
+    if _count_query not in connection.execute_wrappers:
+        # First, so execute_wrapper() blocks around it still pop their own
+        connection.execute_wrappers.insert(0, _count_query)
+
+
+def _watch_all():
+    for connection in connections.all():
+        _watch(connection)
+
+
+@receiver(connection_created)
+def _connection_created(sender, connection, **kwargs):
+    # Also while disabled: a worker thread's connection may already be open
+    # when instrumentation is turned on
+    _watch(connection)
+
+
+@contextmanager
+def _measure(path):
+    _watch_all()
+    sample = Sample(path)
+    token = _active.set(_active.get() + (sample,))
+    start = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        sample.duration_ms = (time.perf_counter() - start) * 1000
+        _active.reset(token)
+        for recorder in get_recorders():
+            recorder.record(sample)
+        hot_path_measured.send(sender=path, sample=sample)
+
+
+def instrument(path):
+    """Decorate a function, method or coroutine function as ``path``."""
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def awrapper(*args, **kwargs):
+                if not is_enabled():
+                    return await func(*args, **kwargs)
+                with _measure(path):
+                    return await func(*args, **kwargs)
+
+            return awrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with _measure(path):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ---- Recorders ----
+
+
+class BaseRecorder(abc.ABC):
+    @abc.abstractmethod
+    def record(self, sample):
+        """Store or forward one :class:`Sample`."""
+
+
+class MemoryRecorder(BaseRecorder):
+    """Keeps the last ``max_samples`` samples per path in process memory."""
+
+    max_samples = 1000
+
+    def __init__(self):
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, sample):
+        with self._lock:
+            samples = self._samples.get(sample.path)
+            if samples is None:
+                samples = self._samples[sample.path] = deque(maxlen=self.max_samples)
+            samples.append(
+                (sample.duration_ms, sample.queries, sample.cache_hits, sample.cache_misses)
+            )
+            self._counts[sample.path] = self._counts.get(sample.path, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def stats(self):
+        """Return per-path summaries sorted by path name."""
+        with self._lock:
+            snapshot = {path: list(samples) for path, samples in self._samples.items()}
+            counts = dict(self._counts)
+        rows = []
+        for path in sorted(snapshot):
+            samples = snapshot[path]
+            durations = sorted(s[0] for s in samples)
+            hits = sum(s[2] for s in samples)
+            lookups = hits + sum(s[3] for s in samples)
+            rows.append({
+                "path": path,
+                "calls": counts[path],
+                "p50_ms": round(_percentile(durations, 50), 2),
+                "p95_ms": round(_percentile(durations, 95), 2),
+                "p99_ms": round(_percentile(durations, 99), 2),
+                "avg_queries": round(sum(s[1] for s in samples) / len(samples), 1),
+                "cache_hit_rate": round(100 * hits / lookups, 1) if lookups else None,
+            })
+        return rows
+
+
+def _percentile(sorted_values, pct):
+    # Nearest-rank
+    return sorted_values[max(math.ceil(pct / 100 * len(sorted_values)), 1) - 1]
+
+
+def get_memory_stats():
+    """Return :meth:`MemoryRecorder.stats` if that recorder is configured."""
+    for recorder in get_recorders():
+        if isinstance(recorder, MemoryRecorder):
+            return recorder.stats()
+    return []
@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djust_auth.bulk_import import import_records, read_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream users and their social accounts from a CSV or JSONL file "
+        "into the database with batched bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Input file, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Input format (default: from the file extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Records validated and inserted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "File recording the last committed line. If it exists the "
+                "import resumes after that line."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"]
+        if fmt is None:
+            if path == "-":
+                raise CommandError("--format is required when reading stdin.")
+            fmt = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+        checkpoint = options["checkpoint"]
+        start_after = 0
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as fh:
+                start_after = json.load(fh)["line"]
+            self.stdout.write(f"Resuming after line {start_after}.")
+
+        def on_error(line_number, message):
+            self.stderr.write(f"Line {line_number}: {message}")
+
+        def on_batch(stats):
+            if checkpoint:
+                tmp = f"{checkpoint}.tmp"
+                with open(tmp, "w") as fh:
+                    json.dump({"line": stats.last_line}, fh)
+                os.replace(tmp, checkpoint)
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"Line {stats.last_line}: {stats.users} user(s) imported."
+                )
+
+        stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        try:
+            stats = import_records(
+                read_records(stream, fmt, start_after=start_after),
+                batch_size=options["batch_size"],
+                on_error=on_error,
+                on_batch=on_batch,
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {stats.users} user(s) and {stats.social_accounts} "
+                f"social account(s); skipped {stats.skipped} existing, "
+                f"{stats.errors} error(s)."
+            )
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from djust_auth.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute djust-auth's signal-maintained counters from the user "
+        "and social account tables."
+    )
+
+    def handle(self, *args, **options):
+        rows = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} auth counter row(s)."))
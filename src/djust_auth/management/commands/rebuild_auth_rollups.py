@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from djust_auth.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill djust-auth's daily activity rollups from the user and "
+        "social account tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            help="Only rebuild the last N days (default: all).",
+        )
+
+    def handle(self, *args, days=None, **options):
+        rows = rebuild_rollups(days=days)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} auth rollup row(s)."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from djust_auth.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recreate the normalized search keys for all social accounts."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Accounts read and keys written per batch (default: 2000).",
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_search_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} social account(s)."))
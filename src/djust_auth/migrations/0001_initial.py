@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthCounter',
+            fields=[
+                ('scope', models.CharField(max_length=200, primary_key=True, serialize=False)),
+                ('users', models.BigIntegerField(default=0)),
+                ('staff_users', models.BigIntegerField(default=0)),
+                ('superusers', models.BigIntegerField(default=0)),
+                ('social_accounts', models.BigIntegerField(default=0)),
+                ('oauth_users', models.BigIntegerField(default=0)),
+                ('last_linked', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'auth counter',
+            },
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:45
+
+from django.db import migrations, models
+
+TRGM_INDEX = "djust_auth_sk_text_trgm"
+
+
+def create_trigram_index(apps, schema_editor):
+    """Add a GIN trigram index on ``text`` when PostgreSQL allows it."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("djust_auth", "SocialAccountSearchKey")._meta.db_table
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            try:
+                cursor.execute("SAVEPOINT djust_auth_trgm")
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cursor.execute("RELEASE SAVEPOINT djust_auth_trgm")
+            except Exception:
+                # No privilege to create extensions: prefix search still works
+                cursor.execute("ROLLBACK TO SAVEPOINT djust_auth_trgm")
+                return
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TRGM_INDEX} ON {table} "
+            "USING gin (text gin_trgm_ops)"
+        )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX IF EXISTS {TRGM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djust_auth', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SocialAccountSearchKey',
+            fields=[
+                ('account_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('username', models.CharField(max_length=255)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('uid', models.CharField(max_length=255)),
+                ('text', models.TextField()),
+            ],
+            options={
+                'verbose_name': 'social account search key',
+                'indexes': [models.Index(fields=['username'], name='djust_auth_sk_username', opclasses=['varchar_pattern_ops']), models.Index(fields=['email'], name='djust_auth_sk_email', opclasses=['varchar_pattern_ops']), models.Index(fields=['uid'], name='djust_auth_sk_uid', opclasses=['varchar_pattern_ops'])],
+            },
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,105 @@
+import warnings
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+USERNAME_INDEX = "djust_auth_user_username_lower"
+EMAIL_INDEX = "djust_auth_user_email_lower"
+
+
+def _enabled():
+    # The user table belongs to the project; only touch a custom one when
+    # asked to
+    default = settings.AUTH_USER_MODEL == "auth.User"
+    return getattr(settings, "DJUST_AUTH_USER_LOWER_INDEXES", default)
+
+
+def _indexes(User):
+    """Return ``(field, unique index, plain index)`` for each lowered column.
+
+    The unique form is the database-side guarantee behind SignupForm; the
+    plain one still serves its lookups where uniqueness cannot be enforced.
+    """
+    field_names = {f.name for f in User._meta.get_fields()}
+    indexes = []
+    if "username" in field_names:
+        indexes.append((
+            "username",
+            models.UniqueConstraint(Lower("username"), name=USERNAME_INDEX),
+            models.Index(Lower("username"), name=USERNAME_INDEX),
+        ))
+    if "email" in field_names:
+        # Blank emails are allowed for users created outside of signup
+        indexes.append((
+            "email",
+            models.UniqueConstraint(
+                Lower("email"), name=EMAIL_INDEX, condition=~models.Q(email="")
+            ),
+            models.Index(
+                Lower("email"), name=EMAIL_INDEX, condition=~models.Q(email="")
+            ),
+        ))
+    return indexes
+
+
+def add_indexes(apps, schema_editor):
+    """Index the user's lowered username and email, unique where possible.
+
+    Emails get a plain index when allauth allows duplicates
+    (``ACCOUNT_UNIQUE_EMAIL = False``), as does a column that already holds
+    values differing only in case, with a warning.
+    """
+    if not _enabled():
+        return
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    db_alias = schema_editor.connection.alias
+    unique_email = getattr(settings, "ACCOUNT_UNIQUE_EMAIL", True)
+    for field, unique, plain in _indexes(User):
+        if field == "email" and not unique_email:
+            schema_editor.add_index(User, plain)
+            continue
+        duplicates = (
+            User._default_manager.using(db_alias)
+            .exclude(**{field: ""})
+            .values(lowered=Lower(field))
+            .annotate(n=models.Count("pk"))
+            .filter(n__gt=1)
+        )
+        if duplicates.exists():
+            warnings.warn(
+                f"{User._meta.db_table}.{field} has values that differ only "
+                f"in case; {unique.name} is not unique. Resolve them and "
+                "recreate the index."
+            )
+            schema_editor.add_index(User, plain)
+        else:
+            schema_editor.add_constraint(User, unique)
+
+
+def remove_indexes(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    with schema_editor.connection.cursor() as cursor:
+        existing = schema_editor.connection.introspection.get_constraints(
+            cursor, User._meta.db_table
+        )
+    for field, unique, plain in _indexes(User):
+        info = existing.get(plain.name)
+        if info is None:
+            continue
+        if info["unique"]:
+            schema_editor.remove_constraint(User, unique)
+        else:
+            schema_editor.remove_index(User, plain)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djust_auth', '0002_socialaccountsearchkey'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(add_indexes, remove_indexes),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djust_auth', '0003_user_lower_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('scope', models.CharField(max_length=200)),
+                ('signups', models.BigIntegerField(default=0)),
+                ('links', models.BigIntegerField(default=0)),
+                ('logins', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'auth daily rollup',
+                'constraints': [models.UniqueConstraint(fields=('day', 'scope'), name='djust_auth_rollup_day_scope')],
+            },
+        ),
+    ]
@@ -1,42 +1,266 @@
+import functools
+import inspect
 from urllib.parse import urlencode
 
 from django.conf import settings
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.shortcuts import redirect
 
+from .instrumentation import instrument
+from .permissions import ahas_permissions, has_permissions
+from .revocation import aget_auth_version, get_auth_version
 
-class LoginRequiredLiveViewMixin:
+
+async def _aget_user(request):
+    """Resolve ``request.user`` without a thread hop (``request.auser()``)."""
+    auser = getattr(request, "auser", None)
+    if auser is None:
+        return request.user
+    user = await auser()
+    # Later sync code in this request reads the resolved user
+    request.user = user
+    return user
+
+
+def _request_session_key(request):
+    session = getattr(request, "session", None)
+    return getattr(session, "session_key", None)
+
+
+def _guard_event_handler(func):
+    """Wrap an ``@event_handler`` so it re-checks the auth version first."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def guarded(self, *args, **kwargs):
+            await self.acheck_auth_version()
+            return await func(self, *args, **kwargs)
+
+    else:
+
+        @functools.wraps(func)
+        def guarded(self, *args, **kwargs):
+            self.check_auth_version()
+            return func(self, *args, **kwargs)
+
+    guarded._djust_auth_guarded = True
+    return guarded
+
+
+class _EventAuthGuardMixin:
+    """Re-validate auth before every ``@event_handler`` call.
+
+    The user's auth version (see :mod:`djust_auth.revocation`) is recorded
+    when the view passes its auth check and compared before each event, at
+    the cost of a single cache lookup. Set ``revalidate_events = False`` to
+    turn the guard off.
+    """
+
+    revalidate_events = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not cls.revalidate_events:
+            return
+        # Inherited handlers too, e.g. from a base view without the mixin
+        for name in dir(cls):
+            attr = inspect.getattr_static(cls, name, None)
+            decorators = getattr(attr, "_djust_decorators", None)
+            if (
+                callable(attr)
+                and decorators
+                and "event_handler" in decorators
+                and not getattr(attr, "_djust_auth_guarded", False)
+            ):
+                setattr(cls, name, _guard_event_handler(attr))
+
+    def check_permissions(self, request):
+        # djust's hook for live (WebSocket/SSE) mounts, which skip dispatch()
+        self.record_auth_version(request)
+        parent = getattr(super(), "check_permissions", None)
+        return parent(request) if parent is not None else True
+
+    def record_auth_version(self, request):
+        user = getattr(request, "user", None)
+        if self.revalidate_events and user is not None and user.is_authenticated:
+            session_key = _request_session_key(request)
+            self._djust_auth_version = (
+                user.pk,
+                session_key,
+                get_auth_version(user.pk, session_key),
+            )
+
+    async def arecord_auth_version(self, request):
+        user = getattr(request, "user", None)
+        if self.revalidate_events and user is not None and user.is_authenticated:
+            session_key = _request_session_key(request)
+            self._djust_auth_version = (
+                user.pk,
+                session_key,
+                await aget_auth_version(user.pk, session_key),
+            )
+
+    def check_auth_version(self):
+        """Raise PermissionDenied if the recorded auth version is stale."""
+        expected = self.__dict__.get("_djust_auth_version")
+        if expected is None:
+            return
+        user_pk, session_key, version = expected
+        if get_auth_version(user_pk, session_key) != version:
+            raise PermissionDenied("Authentication was revoked.")
+
+    async def acheck_auth_version(self):
+        expected = self.__dict__.get("_djust_auth_version")
+        if expected is None:
+            return
+        user_pk, session_key, version = expected
+        if await aget_auth_version(user_pk, session_key) != version:
+            raise PermissionDenied("Authentication was revoked.")
+
+
+class LoginRequiredLiveViewMixin(_EventAuthGuardMixin):
     """Add to any LiveView to require authentication.
 
     Intercepts at dispatch() before get() -> mount() runs,
     so no LiveView state is initialized for anonymous users.
+    Async views are checked with ``request.auser()``, without a thread hop.
     """
 
     login_url = None  # Falls back to settings.LOGIN_URL
 
-    def dispatch(self, request, *args, **kwargs):
+    def get_login_redirect_url(self, request):
+        login_url = self.login_url or getattr(
+            settings, "LOGIN_URL", "/accounts/login/"
+        )
+        return f"{login_url}?{urlencode({'next': request.get_full_path()})}"
+
+    @instrument("mixins.login_required")
+    def check_login(self, request):
+        """Return a login redirect for anonymous users, else None."""
         if not request.user.is_authenticated:
-            login_url = self.login_url or getattr(
-                settings, "LOGIN_URL", "/accounts/login/"
-            )
-            url = f"{login_url}?{urlencode({'next': request.get_full_path()})}"
-            return redirect(url)
+            return redirect(self.get_login_redirect_url(request))
+        self.record_auth_version(request)
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        if getattr(self, "view_is_async", False):
+            return self._alogin_dispatch(request, *args, **kwargs)
+        response = self.check_login(request)
+        if response is not None:
+            return response
         return super().dispatch(request, *args, **kwargs)
 
+    @instrument("mixins.login_required")
+    async def acheck_login(self, request):
+        """Async variant of ``check_login()``."""
+        user = await _aget_user(request)
+        if not user.is_authenticated:
+            return redirect(self.get_login_redirect_url(request))
+        await self.arecord_auth_version(request)
+        return None
+
+    async def _alogin_dispatch(self, request, *args, **kwargs):
+        response = await self.acheck_login(request)
+        if response is not None:
+            return response
+        return await super().dispatch(request, *args, **kwargs)
 
-class PermissionRequiredLiveViewMixin:
+
+class PermissionRequiredLiveViewMixin(_EventAuthGuardMixin):
     """Add to any LiveView to require specific permissions.
 
-    Raises PermissionDenied (403) if the user lacks the required permission.
+    Raises PermissionDenied (403) if the user lacks the required permissions.
     Must be used together with LoginRequiredLiveViewMixin or Django's
     AuthenticationMiddleware.
+
+    ``permission_required`` is a permission string or a list of them; with
+    ``permission_mode = "any"`` one of them is enough. Override
+    ``get_permission_object()`` to check the permissions against an object
+    (object-level backends such as django-guardian). Permission sets are
+    cached across requests when ``DJUST_AUTH_PERMISSION_CACHE_TTL`` is set
+    (see :mod:`djust_auth.permissions`).
+
+    djust also enforces ``permission_required`` itself when a view is
+    mounted over a live transport and always requires every permission
+    there, so ``"any"`` views should be rendered over HTTP.
     """
 
-    permission_required = None  # Set to a permission string like "app.change_model"
+    permission_required = None  # "app.change_model" or a list of them
+    permission_mode = "all"  # or "any"
 
-    def dispatch(self, request, *args, **kwargs):
-        if self.permission_required and not request.user.has_perm(
-            self.permission_required
+    def get_permission_required(self):
+        if self.permission_required is None:
+            return ()
+        if isinstance(self.permission_required, str):
+            return (self.permission_required,)
+        return tuple(self.permission_required)
+
+    def get_permission_object(self):
+        """Return the object to check permissions against (default: None)."""
+        return None
+
+    @instrument("mixins.permission_required")
+    def has_permission(self, request):
+        perms = self.get_permission_required()
+        if not perms:
+            return True
+        if self.permission_mode not in ("all", "any"):
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}.permission_mode must be 'all' or 'any'."
+            )
+        return has_permissions(
+            request.user,
+            perms,
+            obj=self.get_permission_object(),
+            require_all=self.permission_mode == "all",
+        )
+
+    async def aget_permission_object(self):
+        """Async variant of ``get_permission_object()``.
+
+        Runs an overridden sync ``get_permission_object()`` in a thread;
+        override this instead to stay on the event loop.
+        """
+        if (
+            type(self).get_permission_object
+            is PermissionRequiredLiveViewMixin.get_permission_object
         ):
+            return None
+        from asgiref.sync import sync_to_async
+
+        return await sync_to_async(self.get_permission_object)()
+
+    @instrument("mixins.permission_required")
+    async def ahas_permission(self, request):
+        perms = self.get_permission_required()
+        if not perms:
+            return True
+        if self.permission_mode not in ("all", "any"):
+            raise ImproperlyConfigured(
+                f"{type(self).__name__}.permission_mode must be 'all' or 'any'."
+            )
+        return await ahas_permissions(
+            await _aget_user(request),
+            perms,
+            obj=await self.aget_permission_object(),
+            require_all=self.permission_mode == "all",
+        )
+
+    def check_permissions(self, request):
+        if not self.has_permission(request):
+            raise PermissionDenied
+        return super().check_permissions(request)
+
+    def dispatch(self, request, *args, **kwargs):
+        if getattr(self, "view_is_async", False):
+            return self._apermission_dispatch(request, *args, **kwargs)
+        if not self.has_permission(request):
             raise PermissionDenied
+        self.record_auth_version(request)
         return super().dispatch(request, *args, **kwargs)
+
+    async def _apermission_dispatch(self, request, *args, **kwargs):
+        if not await self.ahas_permission(request):
+            raise PermissionDenied
+        await self.arecord_auth_version(request)
+        return await super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,99 @@
+from django.db import models
+
+
+class AuthCounter(models.Model):
+    """Incrementally maintained authentication statistics.
+
+    One row per scope: ``"global"`` holds site-wide totals and every other
+    row is keyed by an OAuth provider id. Rows are kept current by the
+    receivers in :mod:`djust_auth.counters` when ``DJUST_AUTH_COUNTERS`` is
+    enabled; ``manage.py rebuild_auth_counters`` recomputes them.
+    """
+
+    GLOBAL = "global"
+
+    scope = models.CharField(max_length=200, primary_key=True)
+    users = models.BigIntegerField(default=0)
+    staff_users = models.BigIntegerField(default=0)
+    superusers = models.BigIntegerField(default=0)
+    social_accounts = models.BigIntegerField(default=0)
+    oauth_users = models.BigIntegerField(default=0)
+    last_linked = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "auth counter"
+
+    def __str__(self):
+        return self.scope
+
+
+class SocialAccountSearchKey(models.Model):
+    """Normalized, indexed search keys for one allauth ``SocialAccount``.
+
+    Denormalizes the account's username, email and uid (lowercased) so the
+    admin search can use index range scans instead of ``icontains`` across
+    a join. ``text`` concatenates all three for trigram search on
+    PostgreSQL. Kept current by :mod:`djust_auth.search` when
+    ``DJUST_AUTH_SEARCH_INDEX`` is enabled; ``manage.py
+    rebuild_auth_search_index`` backfills it.
+    """
+
+    # Plain id rather than a ForeignKey so the table does not depend on
+    # allauth being installed.
+    account_id = models.BigIntegerField(primary_key=True)
+    username = models.CharField(max_length=255)
+    email = models.CharField(max_length=254, blank=True)
+    uid = models.CharField(max_length=255)
+    text = models.TextField()
+
+    class Meta:
+        verbose_name = "social account search key"
+        indexes = [
+            models.Index(
+                fields=["username"],
+                name="djust_auth_sk_username",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["email"],
+                name="djust_auth_sk_email",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["uid"],
+                name="djust_auth_sk_uid",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return self.text
+
+
+class AuthDailyRollup(models.Model):
+    """Per-day authentication activity for one scope.
+
+    ``scope`` is ``"global"`` (all users) or an OAuth provider id. Rows are
+    incremented by the receivers in :mod:`djust_auth.rollups` when
+    ``DJUST_AUTH_ROLLUPS`` is enabled; ``manage.py rebuild_auth_rollups``
+    backfills them.
+    """
+
+    GLOBAL = "global"
+
+    day = models.DateField()
+    scope = models.CharField(max_length=200)
+    signups = models.BigIntegerField(default=0)
+    links = models.BigIntegerField(default=0)
+    logins = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "auth daily rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "scope"], name="djust_auth_rollup_day_scope"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.day}"
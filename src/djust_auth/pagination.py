@@ -0,0 +1,291 @@
+"""Keyset (cursor) pagination for the djust-auth admin listings.
+
+Offset pagination needs a ``COUNT(*)`` and an ``OFFSET`` scan that both grow
+with the table and the page number. Keyset pagination instead remembers the
+sort key of the last (or first) row shown and seeks past it, so every page is
+an index range scan of ``per_page + 1`` rows.
+
+Rows are ordered by a single field plus ``pk`` as a tie-breaker; the field
+must not be nullable.
+
+Listings that still show a total can pick a cheaper count strategy with
+:func:`count_queryset`: an exact ``COUNT(*)``, a count capped at N (shown as
+"N+"), or the query planner's estimate where the database provides one.
+
+:class:`PageCache` keeps recently rendered pages in the djust-auth cache for
+a few seconds, so paging back and forth or repeating a search does not
+query again, and loads the page a listing is likely to show next in the
+background.
+"""
+
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+import uuid
+from collections import namedtuple
+
+from django.db import connections, transaction
+from django.db.models import Q
+
+from .cache import _spawn, get_cache
+from .instrumentation import record_cache
+
+COUNT_EXACT = "exact"
+COUNT_CAPPED = "capped"
+COUNT_ESTIMATED = "estimated"
+COUNT_NONE = "none"
+
+CountResult = namedtuple("CountResult", ["value", "exact", "display"])
+
+
+def count_queryset(queryset, strategy=COUNT_EXACT, cap=1000):
+    """Count ``queryset`` using ``strategy``; returns a :class:`CountResult`.
+
+    ``"exact"``
+        Plain ``COUNT(*)``.
+    ``"capped"``
+        Counts at most ``cap + 1`` rows; larger results report ``cap`` with
+        ``exact=False`` and display as ``"1000+"``.
+    ``"estimated"``
+        Uses the planner's row estimate (PostgreSQL, MySQL) and displays it
+        as ``"~52000"``. Small estimates, and backends without one (such as
+        SQLite), fall back to a capped count.
+    ``"none"``
+        No query; returns ``CountResult(None, False, "")``.
+    """
+    if strategy == COUNT_NONE:
+        return CountResult(None, False, "")
+    if strategy == COUNT_EXACT:
+        value = queryset.count()
+        return CountResult(value, True, str(value))
+    if strategy == COUNT_ESTIMATED:
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate > cap:
+            return CountResult(estimate, False, f"~{estimate}")
+    elif strategy != COUNT_CAPPED:
+        raise ValueError(f"Unknown count strategy: {strategy!r}")
+
+    value = queryset.order_by()[: cap + 1].count()
+    if value > cap:
+        return CountResult(cap, False, f"{cap}+")
+    return CountResult(value, True, str(value))
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for ``queryset``, or None."""
+    connection = connections[queryset.db]
+    if connection.vendor not in ("postgresql", "mysql"):
+        return None
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+        # Savepoint so a failing EXPLAIN cannot break the caller's transaction
+        with transaction.atomic(using=queryset.db), connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+            cursor.execute(f"EXPLAIN {sql}", params)
+            columns = [col[0] for col in cursor.description]
+            first = dict(zip(columns, cursor.fetchone()))
+            rows = float(first.get("rows") or 0)
+            return int(rows * float(first.get("filtered") or 100) / 100)
+    except Exception:
+        return None
+
+
+def encode_cursor(direction, value, pk):
+    """Encode a position as an opaque, URL-safe cursor string."""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        value = value.isoformat()
+    payload = json.dumps([direction, value, pk], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into ``(direction, value, pk)``; None if invalid."""
+    if not cursor:
+        return None
+    try:
+        direction, value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError, binascii.Error):
+        return None
+    if direction not in ("next", "previous"):
+        return None
+    return direction, value, pk
+
+
+class KeysetPage:
+    """One page of keyset-paginated results."""
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginate ``queryset`` by ``ordering`` (e.g. ``"-date_joined"``) and pk."""
+
+    def __init__(self, queryset, ordering=None, per_page=25):
+        self.queryset = queryset
+        self.per_page = per_page
+        ordering = ordering or "pk"
+        self.descending = ordering.startswith("-")
+        self.field = ordering.lstrip("-")
+
+    def _ordered(self, reverse=False):
+        descending = self.descending != reverse
+        prefix = "-" if descending else ""
+        order = [f"{prefix}{self.field}"]
+        if self.field != "pk":
+            order.append(f"{prefix}pk")
+        return self.queryset.order_by(*order), descending
+
+    def _seek(self, qs, descending, value, pk):
+        op = "lt" if descending else "gt"
+        if self.field == "pk":
+            return qs.filter(**{f"pk__{op}": pk})
+        return qs.filter(
+            Q(**{f"{self.field}__{op}": value})
+            | Q(**{self.field: value, f"pk__{op}": pk})
+        )
+
+    def _key(self, obj):
+        value = obj
+        for attr in self.field.split("__"):
+            value = getattr(value, attr)
+        return value, obj.pk
+
+    def page(self, cursor=""):
+        """Return the page at ``cursor`` (the first page if empty/invalid)."""
+        position = decode_cursor(cursor)
+        backwards = position is not None and position[0] == "previous"
+
+        qs, descending = self._ordered(reverse=backwards)
+        if position is not None:
+            qs = self._seek(qs, descending, position[1], position[2])
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if backwards:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        next_cursor = previous_cursor = ""
+        if rows and has_next:
+            next_cursor = encode_cursor("next", *self._key(rows[-1]))
+        if rows and has_previous:
+            previous_cursor = encode_cursor("previous", *self._key(rows[0]))
+        return KeysetPage(rows, has_next, has_previous, next_cursor, previous_cursor)
+
+
+class PageCache:
+    """Listing pages shared through the djust-auth cache for a few seconds.
+
+    Entries carry the version token current when they were loaded;
+    :meth:`clear` replaces the token, retiring every page in every process.
+    With a per-process backend such as ``LocMemCache`` each worker keeps,
+    and clears, only its own pages.
+
+    Each entry expires after the ``ttl`` it was stored with, and a key is
+    hashed to one of ``max_entries`` slots, so however many searches are
+    run at most that many pages are kept per name; a page stored in a taken
+    slot replaces the page there.
+    """
+
+    def __init__(self, name, max_entries=512):
+        self.prefix = f"djust_auth:pages:{name}"
+        self.version_key = f"{self.prefix}:version"
+        self.max_entries = max_entries
+
+    def _key(self, key):
+        """Return ``(slot key, digest)`` for ``key``."""
+        digest = hashlib.sha256(repr(key).encode()).hexdigest()
+        slot = int(digest[:16], 16) % self.max_entries
+        return f"{self.prefix}:{slot}", digest
+
+    @staticmethod
+    def _value(entry, version, digest):
+        if entry is None or entry[0] != version or entry[1] != digest:
+            return None
+        return entry[2]
+
+    def get(self, key):
+        """Return the value stored for ``key``, or None if missing or retired."""
+        entry_key, digest = self._key(key)
+        found = get_cache().get_many([self.version_key, entry_key])
+        return self._value(
+            found.get(entry_key), found.get(self.version_key), digest
+        )
+
+    def get_or_set(self, key, load, ttl):
+        """Return the value stored for ``key``, storing ``load()`` on a miss."""
+        cache = get_cache()
+        entry_key, digest = self._key(key)
+        found = cache.get_many([self.version_key, entry_key])
+        version = found.get(self.version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            cache.add(self.version_key, version, timeout=None)
+            version = cache.get(self.version_key, version)
+        value = self._value(found.get(entry_key), version, digest)
+        record_cache(value is not None)
+        if value is not None:
+            return value
+        # Stored under the version read before loading, so a clear() that
+        # lands meanwhile still retires it
+        value = load()
+        cache.set(entry_key, (version, digest, value), timeout=ttl)
+        return value
+
+    def prefetch(self, key, load, ttl):
+        """Store ``load()`` for ``key`` from a background thread.
+
+        Does nothing if the page is already cached or another thread or
+        process is loading it (a cache lock held for at most ``ttl``
+        seconds). Returns whether a load was started.
+        """
+        if self.get(key) is not None:
+            return False
+        cache = get_cache()
+        lock_key = f"{self.prefix}:loading:{self._key(key)[1][:32]}"
+        if not cache.add(lock_key, 1, timeout=max(int(ttl), 1)):
+            return False
+
+        def run():
+            try:
+                self.get_or_set(key, load, ttl)
+            finally:
+                cache.delete(lock_key)
+
+        _spawn(run)
+        return True
+
+    def clear(self):
+        get_cache().set(self.version_key, uuid.uuid4().hex, timeout=None)
+
+
+# Pages of the social accounts admin listing, cleared when an account is
+# linked or removed
+social_account_pages = PageCache("social_accounts")
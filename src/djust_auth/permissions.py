@@ -0,0 +1,242 @@
+"""Permission checks with a shared, versioned permission-set cache.
+
+``user.has_perm()`` loads every user and group permission from the database
+the first time it is called on a user object, and a user object only lives
+for one request. :func:`get_permission_set` keeps that set in the djust-auth
+cache (see :func:`djust_auth.cache.get_cache`) so later requests, and
+LiveView mounts, skip the two permission queries.
+
+Cached sets are invalidated when:
+
+- a user's ``groups`` or ``user_permissions`` change (that user's entry is
+  dropped);
+- a group's ``permissions`` change, or a group or permission is deleted
+  (a global version token is replaced, retiring every entry).
+
+:func:`has_permissions` only answers from the set when the cache is
+enabled and every authentication backend is a ``ModelBackend``; otherwise
+it calls ``user.has_perm()`` so every backend is consulted.
+
+Changes that bypass model signals (``QuerySet.update()``, raw SQL, custom
+auth backends with their own storage) are only picked up after the TTL;
+call :func:`invalidate_permission_cache` after them.
+
+Settings:
+
+``DJUST_AUTH_PERMISSION_CACHE_TTL``
+    Seconds a user's permission set is cached (default 0, disabled).
+"""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_backends, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete
+
+from .cache import get_cache
+from .instrumentation import record_cache
+from .revocation import bump_auth_version
+
+PERMISSION_VERSION_KEY = "djust_auth:perms:version"
+
+
+def _user_key(user_pk):
+    return f"djust_auth:perms:user:{user_pk}"
+
+
+def _cache_ttl():
+    return getattr(settings, "DJUST_AUTH_PERMISSION_CACHE_TTL", 0)
+
+
+def _model_backends_only():
+    return all(isinstance(backend, ModelBackend) for backend in get_backends())
+
+
+def _use_permission_set():
+    # Other backends (django-rules, custom ones) may only implement has_perm()
+    return bool(_cache_ttl()) and _model_backends_only()
+
+
+def _remember(user, perms):
+    user._djust_auth_perm_set = perms
+    if _model_backends_only() and not hasattr(user, "_perm_cache"):
+        # Later user.has_perm() calls in this request (including djust's
+        # own permission_required check) then skip the database too.
+        user._perm_cache = set(perms)
+    return perms
+
+
+def get_permission_set(user):
+    """Return the frozenset of ``"app_label.codename"`` perms held by ``user``.
+
+    Object-independent permissions only, as returned by
+    ``user.get_all_permissions()``. Served from the shared cache when
+    ``DJUST_AUTH_PERMISSION_CACHE_TTL`` is set.
+    """
+    if not user.is_active or user.is_anonymous:
+        return frozenset()
+    cached = getattr(user, "_djust_auth_perm_set", None)
+    if cached is not None:
+        return cached
+
+    ttl = _cache_ttl()
+    if not ttl:
+        return _remember(user, frozenset(user.get_all_permissions()))
+
+    cache = get_cache()
+    key = _user_key(user.pk)
+    found = cache.get_many([PERMISSION_VERSION_KEY, key])
+    version = found.get(PERMISSION_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(PERMISSION_VERSION_KEY, version, timeout=None)
+        version = cache.get(PERMISSION_VERSION_KEY, version)
+    entry = found.get(key)
+    hit = entry is not None and entry[0] == version
+    record_cache(hit)
+    if hit:
+        return _remember(user, entry[1])
+    perms = frozenset(user.get_all_permissions())
+    cache.set(key, (version, perms), timeout=ttl)
+    return _remember(user, perms)
+
+
+async def aget_permission_set(user):
+    """Async variant of :func:`get_permission_set`."""
+    if not user.is_active or user.is_anonymous:
+        return frozenset()
+    cached = getattr(user, "_djust_auth_perm_set", None)
+    if cached is not None:
+        return cached
+
+    ttl = _cache_ttl()
+    if not ttl:
+        return _remember(user, frozenset(await user.aget_all_permissions()))
+
+    cache = get_cache()
+    key = _user_key(user.pk)
+    found = await cache.aget_many([PERMISSION_VERSION_KEY, key])
+    version = found.get(PERMISSION_VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        await cache.aadd(PERMISSION_VERSION_KEY, version, timeout=None)
+        version = await cache.aget(PERMISSION_VERSION_KEY, version)
+    entry = found.get(key)
+    hit = entry is not None and entry[0] == version
+    record_cache(hit)
+    if hit:
+        return _remember(user, entry[1])
+    perms = frozenset(await user.aget_all_permissions())
+    await cache.aset(key, (version, perms), timeout=ttl)
+    return _remember(user, perms)
+
+
+def has_permissions(user, perms, obj=None, require_all=True):
+    """Return whether ``user`` holds all (or any) of ``perms``.
+
+    Each permission is checked with ``user.has_perm(perm, obj)``, so every
+    backend (django-guardian, rules, ...) is consulted. Without ``obj``, when
+    the permission cache is enabled and only ``ModelBackend`` is configured,
+    the check is answered from :func:`get_permission_set` instead.
+    """
+    if isinstance(perms, str):
+        perms = (perms,)
+    if not perms:
+        return True
+    if user.is_active and user.is_superuser:
+        return True
+
+    if obj is None and _use_permission_set():
+        held = get_permission_set(user)
+        results = (perm in held for perm in perms)
+    else:
+        results = (user.has_perm(perm, obj) for perm in perms)
+    return all(results) if require_all else any(results)
+
+
+async def ahas_permissions(user, perms, obj=None, require_all=True):
+    """Async variant of :func:`has_permissions` (uses ``user.ahas_perm()``)."""
+    if isinstance(perms, str):
+        perms = (perms,)
+    if not perms:
+        return True
+    if user.is_active and user.is_superuser:
+        return True
+
+    if obj is None and _use_permission_set():
+        held = await aget_permission_set(user)
+        results = (perm in held for perm in perms)
+        return all(results) if require_all else any(results)
+    for perm in perms:
+        allowed = await user.ahas_perm(perm, obj)
+        if allowed != require_all:
+            return allowed
+    return require_all
+
+
+def invalidate_permission_cache(user_pks=None):
+    """Drop cached permission sets for ``user_pks``, or for every user."""
+    cache = get_cache()
+    if user_pks is None:
+        cache.set(PERMISSION_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+    else:
+        cache.delete_many([_user_key(pk) for pk in user_pks])
+
+
+def _invalidate(user_pks=None):
+    if user_pks is not None:
+        user_pks = list(user_pks)
+    invalidate_permission_cache(user_pks)
+    # Again after commit, in case a concurrent request cached the old set
+    transaction.on_commit(lambda: invalidate_permission_cache(user_pks))
+    # Open LiveViews re-check on their next event
+    bump_auth_version(user_pks)
+
+
+# ---- Receivers ----
+
+_CHANGE_ACTIONS = ("post_add", "post_remove", "post_clear")
+
+
+def _user_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in _CHANGE_ACTIONS:
+        return
+    if not reverse:
+        _invalidate([instance.pk])
+    elif pk_set:
+        _invalidate(pk_set)
+    else:
+        # group.user_set.clear() / permission.user_set.clear(): the
+        # affected users are no longer known
+        _invalidate()
+
+
+def _group_permissions_changed(sender, action, **kwargs):
+    if action in _CHANGE_ACTIONS:
+        _invalidate()
+
+
+def _permission_holder_deleted(sender, **kwargs):
+    _invalidate()
+
+
+def connect_signals():
+    """Connect the invalidation receivers (called from ``AppConfig.ready()``)."""
+    User = get_user_model()
+    uid = "djust_auth_permissions"
+    if hasattr(User, "groups"):
+        m2m_changed.connect(
+            _user_m2m_changed, sender=User.groups.through, dispatch_uid=uid
+        )
+    if hasattr(User, "user_permissions"):
+        m2m_changed.connect(
+            _user_m2m_changed, sender=User.user_permissions.through, dispatch_uid=uid
+        )
+    m2m_changed.connect(
+        _group_permissions_changed, sender=Group.permissions.through, dispatch_uid=uid
+    )
+    post_delete.connect(_permission_holder_deleted, sender=Group, dispatch_uid=uid)
+    post_delete.connect(_permission_holder_deleted, sender=Permission, dispatch_uid=uid)
@@ -0,0 +1,187 @@
+"""Compiled OAuth provider configuration for the admin providers page.
+
+Joins allauth's provider registry, ``SOCIALACCOUNT_PROVIDERS`` and
+:data:`PROVIDER_REFERENCE` into a per-provider snapshot: masked
+client ID, scopes, setup checklist, extra settings and a settings snippet.
+None of it changes between deploys, so it is compiled once, from
+``DjustAuthConfig.ready()``, and only recompiled when the registry or
+``SOCIALACCOUNT_PROVIDERS`` changes. Per-request values (callback host,
+account statistics) are added by the view.
+"""
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .social import _get_registry, _provider_fingerprint
+
+# Per-provider reference data: recommended scopes and developer console URLs
+PROVIDER_REFERENCE = {
+    "github": {
+        "recommended_scopes": ["user:email"],
+        "console_url": "https://github.com/settings/developers",
+        "console_label": "GitHub Developer Settings",
+    },
+    "google": {
+        "recommended_scopes": ["profile", "email"],
+        "console_url": "https://console.cloud.google.com/apis/credentials",
+        "console_label": "Google Cloud Console",
+    },
+    "gitlab": {
+        "recommended_scopes": ["read_user"],
+        "console_url": "https://gitlab.com/-/user_settings/applications",
+        "console_label": "GitLab Applications",
+    },
+    "microsoft": {
+        "recommended_scopes": ["User.Read"],
+        "console_url": "https://portal.azure.com/#blade/Microsoft_AAD_RegisteredApps",
+        "console_label": "Azure App Registrations",
+    },
+    "twitter": {
+        "recommended_scopes": [],
+        "console_url": "https://developer.twitter.com/en/portal/projects-and-apps",
+        "console_label": "Twitter Developer Portal",
+    },
+    "facebook": {
+        "recommended_scopes": ["email", "public_profile"],
+        "console_url": "https://developers.facebook.com/apps/",
+        "console_label": "Meta for Developers",
+    },
+}
+
+PROVIDER_ICONS = {
+    "github": "GH",
+    "google": "G",
+    "gitlab": "GL",
+    "microsoft": "MS",
+    "twitter": "X",
+    "facebook": "FB",
+}
+
+# Process-level snapshot: (fingerprint, configs tuple) or None
+_config_cache = None
+
+
+def _settings_snippet(pid, scopes):
+    """Settings example with env vars for the credentials."""
+    env_prefix = pid.upper()
+    lines = [
+        "SOCIALACCOUNT_PROVIDERS = {",
+        f'    "{pid}": {{',
+        '        "APP": {',
+        f'            "client_id": os.getenv("{env_prefix}_CLIENT_ID", ""),',
+        f'            "secret": os.getenv("{env_prefix}_CLIENT_SECRET", ""),',
+        "        },",
+    ]
+    if scopes:
+        scope_str = ", ".join(f'"{s}"' for s in scopes)
+        lines.append(f"        \"SCOPE\": [{scope_str}],")
+    lines.extend([
+        "    },",
+        "}",
+    ])
+    return "\n".join(lines)
+
+
+def _compile_provider(provider_cls, provider_conf):
+    pid = provider_cls.id
+    app_conf = provider_conf.get("APP", {})
+
+    # Safe config summary (never expose secrets)
+    client_id = app_conf.get("client_id", "")
+    if client_id:
+        masked_client_id = client_id[:8] + "..." + client_id[-4:]
+    else:
+        masked_client_id = ""
+    has_secret = bool(app_conf.get("secret"))
+    # SCOPE belongs at provider level, but check inside APP too
+    scopes = tuple(provider_conf.get("SCOPE", []) or app_conf.get("SCOPE", []))
+    scope_misplaced = bool(app_conf.get("SCOPE") and not provider_conf.get("SCOPE"))
+    extra_settings = {
+        k: v for k, v in provider_conf.items() if k not in ("APP", "SCOPE")
+    }
+
+    ref = PROVIDER_REFERENCE.get(pid, {})
+    recommended_scopes = tuple(ref.get("recommended_scopes", []))
+
+    return {
+        "id": pid,
+        "name": provider_cls.name,
+        "icon": PROVIDER_ICONS.get(pid, pid[:2].upper()),
+        "has_credentials": bool(client_id),
+        "callback_path": f"/accounts/{pid}/login/callback/",
+        "masked_client_id": masked_client_id,
+        "has_secret": has_secret,
+        "scopes": scopes,
+        "recommended_scopes": recommended_scopes,
+        "extra_settings": extra_settings,
+        "console_url": ref.get("console_url", ""),
+        "console_label": ref.get("console_label", ""),
+        # (label, is_done) pairs
+        "checklist": (
+            ("Client ID", bool(client_id)),
+            ("Client Secret", has_secret),
+            ("Scopes configured", bool(scopes)),
+        ),
+        "settings_snippet": _settings_snippet(pid, scopes or recommended_scopes),
+        "scope_misplaced": scope_misplaced,
+    }
+
+
+def get_provider_config():
+    """Return a tuple of compiled provider configurations.
+
+    Each item is a plain dict (LiveView contexts cannot serialize read-only
+    mappings); see :func:`_compile_provider` for the keys. The items and
+    their ``extra_settings`` are copies of the cached snapshot, so callers
+    may modify them. Returns an empty tuple if ``django-allauth`` is not
+    installed.
+    """
+    global _config_cache
+    from django.conf import settings
+
+    registry = _get_registry()
+    if registry is None:
+        return ()
+
+    try:
+        if not registry.loaded:
+            registry.load()
+        fingerprint = _provider_fingerprint(registry)
+        cached = _config_cache
+        if cached is not None and cached[0] == fingerprint:
+            return _copy(cached[1])
+        configured = getattr(settings, "SOCIALACCOUNT_PROVIDERS", {})
+        configs = tuple(
+            _compile_provider(provider_cls, configured.get(provider_cls.id, {}))
+            for provider_cls in registry.get_class_list()
+        )
+    except Exception:
+        return ()
+
+    _config_cache = (fingerprint, configs)
+    return _copy(configs)
+
+
+def _copy(configs):
+    return tuple(
+        {**config, "extra_settings": dict(config["extra_settings"])}
+        for config in configs
+    )
+
+
+def invalidate_provider_config():
+    """Discard the compiled snapshot; the next call recompiles it."""
+    global _config_cache
+    _config_cache = None
+
+
+def compile_provider_config():
+    """Compile the snapshot now (called from ``DjustAuthConfig.ready()``)."""
+    invalidate_provider_config()
+    return get_provider_config()
+
+
+@receiver(setting_changed)
+def _on_setting_changed(setting, **kwargs):
+    if setting in ("SOCIALACCOUNT_PROVIDERS", "INSTALLED_APPS"):
+        invalidate_provider_config()
@@ -0,0 +1,187 @@
+"""Per-user auth version tokens for re-validating long-lived LiveViews.
+
+A LiveView socket outlives the request that authenticated it. The auth
+mixins record the user's auth version when a view is rendered or mounted
+and compare it before every event handler runs: one ``get_many`` against
+the djust-auth cache, no session or user table reads.
+
+A user's token is replaced when they change their password, are
+deactivated, gain or lose ``is_staff``/``is_superuser``, or their
+permissions change (see :mod:`djust_auth.permissions`). Logging out
+replaces the token of that session only, so views open in the user's other
+sessions keep working. A global token is replaced when group permissions
+change, which may affect any user. A token missing from the cache
+(evicted, or the cache was cleared) reads as a new version, so eviction
+can only cut sessions off, never keep a revoked one alive.
+
+The tokens must live in a cache shared by every worker (``DJUST_AUTH_CACHE``,
+e.g. Redis or Memcached). With a per-process cache such as ``LocMemCache``
+a logout handled by one worker does not reach sockets open on the others;
+the ``djust_auth.W001`` system check warns about this.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.core import checks
+from django.db import transaction
+from django.db.models.signals import post_init, post_save
+
+from .cache import get_cache
+
+GLOBAL_AUTH_VERSION_KEY = "djust_auth:auth_version:global"
+
+_PROCESS_LOCAL_CACHES = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+# User flags that change what the auth mixins allow
+_PRIVILEGE_FIELDS = ("is_staff", "is_superuser")
+
+
+def _user_key(user_pk):
+    return f"djust_auth:auth_version:user:{user_pk}"
+
+
+def _session_key(session_key):
+    return f"djust_auth:auth_version:session:{session_key}"
+
+
+def _version_keys(user_pk, session_key=None):
+    keys = [GLOBAL_AUTH_VERSION_KEY, _user_key(user_pk)]
+    if session_key:
+        keys.append(_session_key(session_key))
+    return keys
+
+
+def _resolve(cache, keys, found):
+    """Return the token tuple for ``keys``, creating missing tokens."""
+    missing = {key: uuid.uuid4().hex for key in keys if key not in found}
+    for key, token in missing.items():
+        cache.add(key, token, timeout=None)
+    if missing:
+        found = {**found, **cache.get_many(list(missing))}
+    return tuple(found.get(key, missing.get(key)) for key in keys)
+
+
+def get_auth_version(user_pk, session_key=None):
+    """Return the current auth version token for ``user_pk``.
+
+    With ``session_key`` the token also changes when that session logs out.
+    """
+    cache = get_cache()
+    keys = _version_keys(user_pk, session_key)
+    return _resolve(cache, keys, cache.get_many(keys))
+
+
+async def aget_auth_version(user_pk, session_key=None):
+    """Async variant of :func:`get_auth_version`."""
+    cache = get_cache()
+    keys = _version_keys(user_pk, session_key)
+    found = await cache.aget_many(keys)
+    if len(found) == len(keys):
+        return tuple(found[key] for key in keys)
+    from asgiref.sync import sync_to_async
+
+    return await sync_to_async(_resolve)(cache, keys, found)
+
+
+def bump_auth_version(user_pks=None):
+    """Retire the auth version of ``user_pks``, or of every user.
+
+    Applied immediately and again on commit, so a view mounted while the
+    change was still uncommitted cannot keep the old token.
+    """
+    if user_pks is not None:
+        user_pks = list(user_pks)
+
+    def bump():
+        if user_pks is None:
+            get_cache().set(GLOBAL_AUTH_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        else:
+            get_cache().set_many(
+                {_user_key(pk): uuid.uuid4().hex for pk in user_pks}, timeout=None
+            )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def bump_session_auth_version(session_key):
+    """Retire the auth version of one session, e.g. when it logs out."""
+    get_cache().set(_session_key(session_key), uuid.uuid4().hex, timeout=None)
+
+
+def check_shared_cache(app_configs=None, **kwargs):
+    """System check: warn when auth versions live in a per-process cache."""
+    alias = getattr(settings, "DJUST_AUTH_CACHE", "default")
+    backend = settings.CACHES.get(alias, {}).get("BACKEND", "")
+    if backend not in _PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        checks.Warning(
+            f"The djust-auth cache ({alias!r}) uses {backend.rsplit('.', 1)[-1]}, "
+            "which is not shared between worker processes.",
+            hint=(
+                "A logout or password change handled by one worker will not "
+                "revoke LiveViews open on other workers. Point DJUST_AUTH_CACHE "
+                "at a shared cache such as Redis or Memcached."
+            ),
+            id="djust_auth.W001",
+        )
+    ]
+
+
+# ---- Receivers ----
+
+
+def _user_logged_out(sender, request, user, **kwargs):
+    if user is None:
+        return
+    # Sent before logout() flushes the session, so the key is still set
+    session_key = getattr(getattr(request, "session", None), "session_key", None)
+    if session_key:
+        bump_session_auth_version(session_key)
+    else:
+        bump_auth_version([user.pk])
+
+
+def _privilege_flags(user):
+    # From __dict__, so a deferred field is not loaded
+    return tuple(user.__dict__.get(field) for field in _PRIVILEGE_FIELDS)
+
+
+def _user_post_init(sender, instance, **kwargs):
+    instance._djust_auth_flags = _privilege_flags(instance)
+
+
+def _user_post_save(sender, instance, created, raw=False, **kwargs):
+    flags = _privilege_flags(instance)
+    flags_changed = flags != instance.__dict__.get("_djust_auth_flags", flags)
+    instance._djust_auth_flags = flags
+    if raw or created:
+        return
+    # AbstractBaseUser.set_password() keeps the raw password in _password
+    # until save() has finished, so it is still set during post_save.
+    password_changed = getattr(instance, "_password", None) is not None
+    if (
+        password_changed
+        or flags_changed
+        or not getattr(instance, "is_active", True)
+    ):
+        bump_auth_version([instance.pk])
+
+
+def connect_signals():
+    """Connect the receivers (called from ``AppConfig.ready()``)."""
+    user_logged_out.connect(_user_logged_out, dispatch_uid="djust_auth_revocation")
+    post_init.connect(
+        _user_post_init, sender=get_user_model(), dispatch_uid="djust_auth_revocation"
+    )
+    post_save.connect(
+        _user_post_save, sender=get_user_model(), dispatch_uid="djust_auth_revocation"
+    )
@@ -0,0 +1,259 @@
+"""Daily activity rollups for the admin dashboards.
+
+When ``DJUST_AUTH_ROLLUPS = True`` the receivers below count signups,
+social account links and logins into one
+:class:`~djust_auth.models.AuthDailyRollup` row per day and scope
+(``"global"`` or an OAuth provider id). The admin pages then read recent
+activity and trends from a few hundred pre-aggregated rows instead of
+scanning the user and social account tables.
+
+Rollups count events, so deleting a user or social account does not
+change past days. Every increment is an atomic ``F()`` update inside the
+caller's transaction. ``manage.py rebuild_auth_rollups`` backfills the rows
+from ``date_joined`` and ``last_login``; logins before the last one of
+each user or account are not recorded anywhere and cannot be recovered.
+"""
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import AuthDailyRollup
+
+METRICS = ("signups", "links", "logins")
+WINDOWS = (7, 30, 90)
+SPARKLINE_DAYS = 30
+
+
+def rollups_enabled():
+    return getattr(settings, "DJUST_AUTH_ROLLUPS", False)
+
+
+def _day(value=None):
+    if value is None:
+        return timezone.localdate()
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+def _bump(scope, day, **deltas):
+    """Atomically add ``deltas`` to the rollup row for ``scope`` and ``day``."""
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    rows = AuthDailyRollup.objects.filter(day=day, scope=scope)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            AuthDailyRollup.objects.create(day=day, scope=scope, **deltas)
+    except IntegrityError:
+        # Another process created the row first
+        rows.update(**updates)
+
+
+# ---- Reading ----
+
+
+def sparkline_points(values, width=100, height=20):
+    """Return SVG ``polyline`` points scaling ``values`` into the box."""
+    if not values:
+        return ""
+    peak = max(values) or 1
+    step = width / max(len(values) - 1, 1)
+    return " ".join(
+        f"{round(i * step, 1)},{round(height - value * height / peak, 1)}"
+        for i, value in enumerate(values)
+    )
+
+
+def get_activity(today=None):
+    """Return recent activity per scope from the rollup table (one query).
+
+    Maps each scope with activity in the last 90 days to ``{"windows":
+    [...], "sparklines": {...}}``. ``windows`` holds one dict per period
+    (``days``, ``signups``, ``links``, ``logins``) for 7, 30 and 90 days;
+    ``sparklines`` maps each metric to polyline points for its daily values
+    over the last 30 days.
+    """
+    today = today or _day()
+    first_day = today - timedelta(days=max(WINDOWS) - 1)
+    series = {}
+    rows = AuthDailyRollup.objects.filter(day__gte=first_day, day__lte=today)
+    for day, scope, *values in rows.values_list("day", "scope", *METRICS):
+        by_metric = series.setdefault(
+            scope, {metric: [0] * max(WINDOWS) for metric in METRICS}
+        )
+        index = (day - first_day).days
+        for metric, value in zip(METRICS, values):
+            by_metric[metric][index] = value
+
+    activity = {}
+    for scope, by_metric in series.items():
+        activity[scope] = {
+            "windows": [
+                {
+                    "days": days,
+                    **{metric: sum(by_metric[metric][-days:]) for metric in METRICS},
+                }
+                for days in WINDOWS
+            ],
+            "sparklines": {
+                metric: sparkline_points(by_metric[metric][-SPARKLINE_DAYS:])
+                for metric in METRICS
+            },
+        }
+    return activity
+
+
+# ---- Receivers ----
+
+
+def _user_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    day = _day(getattr(instance, "date_joined", None))
+    _bump(AuthDailyRollup.GLOBAL, day, signups=1)
+
+
+def _user_logged_in(sender, request, user, **kwargs):
+    _bump(AuthDailyRollup.GLOBAL, _day(), logins=1)
+
+
+def _social_account_post_save(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    day = _day(instance.date_joined)
+    _bump(AuthDailyRollup.GLOBAL, day, links=1)
+    _bump(instance.provider, day, links=1)
+
+
+def _social_signed_up(sender, request, user, sociallogin=None, **kwargs):
+    if sociallogin is not None:
+        _bump(sociallogin.account.provider, _day(), signups=1)
+
+
+def _social_logged_in(sender, request, user, sociallogin=None, **kwargs):
+    if sociallogin is not None:
+        _bump(sociallogin.account.provider, _day(), logins=1)
+
+
+def _signals():
+    User = get_user_model()
+    yield post_save, _user_post_save, User
+    yield user_logged_in, _user_logged_in, None
+    if apps.is_installed("allauth.socialaccount"):
+        from allauth.account import signals as account_signals
+        from allauth.socialaccount.models import SocialAccount
+
+        yield post_save, _social_account_post_save, SocialAccount
+        yield account_signals.user_signed_up, _social_signed_up, None
+        yield account_signals.user_logged_in, _social_logged_in, None
+
+
+def connect_signals():
+    """Connect the rollup receivers (called from ``AppConfig.ready()``)."""
+    for signal, receiver, sender in _signals():
+        signal.connect(receiver, sender=sender, dispatch_uid="djust_auth_rollups")
+
+
+def disconnect_signals():
+    """Disconnect the rollup receivers."""
+    for signal, _receiver, sender in _signals():
+        signal.disconnect(sender=sender, dispatch_uid="djust_auth_rollups")
+
+
+# ---- Bulk inserts ----
+
+
+def record_bulk_insert(users=(), social_accounts=()):
+    """Count users and social accounts created without model signals.
+
+    For ``bulk_create()`` callers such as :mod:`djust_auth.bulk_import`;
+    counts the same way :func:`rebuild_rollups` would. Call it inside the
+    transaction that inserted the rows.
+    """
+    totals = {}
+
+    def add(scope, day, metric):
+        counts = totals.setdefault((scope, day), dict.fromkeys(METRICS, 0))
+        counts[metric] += 1
+
+    joined = {}
+    for user in users:
+        joined[user.pk] = _day(user.date_joined)
+        add(AuthDailyRollup.GLOBAL, joined[user.pk], "signups")
+    for account in social_accounts:
+        day = _day(account.date_joined)
+        add(AuthDailyRollup.GLOBAL, day, "links")
+        add(account.provider, day, "links")
+        if joined.get(account.user_id) == day:
+            add(account.provider, day, "signups")
+    for (scope, day), counts in totals.items():
+        _bump(scope, day, **{metric: n for metric, n in counts.items() if n})
+
+
+# ---- Backfill ----
+
+
+@transaction.atomic
+def rebuild_rollups(days=None):
+    """Recompute rollup rows from the user and social account tables.
+
+    Only the last ``days`` days are rebuilt when given, otherwise all of
+    them. Logins are approximated by each user's (and social account's)
+    ``last_login``. Returns the number of rows written.
+    """
+    User = get_user_model()
+    since = None if days is None else _day() - timedelta(days=days - 1)
+    totals = {}
+
+    def add(queryset, date_field, scope_field, metric):
+        queryset = queryset.order_by().annotate(day=TruncDate(date_field))
+        if since is not None:
+            queryset = queryset.filter(day__gte=since)
+        values = ["day"] if scope_field is None else ["day", scope_field]
+        for row in queryset.values(*values).annotate(n=Count("pk")):
+            if row["day"] is None:
+                continue
+            scope = row.get(scope_field, AuthDailyRollup.GLOBAL)
+            counts = totals.setdefault((row["day"], scope), dict.fromkeys(METRICS, 0))
+            counts[metric] += row["n"]
+
+    add(User.objects.all(), "date_joined", None, "signups")
+    add(User.objects.exclude(last_login=None), "last_login", None, "logins")
+
+    if apps.is_installed("allauth.socialaccount"):
+        from allauth.socialaccount.models import SocialAccount
+
+        accounts = SocialAccount.objects.all()
+        add(accounts, "date_joined", None, "links")
+        add(accounts, "date_joined", "provider", "links")
+        add(accounts.exclude(last_login=None), "last_login", "provider", "logins")
+        # A provider signup: the account was linked on the day the user joined
+        add(
+            accounts.alias(
+                linked_day=TruncDate("date_joined"),
+                joined_day=TruncDate("user__date_joined"),
+            ).filter(linked_day=F("joined_day")),
+            "date_joined",
+            "provider",
+            "signups",
+        )
+
+    stale = AuthDailyRollup.objects.all()
+    if since is not None:
+        stale = stale.filter(day__gte=since)
+    stale.delete()
+    AuthDailyRollup.objects.bulk_create(
+        AuthDailyRollup(day=day, scope=scope, **counts)
+        for (day, scope), counts in totals.items()
+    )
+    return len(totals)
@@ -0,0 +1,222 @@
+"""Search backends for the social accounts admin listing.
+
+A backend turns the admin's search box input into a queryset filter. The
+view picks one with its ``search_backend`` attribute, falling back to the
+``DJUST_AUTH_SEARCH_BACKEND`` setting (a dotted path).
+
+``IContainsSearchBackend`` (default)
+    Case-insensitive substring match on username, email and uid; scans
+    both tables.
+``PrefixSearchBackend``
+    Case-insensitive prefix match on username and email plus
+    case-insensitive exact uid. It scans like the default unless the
+    database has matching expression indexes (on PostgreSQL,
+    ``UPPER(col) text_pattern_ops`` on each column). An OR across the user
+    join rarely uses them; prefer ``SearchKeySearchBackend`` for large
+    tables.
+``SearchKeySearchBackend``
+    Matches against :class:`~djust_auth.models.SocialAccountSearchKey`,
+    a normalized, indexed copy of each account's username, email and uid.
+    Case-insensitive prefix search everywhere, substring search through a
+    trigram index on PostgreSQL for terms of three characters or more.
+    Requires ``DJUST_AUTH_SEARCH_INDEX = True`` so the keys are maintained
+    (``ImproperlyConfigured`` otherwise), and ``manage.py
+    rebuild_auth_search_index`` to backfill existing accounts.
+
+Custom backends subclass ``BaseSearchBackend`` and list their ``lookups``,
+or override ``filter()``.
+"""
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_delete, post_save
+from django.utils.module_loading import import_string
+
+from .models import SocialAccountSearchKey
+
+DEFAULT_SEARCH_BACKEND = "djust_auth.search.IContainsSearchBackend"
+
+# Shorter terms have no trigram to look up
+TRIGRAM_MIN_LENGTH = 3
+
+
+def normalize(value):
+    """Normalize a search term or key value for comparison."""
+    return (value or "").strip().lower()
+
+
+def get_search_backend(backend=None):
+    """Return a backend instance from a class, dotted path or the setting."""
+    if backend is None:
+        backend = getattr(settings, "DJUST_AUTH_SEARCH_BACKEND", DEFAULT_SEARCH_BACKEND)
+    if isinstance(backend, str):
+        backend = import_string(backend)
+    return backend()
+
+
+class BaseSearchBackend:
+    """Filter a ``SocialAccount`` queryset by a search term.
+
+    Matches rows where any of ``lookups`` matches the stripped term.
+    """
+
+    lookups = None
+
+    def filter(self, queryset, query):
+        if not self.lookups:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} is missing the lookups attribute. "
+                f"Define {type(self).__name__}.lookups or override filter()."
+            )
+        query = query.strip()
+        condition = Q()
+        for lookup in self.lookups:
+            condition |= Q(**{lookup: query})
+        return queryset.filter(condition)
+
+
+class IContainsSearchBackend(BaseSearchBackend):
+    lookups = ("user__username__icontains", "user__email__icontains", "uid__icontains")
+
+
+class PrefixSearchBackend(BaseSearchBackend):
+    lookups = ("user__username__istartswith", "user__email__istartswith", "uid__iexact")
+
+
+class SearchKeySearchBackend(BaseSearchBackend):
+    def __init__(self):
+        if not getattr(settings, "DJUST_AUTH_SEARCH_INDEX", False):
+            raise ImproperlyConfigured(
+                "SearchKeySearchBackend requires DJUST_AUTH_SEARCH_INDEX = True; "
+                "without it the search keys are not maintained."
+            )
+
+    def use_trigram(self, using):
+        default = connections[using].vendor == "postgresql"
+        return getattr(settings, "DJUST_AUTH_SEARCH_TRIGRAM", default)
+
+    def filter(self, queryset, query):
+        query = normalize(query)
+        keys = SocialAccountSearchKey.objects.using(queryset.db)
+        if len(query) >= TRIGRAM_MIN_LENGTH and self.use_trigram(queryset.db):
+            keys = keys.filter(text__contains=query)
+        else:
+            keys = keys.filter(
+                Q(username__startswith=query)
+                | Q(email__startswith=query)
+                | Q(uid__startswith=query)
+            )
+        return queryset.filter(pk__in=keys.values("account_id"))
+
+
+# ---- Search key maintenance ----
+
+
+def build_search_key(account, user=None):
+    """Return an unsaved :class:`SocialAccountSearchKey` for ``account``."""
+    user = user or account.user
+    username = normalize(getattr(user, user.USERNAME_FIELD, ""))
+    email = normalize(getattr(user, "email", ""))
+    uid = normalize(account.uid)
+    return SocialAccountSearchKey(
+        account_id=account.pk,
+        username=username,
+        email=email,
+        uid=uid,
+        text=f"{username} {email} {uid}",
+    )
+
+
+def _social_account_post_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    key = build_search_key(instance)
+    SocialAccountSearchKey.objects.update_or_create(
+        account_id=key.account_id,
+        defaults={
+            "username": key.username,
+            "email": key.email,
+            "uid": key.uid,
+            "text": key.text,
+        },
+    )
+
+
+def _social_account_post_delete(sender, instance, **kwargs):
+    SocialAccountSearchKey.objects.filter(account_id=instance.pk).delete()
+
+
+def _user_post_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created:
+        return
+    watched = {sender.USERNAME_FIELD, "email"}
+    if update_fields is not None and not watched & set(update_fields):
+        return
+    from allauth.socialaccount.models import SocialAccount
+
+    username = normalize(getattr(instance, sender.USERNAME_FIELD, ""))
+    email = normalize(getattr(instance, "email", ""))
+    SocialAccountSearchKey.objects.filter(
+        account_id__in=SocialAccount.objects.filter(user=instance).values("pk")
+    ).update(
+        username=username,
+        email=email,
+        text=Concat(Value(f"{username} {email} "), F("uid")),
+    )
+
+
+def connect_signals():
+    """Connect the search key receivers (called from ``AppConfig.ready()``)."""
+    if not apps.is_installed("allauth.socialaccount"):
+        return
+    from allauth.socialaccount.models import SocialAccount
+
+    post_save.connect(
+        _social_account_post_save, sender=SocialAccount, dispatch_uid="djust_auth_search"
+    )
+    post_delete.connect(
+        _social_account_post_delete, sender=SocialAccount, dispatch_uid="djust_auth_search"
+    )
+    post_save.connect(
+        _user_post_save, sender=get_user_model(), dispatch_uid="djust_auth_search"
+    )
+
+
+def disconnect_signals():
+    """Disconnect the search key receivers."""
+    if not apps.is_installed("allauth.socialaccount"):
+        return
+    from allauth.socialaccount.models import SocialAccount
+
+    post_save.disconnect(sender=SocialAccount, dispatch_uid="djust_auth_search")
+    post_delete.disconnect(sender=SocialAccount, dispatch_uid="djust_auth_search")
+    post_save.disconnect(sender=get_user_model(), dispatch_uid="djust_auth_search")
+
+
+def rebuild_search_index(batch_size=2000):
+    """Recreate every search key from the social account table.
+
+    Streams accounts in pk order and writes keys in batches, so memory use
+    does not grow with the table. Returns the number of keys written.
+    """
+    from allauth.socialaccount.models import SocialAccount
+
+    SocialAccountSearchKey.objects.all().delete()
+    accounts = SocialAccount.objects.select_related("user").order_by("pk")
+    written = 0
+    batch = []
+    for account in accounts.iterator(chunk_size=batch_size):
+        batch.append(build_search_key(account))
+        if len(batch) >= batch_size:
+            SocialAccountSearchKey.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        SocialAccountSearchKey.objects.bulk_create(batch)
+        written += len(batch)
+    return written
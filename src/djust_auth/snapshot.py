@@ -0,0 +1,225 @@
+"""Cached user snapshots for authenticated requests.
+
+Loading ``request.user`` normally costs a session read plus a query on the
+user table, on every HTTP mount and reconnect of a LiveView. With either
+of the optional pieces below, the user is rebuilt from a snapshot in the
+djust-auth cache instead, so that query only runs on a cache miss.
+
+``djust_auth.snapshot.CachedModelBackend``
+    A ``ModelBackend`` whose ``get_user()`` reads the snapshot. Sessions
+    created through it (and anything that resolves users through the
+    session backend, such as the Channels auth middleware) use snapshots.
+
+``djust_auth.snapshot.UserSnapshotMiddleware``
+    Add after ``AuthenticationMiddleware``. Replaces ``request.user`` and
+    ``request.auser`` so that sessions of any ``ModelBackend`` use
+    snapshots. The auth mixins read the user from there.
+
+A snapshot holds the user's concrete fields except the password, which is
+deferred (loaded on access), plus the session auth hash used to verify the
+session. ``get_session_auth_hash()`` returns that cached hash only while the
+password is deferred; once it is loaded or changed (``set_password()``) the
+hash is computed as usual, so ``update_session_auth_hash()`` stores the new
+one. Each user has a version token in the cache that is replaced when
+the user is saved or deleted (which covers password changes and
+deactivation) and on logout. A snapshot is only used while its version is
+current: one ``get_many`` per request. Anything that does not verify, such
+as a session hash from ``SECRET_KEY_FALLBACKS``, falls back to
+``django.contrib.auth.get_user()``.
+
+``DJUST_AUTH_USER_SNAPSHOT_TTL`` sets the snapshot lifetime in seconds
+(default 300).
+"""
+
+import uuid
+from functools import partial
+from types import MethodType
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.signals import user_logged_out
+from django.db import router, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject
+
+from .cache import get_cache
+from .instrumentation import record_cache
+
+
+def _snapshot_key(user_pk):
+    return f"djust_auth:user_snapshot:{user_pk}"
+
+
+def _version_key(user_pk):
+    return f"djust_auth:user_snapshot:version:{user_pk}"
+
+
+def _ttl():
+    return getattr(settings, "DJUST_AUTH_USER_SNAPSHOT_TTL", 300)
+
+
+def _snapshot_session_auth_hash(user):
+    if "password" in user.get_deferred_fields():
+        return user._djust_auth_session_hash
+    return type(user).get_session_auth_hash(user)
+
+
+def _from_snapshot(data, session_hash):
+    User = get_user_model()
+    user = User.from_db(router.db_for_read(User), list(data), list(data.values()))
+    # Verifying the session must not load the deferred password
+    user._djust_auth_session_hash = session_hash
+    user.get_session_auth_hash = MethodType(_snapshot_session_auth_hash, user)
+    return user
+
+
+def get_user_snapshot(user_pk):
+    """Return the user with pk ``user_pk``, from its snapshot if current.
+
+    Returns None if the user does not exist. ``is_active`` is not checked.
+    """
+    User = get_user_model()
+    try:
+        user_pk = User._meta.pk.to_python(user_pk)
+    except Exception:
+        return None
+    cache = get_cache()
+    snapshot_key, version_key = _snapshot_key(user_pk), _version_key(user_pk)
+    found = cache.get_many([snapshot_key, version_key])
+    version = found.get(version_key)
+    snapshot = found.get(snapshot_key)
+    if version is not None and snapshot is not None and snapshot[0] == version:
+        record_cache(True)
+        return _from_snapshot(snapshot[1], snapshot[2])
+
+    record_cache(False)
+    if version is None:
+        cache.add(version_key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(version_key)
+    try:
+        user = User._default_manager.get(pk=user_pk)
+    except User.DoesNotExist:
+        return None
+    if version is not None:
+        data = {
+            field.attname: getattr(user, field.attname)
+            for field in User._meta.concrete_fields
+            if field.attname != "password"
+        }
+        cache.set(
+            snapshot_key, (version, data, user.get_session_auth_hash()), _ttl()
+        )
+    return user
+
+
+def invalidate_user_snapshots(user_pks):
+    """Retire the snapshots of ``user_pks``.
+
+    Applied immediately and again on commit, so a snapshot taken while the
+    change was still uncommitted is not used afterwards.
+    """
+    user_pks = list(user_pks)
+
+    def bump():
+        get_cache().delete_many(
+            [key for pk in user_pks for key in (_version_key(pk), _snapshot_key(pk))]
+        )
+
+    bump()
+    transaction.on_commit(bump)
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` that resolves session users from snapshots."""
+
+    def get_user(self, user_id):
+        user = get_user_snapshot(user_id)
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+
+_SNAPSHOT_GET_USER = (ModelBackend.get_user, CachedModelBackend.get_user)
+
+
+def _load_user(request):
+    try:
+        user_id = auth._get_user_session_key(request)
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        return auth.get_user(request)
+    if backend_path in settings.AUTHENTICATION_BACKENDS:
+        backend = auth.load_backend(backend_path)
+        # Backends that override get_user() keep their own lookup
+        if type(backend).get_user in _SNAPSHOT_GET_USER:
+            user = get_user_snapshot(user_id)
+            session_hash = request.session.get(HASH_SESSION_KEY)
+            if (
+                user is not None
+                and backend.user_can_authenticate(user)
+                and session_hash
+                and constant_time_compare(session_hash, user.get_session_auth_hash())
+            ):
+                return user
+    return auth.get_user(request)
+
+
+def get_request_user(request):
+    """Return the (snapshot) user for ``request``, cached on the request."""
+    if not hasattr(request, "_djust_auth_user"):
+        request._djust_auth_user = _load_user(request)
+    return request._djust_auth_user
+
+
+async def aget_request_user(request):
+    """Async variant of :func:`get_request_user`."""
+    if not hasattr(request, "_djust_auth_user"):
+        from asgiref.sync import sync_to_async
+
+        request._djust_auth_user = await sync_to_async(_load_user)(request)
+    return request._djust_auth_user
+
+
+class UserSnapshotMiddleware:
+    """Resolve ``request.user`` from user snapshots.
+
+    Place after ``django.contrib.auth.middleware.AuthenticationMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(partial(get_request_user, request))
+        request.auser = partial(aget_request_user, request)
+        return self.get_response(request)
+
+
+def is_configured():
+    """Whether the backend or the middleware is enabled in settings."""
+    return (
+        f"{__name__}.CachedModelBackend" in settings.AUTHENTICATION_BACKENDS
+        or f"{__name__}.UserSnapshotMiddleware" in (settings.MIDDLEWARE or ())
+    )
+
+
+# ---- Receivers ----
+
+
+def _user_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_user_snapshots([instance.pk])
+
+
+def _user_logged_out(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user_snapshots([user.pk])
+
+
+def connect_signals():
+    """Connect the receivers (called from ``AppConfig.ready()``)."""
+    User = get_user_model()
+    post_save.connect(_user_changed, sender=User, dispatch_uid="djust_auth_snapshot")
+    post_delete.connect(_user_changed, sender=User, dispatch_uid="djust_auth_snapshot")
+    user_logged_out.connect(_user_logged_out, dispatch_uid="djust_auth_snapshot")
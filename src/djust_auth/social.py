@@ -2,15 +2,40 @@
 
 Provides a context processor that detects available OAuth backends
 and injects provider metadata (name, label, icon) into template context.
+
+The provider list is built once per process and shared by every request.
+It is rebuilt automatically when the allauth registry or
+``SOCIALACCOUNT_PROVIDERS`` changes; call :func:`invalidate_provider_cache`
+to force a rebuild, or :func:`warm_provider_cache` from your WSGI/ASGI
+entry point to build it before the first request arrives.
+
+Use :func:`lazy_social_auth_providers` instead of
+:func:`social_auth_providers` when most pages never render login buttons:
+it defers all provider work until a template actually reads the value.
+
+With ``DJUST_AUTH_ICON_MODE = "sprite"`` each icon is a ``<use href>``
+reference into one SVG sprite served by the ``djust_auth:icon_sprite``
+view with a far-future cache lifetime, instead of inline path data.
+Browsers only follow same-origin ``<use href>`` references, so the sprite
+cannot be served from a CDN on another host. The
+``{% oauth_buttons %}`` tag (``{% load djust_auth_social %}``) renders the
+whole button block from a per-process fragment cache.
 """
 
+import hashlib
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.safestring import mark_safe
 
-# Provider display metadata: allauth provider ID -> (label, SVG icon)
+from .instrumentation import instrument, record_cache
+
+# Provider display metadata: allauth provider ID -> (label, <svg> attributes,
+# SVG body). Every icon uses a 24x24 viewBox.
 _PROVIDER_META = {
     "github": (
         "GitHub",
-        '<svg class="h-5 w-5" fill="currentColor" viewBox="0 0 24 24">'
+        'fill="currentColor"',
         '<path d="M12 0c-6.626 0-12 5.373-12 12 0 5.302 3.438 9.8 8.207 '
         "11.387.599.111.793-.261.793-.577v-2.234c-3.338.726-4.033-1.416-4.033"
         "-1.416-.546-1.387-1.333-1.756-1.333-1.756-1.089-.745.083-.729.083"
@@ -22,62 +47,166 @@ _PROVIDER_META = {
         ".242 2.874.118 3.176.77.84 1.235 1.911 1.235 3.221 0 4.609-2.807"
         " 5.624-5.479 5.921.43.372.823 1.102.823 2.222v3.293c0 .319.192"
         '.694.801.576 4.765-1.589 8.199-6.086 8.199-11.386 0-6.627-5.373'
-        '-12-12-12z"/></svg>',
+        '-12-12-12z"/>',
     ),
     "google": (
         "Google",
-        '<svg class="h-5 w-5" viewBox="0 0 24 24">'
+        "",
         '<path fill="#4285F4" d="M22.56 12.25c0-.78-.07-1.53-.2-2.25H12v4.26h5.92a5.06 5.06 0 01-2.2 3.32v2.77h3.57c2.08-1.92 3.28-4.74 3.28-8.1z"/>'
         '<path fill="#34A853" d="M12 23c2.97 0 5.46-.98 7.28-2.66l-3.57-2.77c-.98.66-2.23 1.06-3.71 1.06-2.86 0-5.29-1.93-6.16-4.53H2.18v2.84C3.99 20.53 7.7 23 12 23z"/>'
         '<path fill="#FBBC05" d="M5.84 14.09c-.22-.66-.35-1.36-.35-2.09s.13-1.43.35-2.09V7.07H2.18C1.43 8.55 1 10.22 1 12s.43 3.45 1.18 4.93l2.85-2.22.81-.62z"/>'
-        '<path fill="#EA4335" d="M12 5.38c1.62 0 3.06.56 4.21 1.64l3.15-3.15C17.45 2.09 14.97 1 12 1 7.7 1 3.99 3.47 2.18 7.07l3.66 2.84c.87-2.6 3.3-4.53 6.16-4.53z"/></svg>',
+        '<path fill="#EA4335" d="M12 5.38c1.62 0 3.06.56 4.21 1.64l3.15-3.15C17.45 2.09 14.97 1 12 1 7.7 1 3.99 3.47 2.18 7.07l3.66 2.84c.87-2.6 3.3-4.53 6.16-4.53z"/>',
     ),
     "gitlab": (
         "GitLab",
-        '<svg class="h-5 w-5" viewBox="0 0 24 24" fill="currentColor">'
+        'fill="currentColor"',
         '<path d="M22.65 14.39L12 22.13 1.35 14.39a.84.84 0 01-.3-.94l1.22-3.78 '
         "2.44-7.51a.42.42 0 01.82 0l2.44 7.51h8.06l2.44-7.51a.42.42 0 "
-        '01.82 0l2.44 7.51 1.22 3.78a.84.84 0 01-.3.94z"/></svg>',
+        '01.82 0l2.44 7.51 1.22 3.78a.84.84 0 01-.3.94z"/>',
     ),
 }
 
+ICON_MODE_INLINE = "inline"
+ICON_MODE_SPRITE = "sprite"
+SPRITE_ID_PREFIX = "djust-auth-"
+
+# (svg bytes, version) built on first use
+_sprite = None
 
-def social_auth_providers(request):
-    """Inject available OAuth providers into template context.
 
-    Returns ``{"oauth_providers": [...]}``.  Each item is a dict with keys:
-    ``name`` (provider id), ``label`` (display name), ``icon`` (SVG markup),
-    ``login_url`` (allauth login URL for this provider).
+def get_icon_sprite():
+    """Return ``(svg, version)`` for the sprite holding every provider icon.
 
-    If ``django-allauth`` is not installed the list will be empty.
+    ``version`` is a hash of the content, used to make the sprite URL
+    cacheable forever.
     """
-    try:
-        from allauth.socialaccount.providers import registry
-        from django.urls import reverse
-    except ImportError:
-        return {"oauth_providers": []}
+    global _sprite
+    if _sprite is None:
+        symbols = "".join(
+            f'<symbol id="{SPRITE_ID_PREFIX}{pid}" viewBox="0 0 24 24">{body}</symbol>'
+            for pid, (_label, _attrs, body) in _PROVIDER_META.items()
+        )
+        svg = (
+            '<svg xmlns="http://www.w3.org/2000/svg" style="display:none">'
+            f"{symbols}</svg>"
+        ).encode()
+        _sprite = (svg, hashlib.sha256(svg).hexdigest()[:12])
+    return _sprite
+
+
+def get_icon_mode():
+    """``DJUST_AUTH_ICON_MODE``: ``"inline"`` (default) or ``"sprite"``."""
+    from django.conf import settings
+
+    return getattr(settings, "DJUST_AUTH_ICON_MODE", ICON_MODE_INLINE)
+
+
+def get_sprite_url():
+    """URL of the icon sprite, or None if it cannot be resolved.
+
+    ``DJUST_AUTH_ICON_SPRITE_URL`` overrides the ``djust_auth:icon_sprite``
+    view, e.g. to serve a static copy. Browsers do not load cross-origin
+    ``<use href>`` references, so it must be a path: an override with a
+    scheme or host (even one in ``ALLOWED_HOSTS``, which may not be the
+    host serving the page) gives None, and icons are rendered inline
+    instead of empty.
+    """
+    from urllib.parse import urlsplit
+
+    from django.conf import settings
+    from django.urls import NoReverseMatch, reverse
+
+    url = getattr(settings, "DJUST_AUTH_ICON_SPRITE_URL", None)
+    if url is not None:
+        parts = urlsplit(url)
+        if parts.scheme or parts.netloc:
+            return None
+    else:
+        try:
+            url = reverse("djust_auth:icon_sprite")
+        except NoReverseMatch:
+            return None
+    return f"{url}?v={get_icon_sprite()[1]}"
+
+
+def _icon_builder():
+    """Return a function mapping a provider id to its icon markup."""
+    sprite_url = None
+    if get_icon_mode() == ICON_MODE_SPRITE:
+        sprite_url = get_sprite_url()
+
+    def icon(provider_id):
+        meta = _PROVIDER_META.get(provider_id)
+        if meta is None:
+            return ""
+        _label, attrs, body = meta
+        attrs = f"{attrs} " if attrs else ""
+        if sprite_url is None:
+            return f'<svg class="h-5 w-5" {attrs}viewBox="0 0 24 24">{body}</svg>'
+        return (
+            f'<svg class="h-5 w-5" {attrs}aria-hidden="true">'
+            f'<use href="{sprite_url}#{SPRITE_ID_PREFIX}{provider_id}"/></svg>'
+        )
+
+    return icon
+
+
+# Process-level snapshot: (fingerprint, providers tuple) or None
+_provider_cache = None
+
+# Sentinel for "allauth import not attempted yet"
+_UNRESOLVED = object()
+_registry = _UNRESOLVED
+
+
+def _get_registry():
+    """Return allauth's provider registry, or None if allauth is missing.
+
+    The import result is memoised so that deployments without allauth do
+    not pay for a failing import on every request.
+    """
+    global _registry
+    if _registry is _UNRESOLVED:
+        try:
+            from allauth.socialaccount.providers import registry
+        except ImportError:
+            registry = None
+        _registry = registry
+    return _registry
+
+
+def _provider_fingerprint(registry):
+    """Token that changes whenever the provider list could change.
+
+    Built from the registered provider ids and a hash of
+    ``SOCIALACCOUNT_PROVIDERS``, so in-place edits to the setting are seen.
+    """
+    from django.conf import settings
+
+    return (
+        tuple(registry.provider_map),
+        hash(repr(getattr(settings, "SOCIALACCOUNT_PROVIDERS", None))),
+    )
+
+
+def _build_provider_list(provider_classes):
+    from django.urls import reverse
 
     try:
-        if not registry.loaded:
-            registry.load()
-        provider_classes = registry.get_class_list()
+        base_login_url = reverse("socialaccount_login")
     except Exception:
-        return {"oauth_providers": []}
+        base_login_url = None
 
+    icon_for = _icon_builder()
     providers = []
     for provider_cls in provider_classes:
         provider_id = provider_cls.id
         meta = _PROVIDER_META.get(provider_id)
-        if meta:
-            label, icon = meta
+        label = meta[0] if meta else provider_cls.name
+        icon = icon_for(provider_id)
+        if base_login_url is not None:
+            login_url = base_login_url + "?provider=" + provider_id
         else:
-            label = provider_cls.name
-            icon = ""
-        try:
-            login_url = reverse(
-                "socialaccount_login",
-            ) + "?provider=" + provider_id
-        except Exception:
             login_url = f"/accounts/{provider_id}/login/"
         providers.append({
             "name": provider_id,
@@ -85,5 +214,172 @@ def social_auth_providers(request):
             "icon": mark_safe(icon),
             "login_url": login_url,
         })
+    return tuple(providers)
+
+
+def get_oauth_providers():
+    """Return a tuple of the available OAuth providers.
+
+    Each item is a dict with keys ``name``, ``label``, ``icon`` and
+    ``login_url``. The list is built once per process and only rebuilt when
+    the registry or ``SOCIALACCOUNT_PROVIDERS`` changes; every call gets
+    shallow copies of the cached dicts, so callers may modify them.
+    Returns an empty tuple if ``django-allauth`` is not installed.
+    """
+    global _provider_cache
+
+    registry = _get_registry()
+    if registry is None:
+        return ()
 
-    return {"oauth_providers": providers}
+    try:
+        if not registry.loaded:
+            registry.load()
+        fingerprint = _provider_fingerprint(registry)
+        cached = _provider_cache
+        if cached is not None and cached[0] == fingerprint:
+            record_cache(True)
+            providers = cached[1]
+        else:
+            record_cache(False)
+            providers = _build_provider_list(registry.get_class_list())
+            _provider_cache = (fingerprint, providers)
+    except Exception:
+        return ()
+
+    return tuple(dict(provider) for provider in providers)
+
+
+def invalidate_provider_cache():
+    """Discard the cached provider list and login-button fragments."""
+    global _provider_cache
+    _provider_cache = None
+    _fragment_cache.clear()
+
+
+def warm_provider_cache():
+    """Build the provider list now and return it.
+
+    Call this once the URLconf is importable (e.g. at the end of
+    ``wsgi.py``/``asgi.py``) so the first request does not pay for it.
+    """
+    invalidate_provider_cache()
+    return get_oauth_providers()
+
+
+@receiver(setting_changed)
+def _on_setting_changed(setting, **kwargs):
+    if setting in (
+        "SOCIALACCOUNT_PROVIDERS",
+        "ROOT_URLCONF",
+        "INSTALLED_APPS",
+        "TEMPLATES",
+        "DJUST_AUTH_ICON_MODE",
+        "DJUST_AUTH_ICON_SPRITE_URL",
+        "ALLOWED_HOSTS",
+    ):
+        invalidate_provider_cache()
+
+
+# Rendered login-button blocks keyed by the provider set
+_fragment_cache = {}
+FRAGMENT_CACHE_SIZE = 32
+BUTTONS_TEMPLATE = "djust_auth/includes/oauth_buttons.html"
+
+
+def render_oauth_buttons(providers=None):
+    """Return the login-button block for ``providers`` as safe HTML.
+
+    Defaults to :func:`get_oauth_providers`. The rendered fragment is cached
+    per process, keyed by the provider set, so pages only pay for a lookup.
+    Used by the ``{% oauth_buttons %}`` tag in ``djust_auth_social``.
+    """
+    from django.template.loader import render_to_string
+
+    if providers is None:
+        providers = get_oauth_providers()
+    providers = tuple(providers)
+    key = tuple(
+        (p["name"], p["label"], p["icon"], p["login_url"]) for p in providers
+    )
+    html = _fragment_cache.get(key)
+    if html is not None:
+        record_cache(True)
+        return html
+    record_cache(False)
+    html = mark_safe(render_to_string(BUTTONS_TEMPLATE, {"oauth_providers": providers}))
+    if len(_fragment_cache) >= FRAGMENT_CACHE_SIZE:
+        _fragment_cache.clear()
+    _fragment_cache[key] = html
+    return html
+
+
+@instrument("context_processors.social_auth_providers")
+def social_auth_providers(request):
+    """Inject available OAuth providers into template context.
+
+    Returns ``{"oauth_providers": (...)}``. Each item is a dict with
+    keys: ``name`` (provider id), ``label`` (display name), ``icon``
+    (SVG markup), ``login_url`` (allauth login URL for this provider).
+
+    The tuple comes from a process-level cache (see
+    :func:`get_oauth_providers`). If ``django-allauth`` is not installed
+    it will be empty.
+    """
+    return {"oauth_providers": get_oauth_providers()}
+
+
+class LazyProviderList:
+    """Deferred ``oauth_providers`` value.
+
+    Behaves like the provider tuple in templates (iteration, truthiness,
+    ``len`` and indexing) but only resolves it on first use, and at most
+    once per instance. Pages that never read ``oauth_providers`` pay only
+    for creating this object.
+
+    In a djust LiveView the object is kept out of the serialized state;
+    djust's renderer converts it through ``__djust_serialize__`` when the
+    template reads it, so it stays lazy there too.
+    """
+
+    __slots__ = ("_providers",)
+
+    def __init__(self):
+        self._providers = None
+
+    def _resolve(self):
+        if self._providers is None:
+            self._providers = get_oauth_providers()
+        return self._providers
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __len__(self):
+        return len(self._resolve())
+
+    def __bool__(self):
+        return bool(self._resolve())
+
+    def __getitem__(self, index):
+        return self._resolve()[index]
+
+    def __djust_serialize__(self):
+        return list(self._resolve())
+
+    def __repr__(self):
+        if self._providers is None:
+            return "<LazyProviderList (unresolved)>"
+        return f"<LazyProviderList {list(self._providers)!r}>"
+
+
+@instrument("context_processors.lazy_social_auth_providers")
+def lazy_social_auth_providers(request):
+    """Lazy variant of :func:`social_auth_providers`.
+
+    Returns ``{"oauth_providers": LazyProviderList()}``; the registry and
+    login URLs are only resolved when a template iterates or tests the
+    value. Use it in ``TEMPLATES[...]["OPTIONS"]["context_processors"]`` in
+    place of ``djust_auth.social.social_auth_providers``.
+    """
+    return {"oauth_providers": LazyProviderList()}
@@ -0,0 +1,291 @@
+"""Aggregate user and OAuth statistics for the djust-auth admin pages.
+
+Statistics are computed with as few queries as possible and cached (see
+:func:`djust_auth.cache.get_or_refresh`) so busy dashboards do not rescan
+the user table on every load.
+
+Settings:
+
+``DJUST_AUTH_STATS_TTL``
+    Seconds a computed summary is considered fresh (default 60, 0 disables
+    caching).
+``DJUST_AUTH_STATS_STALE_TTL``
+    Seconds a stale summary may still be served while it is refreshed in
+    the background (default 300).
+``DJUST_AUTH_PROVIDER_CHOICES_TTL``
+    Seconds the list of providers with linked accounts is cached (default
+    300). The list is also invalidated when a social account is created or
+    deleted; the TTL only bounds staleness after bulk operations.
+``DJUST_AUTH_COUNTERS``
+    Read totals from the signal-maintained counters in
+    :mod:`djust_auth.counters` instead of counting rows (default False).
+    Recent signups then come from the rollups only, so enable both.
+``DJUST_AUTH_ROLLUPS``
+    Read recent signups and provider activity from the daily rollups in
+    :mod:`djust_auth.rollups` instead of scanning by date (default False).
+"""
+
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Exists, Max, OuterRef, Q
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .cache import get_cache, get_or_refresh
+from .pagination import social_account_pages
+from .rollups import get_activity, rollups_enabled
+
+AUTH_SUMMARY_CACHE_KEY = "djust_auth:stats:auth_summary"
+LINKED_PROVIDERS_CACHE_KEY = "djust_auth:stats:linked_providers"
+
+
+def _allauth_installed():
+    return apps.is_installed("allauth.socialaccount")
+
+
+def _counters_enabled():
+    return getattr(settings, "DJUST_AUTH_COUNTERS", False)
+
+
+def _oauth_provider_count():
+    from allauth.socialaccount.providers import registry
+
+    if not registry.loaded:
+        registry.load()
+    return len(registry.get_class_list())
+
+
+def compute_auth_summary():
+    """Compute user/OAuth statistics with a single aggregate query.
+
+    With rollups enabled the summary also holds ``activity``: the global
+    entry of :func:`djust_auth.rollups.get_activity` (or None).
+    """
+    if _counters_enabled():
+        summary = _summary_from_counters()
+    else:
+        summary = _summary_from_tables()
+    if rollups_enabled():
+        activity = get_activity().get("global")
+        summary["activity"] = activity
+        # The first window is the last 7 days
+        summary["recent_signups"] = activity["windows"][0]["signups"] if activity else 0
+    return summary
+
+
+def _summary_from_tables():
+    User = get_user_model()
+    week_ago = timezone.now() - timedelta(days=7)
+
+    aggregates = {
+        "total_users": Count("pk"),
+        "staff_users": Count("pk", filter=Q(is_staff=True)),
+        "superusers": Count("pk", filter=Q(is_superuser=True)),
+    }
+    if not rollups_enabled():
+        aggregates["recent_signups"] = Count("pk", filter=Q(date_joined__gte=week_ago))
+
+    oauth_count = 0
+    if _allauth_installed():
+        try:
+            from allauth.socialaccount.models import SocialAccount
+
+            oauth_count = _oauth_provider_count()
+            aggregates["oauth_users"] = Count(
+                "pk",
+                filter=Q(
+                    Exists(SocialAccount.objects.filter(user=OuterRef("pk")))
+                ),
+            )
+        except Exception:
+            pass
+
+    summary = User.objects.aggregate(**aggregates)
+    summary.setdefault("oauth_users", 0)
+    summary["oauth_providers"] = oauth_count
+    return summary
+
+
+def _summary_from_counters():
+    from .models import AuthCounter
+
+    totals = (
+        AuthCounter.objects.filter(pk=AuthCounter.GLOBAL).first() or AuthCounter()
+    )
+
+    oauth_count = 0
+    if _allauth_installed():
+        try:
+            oauth_count = _oauth_provider_count()
+        except Exception:
+            pass
+
+    return {
+        "total_users": totals.users,
+        # Filled in from the rollups; None without them
+        "recent_signups": None,
+        "staff_users": totals.staff_users,
+        "superusers": totals.superusers,
+        "oauth_users": totals.oauth_users,
+        "oauth_providers": oauth_count,
+    }
+
+
+def get_auth_summary():
+    """Return the (cached) statistics shown by ``AuthSummaryWidget``.
+
+    Keys: ``total_users``, ``recent_signups``, ``staff_users``,
+    ``superusers``, ``oauth_users`` and ``oauth_providers``. A fresh dict
+    is returned on each call so callers may add to it.
+    """
+    summary = get_or_refresh(
+        AUTH_SUMMARY_CACHE_KEY,
+        compute_auth_summary,
+        ttl=getattr(settings, "DJUST_AUTH_STATS_TTL", 60),
+        stale_ttl=getattr(settings, "DJUST_AUTH_STATS_STALE_TTL", 300),
+    )
+    return dict(summary)
+
+
+def get_user_totals():
+    """Return live ``total_users`` and ``oauth_users`` counts (one query).
+
+    Unlike :func:`get_auth_summary` this is never cached, so the totals
+    agree with :func:`get_provider_stats` fetched for the same page. With
+    counters enabled both are read from the global counter row.
+    """
+    if _counters_enabled():
+        from .models import AuthCounter
+
+        totals = (
+            AuthCounter.objects.filter(pk=AuthCounter.GLOBAL).first() or AuthCounter()
+        )
+        return {"total_users": totals.users, "oauth_users": totals.oauth_users}
+
+    aggregates = {"total_users": Count("pk")}
+    if _allauth_installed():
+        from allauth.socialaccount.models import SocialAccount
+
+        aggregates["oauth_users"] = Count(
+            "pk", filter=Q(Exists(SocialAccount.objects.filter(user=OuterRef("pk"))))
+        )
+    totals = get_user_model().objects.aggregate(**aggregates)
+    totals.setdefault("oauth_users", 0)
+    return totals
+
+
+def get_provider_stats():
+    """Return social account statistics for every provider in one query.
+
+    Returns a dict keyed by provider id; each value holds
+    ``account_count``, ``last_linked`` and ``active_users_30d`` (distinct
+    users who logged in during the last 30 days). Providers without linked
+    accounts are absent. Returns an empty dict if allauth is not installed.
+
+    With rollups enabled ``active_users_30d`` is not computed (it needs a
+    join on the user table); read login activity from
+    :func:`djust_auth.rollups.get_activity` instead.
+    """
+    if not _allauth_installed():
+        return {}
+
+    from allauth.socialaccount.models import SocialAccount
+
+    thirty_days_ago = timezone.now() - timedelta(days=30)
+    if _counters_enabled():
+        return _provider_stats_from_counters(SocialAccount, thirty_days_ago)
+
+    aggregates = {"account_count": Count("pk"), "last_linked": Max("date_joined")}
+    if not rollups_enabled():
+        aggregates["active_users_30d"] = Count(
+            "user",
+            filter=Q(user__last_login__gte=thirty_days_ago),
+            distinct=True,
+        )
+    rows = SocialAccount.objects.order_by().values("provider").annotate(**aggregates)
+    return {row.pop("provider"): row for row in rows}
+
+
+def _provider_stats_from_counters(SocialAccount, thirty_days_ago):
+    from .counters import get_counters
+    from .models import AuthCounter
+
+    stats = {
+        scope: {
+            "account_count": counter.social_accounts,
+            "last_linked": counter.last_linked,
+            "active_users_30d": 0,
+        }
+        for scope, counter in get_counters().items()
+        if scope != AuthCounter.GLOBAL
+    }
+    if rollups_enabled():
+        return stats
+    # Recent activity is not counter-backed; only recently active rows join
+    active = (
+        SocialAccount.objects.filter(user__last_login__gte=thirty_days_ago)
+        .order_by()
+        .values("provider")
+        .annotate(active_users_30d=Count("user", distinct=True))
+    )
+    for row in active:
+        if row["provider"] in stats:
+            stats[row["provider"]]["active_users_30d"] = row["active_users_30d"]
+    return stats
+
+
+def get_linked_providers():
+    """Return the sorted provider ids that have at least one linked account.
+
+    Cached (``DJUST_AUTH_PROVIDER_CHOICES_TTL``) and invalidated when a
+    social account is created or deleted. Returns an empty tuple if allauth
+    is not installed.
+    """
+    if not _allauth_installed():
+        return ()
+
+    from allauth.socialaccount.models import SocialAccount
+
+    def compute():
+        return tuple(
+            SocialAccount.objects.values_list("provider", flat=True)
+            .distinct()
+            .order_by("provider")
+        )
+
+    return get_or_refresh(
+        LINKED_PROVIDERS_CACHE_KEY,
+        compute,
+        ttl=getattr(settings, "DJUST_AUTH_PROVIDER_CHOICES_TTL", 300),
+    )
+
+
+def invalidate_linked_providers():
+    """Drop the cached :func:`get_linked_providers` result."""
+    get_cache().delete(LINKED_PROVIDERS_CACHE_KEY)
+
+
+def _social_account_changed(sender, instance, created=True, raw=False, **kwargs):
+    if raw or not created:
+        return
+    # After commit, so a concurrent render cannot re-cache the old list
+    transaction.on_commit(invalidate_linked_providers)
+    transaction.on_commit(social_account_pages.clear)
+
+
+def connect_signals():
+    """Connect the cache invalidation receivers (called from ``ready()``)."""
+    if not _allauth_installed():
+        return
+    from allauth.socialaccount.models import SocialAccount
+
+    post_save.connect(
+        _social_account_changed, sender=SocialAccount, dispatch_uid="djust_auth_stats"
+    )
+    post_delete.connect(
+        _social_account_changed, sender=SocialAccount, dispatch_uid="djust_auth_stats"
+    )
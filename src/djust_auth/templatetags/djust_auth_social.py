@@ -0,0 +1,17 @@
+"""``{% load djust_auth_social %}``: cached social login buttons."""
+
+from django import template
+
+from ..social import render_oauth_buttons
+
+register = template.Library()
+
+
+@register.simple_tag
+def oauth_buttons(providers=None):
+    """Render the login-button block (``djust_auth/includes/oauth_buttons.html``).
+
+    ``{% oauth_buttons %}`` uses every available provider;
+    ``{% oauth_buttons oauth_providers %}`` renders the given list.
+    """
+    return render_oauth_buttons(providers)
@@ -0,0 +1,283 @@
+"""Sliding-window throttling for the login and signup views.
+
+Every POST to a throttled view is counted against a set of scopes (per
+client IP, per submitted username, and site-wide) before the form is
+validated, so a rejected request never reaches the password hasher or the
+database. Rejections get a ``429 Too Many Requests`` with ``Retry-After``.
+
+Limits use a sliding window counter: the current and previous fixed windows
+are kept, and the previous one is weighted by how much of it still overlaps
+the sliding window. That needs two counters per scope and one increment per
+request, whichever store is used.
+
+Throttling is off until rates are configured. Per-IP limits need the real
+client address: behind a reverse proxy ``REMOTE_ADDR`` is the proxy's, so
+every client would share one bucket. Set ``DJUST_AUTH_THROTTLE_PROXY_COUNT``
+to the number of trusted proxies in front of the site.
+
+Settings:
+
+``DJUST_AUTH_THROTTLE_RATES``
+    Maps ``"<action>:<scope>"`` to a rate such as ``"10/m"``, ``"100/h"``
+    or ``"5/30s"``; ``None`` disables that limit. Merged over
+    :data:`DEFAULT_RATES`, which enables nothing. Actions are ``login`` and
+    ``signup``; scopes are ``ip``, ``username`` and ``global``. A typical
+    setup is ``{"login:ip": "30/m", "login:username": "10/m",
+    "signup:ip": "10/h"}``.
+``DJUST_AUTH_THROTTLE_PROXY_COUNT``
+    Number of trusted reverse proxies that append to ``X-Forwarded-For``
+    (default 0: use ``REMOTE_ADDR``). See :func:`get_client_ip`.
+``DJUST_AUTH_THROTTLE_STORE``
+    Dotted path of the counter store (default
+    ``"djust_auth.throttle.CacheStore"``, shared through the djust-auth
+    cache). ``"djust_auth.throttle.LocalMemoryStore"`` keeps counters in
+    process, for single-node deployments.
+"""
+
+import abc
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+
+from .cache import get_cache
+
+DEFAULT_RATES = {
+    "login:ip": None,
+    "login:username": None,
+    "login:global": None,
+    "signup:ip": None,
+    "signup:global": None,
+}
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Parse ``"10/m"`` or ``"5/30s"`` into ``(limit, window_seconds)``."""
+    count, _, period = rate.partition("/")
+    multiplier, unit = period[:-1] or "1", period[-1:]
+    if not count.isdigit() or unit not in _UNITS or not multiplier.isdigit():
+        raise ValueError(f"Invalid throttle rate: {rate!r}")
+    return int(count), int(multiplier) * _UNITS[unit]
+
+
+def get_rates():
+    """Return the effective ``{"action:scope": rate}`` mapping."""
+    return {**DEFAULT_RATES, **getattr(settings, "DJUST_AUTH_THROTTLE_RATES", {})}
+
+
+def get_client_ip(request):
+    """Return the client address ``request`` came from.
+
+    With ``DJUST_AUTH_THROTTLE_PROXY_COUNT = n`` the address is the n-th
+    ``X-Forwarded-For`` entry from the right: the one the outermost trusted
+    proxy received the request from. Entries further left are set by the
+    client and cannot be trusted.
+    """
+    proxies = getattr(settings, "DJUST_AUTH_THROTTLE_PROXY_COUNT", 0)
+    if proxies:
+        forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+        addrs = [addr.strip() for addr in forwarded.split(",") if addr.strip()]
+        if addrs:
+            return addrs[-min(proxies, len(addrs))]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+# ---- Stores ----
+
+
+class BaseThrottleStore(abc.ABC):
+    """Counter storage for :class:`Throttle`."""
+
+    @abc.abstractmethod
+    def incr(self, key, timeout):
+        """Add one to ``key`` (created at 0, expiring after ``timeout``)."""
+
+    @abc.abstractmethod
+    def get_many(self, keys):
+        """Return ``{key: count}`` for the keys that exist."""
+
+
+class LocalMemoryStore(BaseThrottleStore):
+    """In-process counters, for single-node deployments and tests."""
+
+    def __init__(self):
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            count, expires = self._counts.get(key, (0, 0))
+            if expires <= now:
+                count, expires = 0, now + timeout
+            self._counts[key] = (count + 1, expires)
+            if len(self._counts) > 10000:
+                self._prune(now)
+            return count + 1
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            found = {}
+            for key in keys:
+                count, expires = self._counts.get(key, (0, 0))
+                if expires > now:
+                    found[key] = count
+            return found
+
+    def _prune(self, now):
+        self._counts = {k: v for k, v in self._counts.items() if v[1] > now}
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+
+
+class CacheStore(BaseThrottleStore):
+    """Counters in the djust-auth cache, shared by every process."""
+
+    def incr(self, key, timeout):
+        cache = get_cache()
+        cache.add(key, 0, timeout=timeout)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Expired between add() and incr()
+            cache.set(key, 1, timeout=timeout)
+            return 1
+
+    def get_many(self, keys):
+        return get_cache().get_many(keys)
+
+
+_stores = {}
+
+
+def get_store():
+    """Return the configured store (one instance per dotted path)."""
+    path = getattr(
+        settings, "DJUST_AUTH_THROTTLE_STORE", "djust_auth.throttle.CacheStore"
+    )
+    store = _stores.get(path)
+    if store is None:
+        store = _stores[path] = import_string(path)()
+    return store
+
+
+# ---- Throttle ----
+
+
+class Throttle:
+    """A sliding-window limit of ``limit`` hits per ``window`` seconds."""
+
+    def __init__(self, name, limit, window, store=None):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.store = store or get_store()
+
+    def _keys(self, ident, now):
+        digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+        bucket = int(now // self.window)
+        prefix = f"djust_auth:throttle:{self.name}:{digest}"
+        return f"{prefix}:{bucket}", f"{prefix}:{bucket - 1}"
+
+    def _estimate(self, current, previous, now):
+        overlap = 1 - (now % self.window) / self.window
+        return current + previous * overlap
+
+    def hit(self, ident, now=None):
+        """Count a hit for ``ident``; return the :meth:`usage` afterwards."""
+        now = time.time() if now is None else now
+        current_key, previous_key = self._keys(ident, now)
+        current = self.store.incr(current_key, timeout=self.window * 2)
+        previous = self.store.get_many([previous_key]).get(previous_key, 0)
+        return self._usage(current, previous, now)
+
+    def usage(self, ident, now=None):
+        """Return ``{"count", "limit", "remaining", "retry_after"}``."""
+        now = time.time() if now is None else now
+        current_key, previous_key = self._keys(ident, now)
+        counts = self.store.get_many([current_key, previous_key])
+        return self._usage(counts.get(current_key, 0), counts.get(previous_key, 0), now)
+
+    def _usage(self, current, previous, now):
+        count = self._estimate(current, previous, now)
+        retry_after = 0
+        if count > self.limit:
+            # Seconds until the previous window's weight drops enough
+            retry_after = math.ceil(self.window - now % self.window)
+        return {
+            "count": math.floor(count),
+            "limit": self.limit,
+            "remaining": max(self.limit - math.floor(count), 0),
+            "retry_after": retry_after,
+        }
+
+
+def get_throttles(action):
+    """Return ``{scope: Throttle}`` for the enabled limits of ``action``."""
+    throttles = {}
+    for name, rate in get_rates().items():
+        rate_action, _, scope = name.partition(":")
+        if rate_action == action and rate:
+            limit, window = parse_rate(rate)
+            throttles[scope] = Throttle(name, limit, window)
+    return throttles
+
+
+def get_throttle_usage(action, idents):
+    """Return current usage of ``action``'s limits without counting a hit.
+
+    ``idents`` maps scope to identifier (e.g. ``{"ip": "10.0.0.1"}``); the
+    ``global`` scope needs none. Useful for monitoring how close a client
+    or the whole site is to its limits.
+    """
+    idents = {"global": "", **idents}
+    return {
+        scope: throttle.usage(idents[scope])
+        for scope, throttle in get_throttles(action).items()
+        if scope in idents
+    }
+
+
+class ThrottleMixin:
+    """Reject POSTs over the ``throttle_action`` limits with a 429.
+
+    Put it first in the bases so it runs before any other ``dispatch()``.
+    """
+
+    throttle_action = None
+    throttle_username_field = "username"
+
+    def get_throttle_idents(self, request):
+        idents = {"global": "", "ip": get_client_ip(request)}
+        username = request.POST.get(self.throttle_username_field)
+        if username:
+            idents["username"] = username.strip().lower()
+        return idents
+
+    def throttled(self, request, retry_after):
+        response = HttpResponse(
+            "Too many attempts. Please try again later.", status=429
+        )
+        response["Retry-After"] = str(retry_after)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method == "POST" and self.throttle_action:
+            idents = self.get_throttle_idents(request)
+            retry_after = 0
+            for scope, throttle in get_throttles(self.throttle_action).items():
+                if scope in idents:
+                    usage = throttle.hit(idents[scope])
+                    retry_after = max(retry_after, usage["retry_after"])
+            if retry_after:
+                return self.throttled(request, retry_after)
+        return super().dispatch(request, *args, **kwargs)
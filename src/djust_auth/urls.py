@@ -8,6 +8,7 @@ urlpatterns = [
     path("signup/", views.SignupView.as_view(), name="signup"),
     path("login/", views.DjustLoginView.as_view(), name="login"),
     path("logout/", views.logout_view, name="logout"),
+    path("icons.svg", views.icon_sprite, name="icon_sprite"),
 ]
 
 # NOTE: allauth.urls must be included at the project level (not inside
@@ -1,23 +1,41 @@
 from django.conf import settings
 from django.contrib.auth import login, logout
 from django.contrib.auth import views as auth_views
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
 from django.shortcuts import redirect
+from django.views.decorators.http import etag, require_GET
 from django.views.generic import CreateView
 
 from .forms import SignupForm
+from .hashing import HashingLimitMixin
+from .instrumentation import instrument
+from .social import get_icon_sprite
+from .throttle import ThrottleMixin
 
 
-class SignupView(CreateView):
+class SignupView(ThrottleMixin, HashingLimitMixin, CreateView):
     form_class = SignupForm
+    throttle_action = "signup"
     template_name = "djust_auth/signup.html"
 
+    @instrument("views.signup")
     def dispatch(self, request, *args, **kwargs):
         if request.user.is_authenticated:
             return redirect(getattr(settings, "LOGIN_REDIRECT_URL", "/"))
         return super().dispatch(request, *args, **kwargs)
 
     def form_valid(self, form):
-        user = form.save()
+        try:
+            with transaction.atomic():
+                user = form.save()
+        except IntegrityError:
+            # Lost a race with a concurrent signup for the same username or
+            # email; the unique indexes rejected it, so report which one.
+            form.validate_case_insensitive_unique()
+            if form.is_valid():
+                raise
+            return self.form_invalid(form)
         login(self.request, user, backend="django.contrib.auth.backends.ModelBackend")
         return redirect(self.get_success_url())
 
@@ -28,12 +46,28 @@ class SignupView(CreateView):
         )
 
 
-class DjustLoginView(auth_views.LoginView):
+class DjustLoginView(ThrottleMixin, HashingLimitMixin, auth_views.LoginView):
+    throttle_action = "login"
     template_name = "djust_auth/login.html"
     redirect_authenticated_user = True
 
+    @instrument("views.login")
+    def dispatch(self, request, *args, **kwargs):
+        return super().dispatch(request, *args, **kwargs)
+
 
+@instrument("views.logout")
 def logout_view(request):
     logout(request)
     url = getattr(settings, "LOGOUT_REDIRECT_URL", "/")
     return redirect(url)
+
+
+@require_GET
+@etag(lambda request: get_icon_sprite()[1])
+def icon_sprite(request):
+    """Serve the provider icon sprite; its URL is versioned by content hash."""
+    svg, _version = get_icon_sprite()
+    response = HttpResponse(svg, content_type="image/svg+xml")
+    response["Cache-Control"] = "public, max-age=31536000, immutable"
+    return response
@@ -1,6 +1,21 @@
 import django
 from django.conf import settings
 
+try:
+    import allauth  # noqa: F401
+except ImportError:
+    ALLAUTH_APPS = []
+    ALLAUTH_MIDDLEWARE = []
+else:
+    ALLAUTH_APPS = [
+        "allauth",
+        "allauth.account",
+        "allauth.socialaccount",
+        "allauth.socialaccount.providers.github",
+        "allauth.socialaccount.providers.google",
+    ]
+    ALLAUTH_MIDDLEWARE = ["allauth.account.middleware.AccountMiddleware"]
+
 
 def pytest_configure():
     settings.configure(
@@ -15,8 +30,15 @@ def pytest_configure():
             "django.contrib.auth",
             "django.contrib.contenttypes",
             "django.contrib.sessions",
+            *ALLAUTH_APPS,
             "djust_auth",
         ],
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "APP_DIRS": True,
+            }
+        ],
         ROOT_URLCONF="djust_auth.urls",
         LOGIN_URL="/accounts/login/",
         LOGIN_REDIRECT_URL="/dashboard/",
@@ -24,6 +46,7 @@ def pytest_configure():
         MIDDLEWARE=[
             "django.contrib.sessions.middleware.SessionMiddleware",
             "django.contrib.auth.middleware.AuthenticationMiddleware",
+            *ALLAUTH_MIDDLEWARE,
         ],
         DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
     )
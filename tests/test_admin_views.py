@@ -0,0 +1,498 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+pytest.importorskip("allauth")
+pytest.importorskip("djust_admin")
+
+from djust_auth.admin_views import (  # noqa: E402
+    OAuthProvidersView,
+    SocialAccountsExportView,
+    SocialAccountsView,
+)
+from djust_auth import providers as providers_module  # noqa: E402
+from djust_auth.providers import (  # noqa: E402
+    get_provider_config,
+    invalidate_provider_config,
+)
+
+
+class OAuthProvidersViewTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        cache.clear()
+        self.request = RequestFactory().get("/admin/auth/providers/")
+        alice = User.objects.create_user("alice", last_login=timezone.now())
+        bob = User.objects.create_user(
+            "bob", last_login=timezone.now() - timedelta(days=60)
+        )
+        User.objects.create_user("carol")
+        SocialAccount.objects.create(user=alice, provider="github", uid="1")
+        SocialAccount.objects.create(user=bob, provider="github", uid="2")
+        SocialAccount.objects.create(user=alice, provider="google", uid="3")
+
+    def _view(self):
+        view = OAuthProvidersView()
+        view.request = self.request
+        return view
+
+    def test_provider_stats(self):
+        providers = {p["id"]: p for p in self._view()._get_providers(self.request)}
+        self.assertEqual(providers["github"]["account_count"], 2)
+        self.assertEqual(providers["github"]["active_users_30d"], 1)
+        self.assertIsNotNone(providers["github"]["last_linked"])
+        self.assertEqual(providers["google"]["account_count"], 1)
+
+    def test_provider_queries_do_not_scale_with_provider_count(self):
+        from allauth.socialaccount.providers import registry
+
+        many = registry.get_class_list() + [
+            SimpleNamespace(id=f"fake{i}", name=f"Fake {i}") for i in range(10)
+        ]
+        self.addCleanup(invalidate_provider_config)
+        with mock.patch.object(registry, "get_class_list", return_value=many):
+            invalidate_provider_config()
+            with self.assertNumQueries(1):
+                providers = self._view()._get_providers(self.request)
+        self.assertEqual(len(providers), len(many))
+
+    def test_config_snapshot_shared_across_requests(self):
+        with override_settings(
+            SOCIALACCOUNT_PROVIDERS={
+                "github": {
+                    "APP": {"client_id": "abcdefghijklmnop", "secret": "s"},
+                    "SCOPE": ["user:email"],
+                    "VERIFIED_EMAIL": True,
+                }
+            }
+        ):
+            configs = get_provider_config()
+            with mock.patch.object(
+                providers_module, "_compile_provider"
+            ) as compile_provider:
+                self.assertEqual(get_provider_config(), configs)
+            compile_provider.assert_not_called()
+            providers = {
+                p["id"]: p for p in self._view()._get_providers(self.request)
+            }
+        github = providers["github"]
+        self.assertEqual(github["masked_client_id"], "abcdefgh...mnop")
+        self.assertEqual(github["extra_settings"], {"VERIFIED_EMAIL": True})
+        self.assertEqual(
+            github["callback_url"], "http://testserver/accounts/github/login/callback/"
+        )
+        self.assertIn('"SCOPE": ["user:email"]', github["settings_snippet"])
+        self.assertEqual(github["account_count"], 2)
+        # Leaving override_settings recompiles from the original settings
+        self.assertNotEqual(get_provider_config(), configs)
+
+    def test_config_entries_are_plain_copies(self):
+        with override_settings(
+            SOCIALACCOUNT_PROVIDERS={"github": {"VERIFIED_EMAIL": True}}
+        ):
+            (github,) = [c for c in get_provider_config() if c["id"] == "github"]
+            self.assertIs(type(github), dict)
+            self.assertIs(type(github["extra_settings"]), dict)
+            github["extra_settings"]["VERIFIED_EMAIL"] = False
+            github["name"] = "changed"
+            (fresh,) = [c for c in get_provider_config() if c["id"] == "github"]
+        self.assertEqual(fresh["extra_settings"], {"VERIFIED_EMAIL": True})
+        self.assertEqual(fresh["name"], "GitHub")
+
+    def test_config_renders_in_liveview(self):
+        from djust import LiveView
+        from djust.testing import LiveViewTestClient
+
+        class ConfigView(LiveView):
+            template = (
+                "<div dj-root>{% for c in configs %}{{ c.name }}:"
+                "{{ c.extra_settings.VERIFIED_EMAIL }};{% endfor %}</div>"
+            )
+
+            def get_context_data(self, **kwargs):
+                return {"configs": get_provider_config()}
+
+        with override_settings(
+            SOCIALACCOUNT_PROVIDERS={"github": {"VERIFIED_EMAIL": True}}
+        ):
+            client = LiveViewTestClient(ConfigView)
+            with self.assertNoLogs("djust.serialization", "WARNING"):
+                client.mount()
+                html = client.render()
+        self.assertIn("GitHub:True;", html)
+
+    def test_context_totals(self):
+        view = self._view()
+        with mock.patch.object(view, "get_admin_context", return_value={}):
+            with self.assertNumQueries(2):
+                context = view.get_context_data()
+        self.assertEqual(context["total_linked"], 3)
+        self.assertEqual(context["total_oauth_users"], 2)
+        self.assertEqual(context["total_users"], 3)
+        self.assertEqual(context["oauth_percentage"], 66.7)
+
+    def test_context_totals_are_live(self):
+        from djust_auth.stats import get_auth_summary
+
+        get_auth_summary()  # A cached summary must not be used for the totals
+        User.objects.create_user("dave")
+        view = self._view()
+        with mock.patch.object(view, "get_admin_context", return_value={}):
+            context = view.get_context_data()
+        self.assertEqual(context["total_users"], 4)
+        self.assertEqual(context["oauth_percentage"], 50.0)
+
+
+class SocialAccountsViewCursorTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        cache.clear()
+        for i in range(30):
+            user = User.objects.create_user(f"user{i:02d}")
+            SocialAccount.objects.create(
+                user=user, provider="github" if i % 2 else "google", uid=str(i)
+            )
+
+    def _view(self, **attrs):
+        view = SocialAccountsView()
+        view.request = RequestFactory().get("/admin/auth/accounts/")
+        view.pagination_mode = "cursor"
+        view.page_size = 7
+        view.prefetch_next = False
+        for name, value in attrs.items():
+            setattr(view, name, value)
+        return view
+
+    def _render(self, view):
+        with mock.patch.object(view, "get_admin_context", return_value={}):
+            with mock.patch.object(view, "_get_provider_choices", return_value=[]):
+                return view.get_context_data()
+
+    def test_pages_forward_and_back(self):
+        view = self._view(ordering="user__username")
+        seen = []
+        context = self._render(view)
+        self.assertIsNone(context["pagination"]["count"])
+        while True:
+            seen.extend(row["username"] for row in context["rows"])
+            if not context["pagination"]["has_next"]:
+                break
+            view.go_to_page(context["pagination"]["next_page_number"])
+            context = self._render(view)
+        self.assertEqual(seen, [f"user{i:02d}" for i in range(30)])
+        self.assertEqual(view.current_page, 5)
+
+        view.go_to_page(4)
+        context = self._render(view)
+        self.assertEqual(
+            [row["username"] for row in context["rows"]],
+            [f"user{i:02d}" for i in range(21, 28)],
+        )
+        self.assertTrue(context["pagination"]["has_previous"])
+
+    def test_ordering_limited_to_sortable_fields(self):
+        from djust_auth.pagination import decode_cursor
+
+        view = self._view(ordering="user__username")
+        view.sort_by("user__password")
+        self.assertEqual(view.ordering, "user__username")
+
+        view = self._view(ordering="user__password")
+        context = self._render(view)
+        self.assertTrue(context["pagination"]["has_next"])
+        # Falls back to pk order; no other field is encoded in the cursor
+        _direction, value, pk = decode_cursor(view.next_cursor)
+        self.assertEqual(value, pk)
+
+    def test_filters_reset_cursor(self):
+        view = self._view()
+        self._render(view)
+        view.go_to_page(2)
+        self.assertTrue(view.cursor)
+        view.filter_by_provider("github")
+        self.assertEqual((view.cursor, view.current_page), ("", 1))
+        context = self._render(view)
+        self.assertEqual({row["provider"] for row in context["rows"]}, {"github"})
+
+
+class SocialAccountsViewCountTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        cache.clear()
+        for i in range(12):
+            user = User.objects.create_user(f"user{i:02d}")
+            SocialAccount.objects.create(user=user, provider="github", uid=str(i))
+
+    def _render(self, **attrs):
+        view = SocialAccountsView()
+        view.request = RequestFactory().get("/admin/auth/accounts/")
+        view.page_size = 5
+        view.prefetch_next = False
+        for name, value in attrs.items():
+            setattr(view, name, value)
+        with mock.patch.object(view, "get_admin_context", return_value={}):
+            with mock.patch.object(view, "_get_provider_choices", return_value=[]):
+                return view.get_context_data()
+
+    def test_exact_count_runs_one_count(self):
+        with self.assertNumQueries(2):
+            pagination = self._render()["pagination"]
+        self.assertEqual(pagination["count_display"], "12")
+        self.assertEqual(pagination["num_pages"], 3)
+
+    def test_capped_count(self):
+        context = self._render(count_strategy="capped", count_cap=8, current_page=2)
+        pagination = context["pagination"]
+        self.assertEqual(pagination["count_display"], "8+")
+        self.assertIsNone(pagination["num_pages"])
+        self.assertTrue(pagination["has_next"])
+        self.assertEqual(len(context["rows"]), 5)
+
+        pagination = self._render(
+            count_strategy="capped", count_cap=8, current_page=3
+        )["pagination"]
+        self.assertFalse(pagination["has_next"])
+        self.assertTrue(pagination["has_previous"])
+
+
+class SocialAccountsViewRenderTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        cache.clear()
+        for i in range(3):
+            user = User.objects.create_user(f"user{i}", email=f"user{i}@example.com")
+            SocialAccount.objects.create(user=user, provider="github", uid=str(i))
+
+    def _render(self, view):
+        view.prefetch_next = False
+        with mock.patch.object(
+            view, "get_admin_context", return_value={"site_header": "Admin"}
+        ) as admin_context:
+            context = view.get_context_data()
+        return context, admin_context.called
+
+    def test_static_context_only_on_first_render(self):
+        view = SocialAccountsView()
+        view.request = RequestFactory().get("/admin/auth/accounts/")
+        context, called = self._render(view)
+        self.assertTrue(called)
+        self.assertEqual(context["title"], "Social Accounts")
+        self.assertEqual(context["provider_choices"], [{"value": "github", "label": "Github"}])
+        self.assertEqual(context["site_header"], "Admin")
+
+        view._static_assigns_sent = True
+        context, called = self._render(view)
+        self.assertFalse(called)
+        for key in ("title", "provider_choices", "site_header"):
+            self.assertNotIn(key, context)
+        self.assertEqual(len(context["rows"]), 3)
+
+    def test_rows_are_not_shared_across_renders(self):
+        view = SocialAccountsView()
+        view.request = RequestFactory().get("/admin/auth/accounts/")
+        view.page_cache_ttl = 0
+        first = self._render(view)[0]["rows"]
+        for row in first:
+            row["username"] = "changed"
+        view.sort_by("user__username")
+        second = self._render(view)[0]["rows"]
+        self.assertEqual(second[0]["username"], "user0")
+        self.assertEqual(second[0]["email"], "user0@example.com")
+        by_pk = {row["pk"]: row for row in first}
+        for row in second:
+            self.assertEqual(row["date_joined"], by_pk[row["pk"]]["date_joined"])
+
+    def test_row_follows_account_changes(self):
+        view = SocialAccountsView()
+        view.request = RequestFactory().get("/admin/auth/accounts/")
+        view.ordering = "user__username"
+        view.page_cache_ttl = 0
+        before = self._render(view)[0]["rows"][0]
+        User.objects.filter(username="user0").update(username="renamed")
+        rows = {row["pk"]: row for row in self._render(view)[0]["rows"]}
+        self.assertIsNot(rows[before["pk"]], before)
+        self.assertEqual(rows[before["pk"]]["username"], "renamed")
+
+
+class SocialAccountsViewPageCacheTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        cache.clear()
+        self.spawned = []
+        for i in range(12):
+            user = User.objects.create_user(f"user{i:02d}")
+            SocialAccount.objects.create(
+                user=user, provider="github" if i % 2 else "google", uid=str(i)
+            )
+
+    def _view(self, **attrs):
+        view = SocialAccountsView()
+        view.request = RequestFactory().get("/admin/auth/accounts/")
+        view.page_size = 5
+        view.ordering = "user__username"
+        for name, value in attrs.items():
+            setattr(view, name, value)
+        return view
+
+    def _render(self, view):
+        with mock.patch.object(view, "get_admin_context", return_value={}):
+            with mock.patch.object(view, "_get_provider_choices", return_value=[]):
+                with mock.patch("djust_auth.pagination._spawn", self.spawned.append):
+                    return view.get_context_data()
+
+    def _run_prefetch(self):
+        self.assertEqual(len(self.spawned), 1)
+        self.spawned.pop()()
+
+    def _usernames(self, context):
+        return [row["username"] for row in context["rows"]]
+
+    def test_repeated_page_runs_no_queries(self):
+        first = self._render(self._view(search_query=" use "))
+        with self.assertNumQueries(0):
+            again = self._render(self._view(search_query="use"))
+        self.assertEqual(again["rows"], first["rows"])
+        self.assertEqual(again["pagination"], first["pagination"])
+
+        with self.assertNumQueries(2):
+            self._render(self._view(filter_provider="github"))
+
+    def test_prefetches_next_offset_page(self):
+        view = self._view(current_page=2)
+        self._render(view)
+        self._run_prefetch()
+
+        view.go_to_page(3)
+        with self.assertNumQueries(0):
+            context = self._render(view)
+        self.assertEqual(self._usernames(context), ["user10", "user11"])
+        # Last page: nothing to prefetch
+        self.assertEqual(self.spawned, [])
+
+    def test_prefetch_once(self):
+        view = self._view()
+        self._render(view)
+        # In flight: rendering the same page again does not load it twice
+        self._render(view)
+        self._run_prefetch()
+        # Cached: nothing to load
+        self._render(view)
+        self.assertEqual(self.spawned, [])
+
+    def test_prefetch_does_not_schedule_a_render(self):
+        view = self._view()
+        self._render(view)
+        self.assertFalse(getattr(view, "_async_tasks", None))
+
+    def test_prefetches_next_cursor_page(self):
+        view = self._view(pagination_mode="cursor")
+        self._render(view)
+        self._run_prefetch()
+        view.go_to_page(2)
+        with self.assertNumQueries(0):
+            context = self._render(view)
+        self.assertEqual(self._usernames(context), [f"user{i:02d}" for i in range(5, 10)])
+        self.assertTrue(view.next_cursor)
+
+        uncached = self._view(
+            pagination_mode="cursor", page_cache_ttl=0, current_page=2, cursor=view.cursor
+        )
+        self.assertEqual(self._render(uncached)["rows"], context["rows"])
+
+    def test_linking_an_account_clears_pages(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        self._render(self._view())
+        user = User.objects.create_user("aaa")
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialAccount.objects.create(user=user, provider="github", uid="new")
+        context = self._render(self._view())
+        self.assertEqual(self._usernames(context)[0], "aaa")
+        self.assertEqual(context["pagination"]["count"], 13)
+
+    def test_disabled(self):
+        view = self._view(page_cache_ttl=0)
+        self._render(view)
+        self.assertEqual(self.spawned, [])
+        with self.assertNumQueries(2):
+            self._render(view)
+
+
+class SocialAccountsViewSearchTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        for name in ("alice", "alfred", "bob"):
+            user = User.objects.create_user(name, email=f"{name}@example.com")
+            SocialAccount.objects.create(user=user, provider="github", uid=name)
+
+    def _usernames(self, query, **attrs):
+        view = SocialAccountsView()
+        view.search_query = query
+        for name, value in attrs.items():
+            setattr(view, name, value)
+        return sorted(a.user.username for a in view._get_queryset())
+
+    def test_substring_search_by_default(self):
+        self.assertEqual(self._usernames("AL"), ["alfred", "alice"])
+        self.assertEqual(self._usernames("ice"), ["alice"])
+
+    def test_short_queries_are_ignored(self):
+        self.assertEqual(self._usernames("a"), ["alfred", "alice", "bob"])
+
+    def test_prefix_backend(self):
+        backend = "djust_auth.search.PrefixSearchBackend"
+        self.assertEqual(self._usernames("al", search_backend=backend), ["alfred", "alice"])
+        self.assertEqual(self._usernames("ice", search_backend=backend), [])
+
+
+class SocialAccountsExportViewTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        for name in ("alice", "alfred", "bob"):
+            user = User.objects.create_user(name, email=f"{name}@example.com")
+            SocialAccount.objects.create(user=user, provider="github", uid=name)
+
+    def _export(self, **params):
+        request = RequestFactory().get("/admin/auth/accounts/export/", params)
+        response = SocialAccountsExportView().get(request)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_uses_listing_filters(self):
+        response, body = self._export(q="al", ordering="-user__username")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = body.splitlines()
+        self.assertEqual(lines[0], "id,username,email,provider,uid,date_joined,last_login")
+        self.assertEqual([line.split(",")[1] for line in lines[1:]], ["alice", "alfred"])
+
+    def test_csv_neutralizes_formulas(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        user = User.objects.create_user("=cmd", email="@evil.example")
+        SocialAccount.objects.create(user=user, provider="github", uid="-1+1")
+        _, body = self._export(q="cmd")
+        row = body.splitlines()[1].split(",")
+        self.assertEqual(row[1:5], ["'=cmd", "'@evil.example", "github", "'-1+1"])
+
+    def test_jsonl(self):
+        _, body = self._export(format="jsonl", provider="github", ordering="user__password")
+        rows = [json.loads(line) for line in body.splitlines()]
+        # Unknown orderings are ignored; rows fall back to pk order
+        self.assertEqual([row["username"] for row in rows], ["alice", "alfred", "bob"])
+
+    def test_unknown_format(self):
+        request = RequestFactory().get("/", {"format": "xml"})
+        self.assertEqual(SocialAccountsExportView().get(request).status_code, 400)
@@ -0,0 +1,155 @@
+import json
+from datetime import date
+import os
+import tempfile
+from io import StringIO
+
+import pytest
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+pytest.importorskip("allauth")
+
+
+class ImportAuthUsersTest(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.hash = make_password("secret")
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as fh:
+            fh.write(content)
+        return path
+
+    def _import(self, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_auth_users", path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_jsonl_with_social_accounts(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        records = [
+            {"username": "alice", "email": "alice@example.com", "password": self.hash,
+             "is_staff": True,
+             "social_accounts": [{"provider": "github", "uid": "1", "extra_data": {"a": 1}}]},
+            {"username": "bob", "social_accounts": []},
+            {"username": "carol", "password": "plaintext"},
+            {"username": "dave", "email": "not-an-email"},
+        ]
+        path = self._write("users.jsonl", "\n".join(json.dumps(r) for r in records))
+        # Username and account lookups, savepoint, two inserts, release
+        with self.assertNumQueries(6):
+            out, err = self._import(path, "--batch-size", "10")
+
+        self.assertIn("Imported 2 user(s) and 1 social account(s)", out)
+        self.assertIn("Line 3: password must be an already-hashed value", err)
+        self.assertIn("Line 4:", err)
+        alice = User.objects.get(username="alice")
+        self.assertTrue(alice.check_password("secret"))
+        self.assertTrue(alice.is_staff)
+        self.assertFalse(User.objects.get(username="bob").has_usable_password())
+        account = SocialAccount.objects.get()
+        self.assertEqual((account.user, account.extra_data), (alice, {"a": 1}))
+
+    def test_csv_skips_existing_and_duplicate_accounts(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        User.objects.create_user("alice")
+        path = self._write(
+            "users.csv",
+            "username,email,password,social_accounts\n"
+            f"alice,a@example.com,{self.hash},github:1\n"
+            f"bob,b@example.com,{self.hash},github:2;google:2\n"
+            f"carol,c@example.com,{self.hash},github:2\n",
+        )
+        out, err = self._import(path)
+        self.assertIn("skipped 1 existing, 1 error(s)", out)
+        self.assertIn("duplicate social account", err)
+        self.assertEqual(
+            sorted(SocialAccount.objects.values_list("provider", "uid")),
+            [("github", "2"), ("google", "2")],
+        )
+
+    def test_case_insensitive_duplicate_emails(self):
+        User.objects.create_user("alice", "Alice@Example.com")
+        path = self._write(
+            "users.csv",
+            "username,email\n"
+            "bob,alice@example.com\n"
+            "carol,carol@example.com\n"
+            "dave,CAROL@example.com\n"
+            "erin,\n"
+            "frank,\n",
+        )
+        out, err = self._import(path)
+        self.assertIn("Imported 3 user(s)", out)
+        self.assertIn("Line 2: email 'alice@example.com' already exists", err)
+        self.assertIn("Line 4: email 'carol@example.com' is duplicated", err)
+        self.assertEqual(
+            sorted(User.objects.values_list("username", flat=True)),
+            ["alice", "carol", "erin", "frank"],
+        )
+
+    def test_case_insensitive_usernames(self):
+        User.objects.create_user("Alice")
+        path = self._write(
+            "users.csv", "username,email\nalice,\nBob,\nbob,\n"
+        )
+        out, err = self._import(path)
+        self.assertIn("Imported 1 user(s)", out)
+        self.assertIn("Line 4: duplicate username 'bob'", err)
+        self.assertEqual(
+            sorted(User.objects.values_list("username", flat=True)), ["Alice", "Bob"]
+        )
+
+    @override_settings(DJUST_AUTH_ROLLUPS=True)
+    def test_updates_rollups(self):
+        from djust_auth.models import AuthDailyRollup
+        from djust_auth.rollups import rebuild_rollups
+
+        records = [
+            {"username": "alice",
+             "social_accounts": [{"provider": "github", "uid": "1"}]},
+            {"username": "bob", "date_joined": "2020-01-02T12:00:00+00:00"},
+        ]
+        path = self._write("users.jsonl", "\n".join(json.dumps(r) for r in records))
+        self._import(path)
+        today = timezone.localdate()
+
+        def rows():
+            return {
+                (row.day, row.scope): (row.signups, row.links)
+                for row in AuthDailyRollup.objects.all()
+            }
+
+        expected = {
+            (today, "global"): (1, 1),
+            (today, "github"): (1, 1),
+            (date(2020, 1, 2), "global"): (1, 0),
+        }
+        self.assertEqual(rows(), expected)
+        # Counted the way a rebuild counts them
+        rebuild_rollups()
+        self.assertEqual(rows(), expected)
+
+    def test_resumes_from_checkpoint(self):
+        path = self._write(
+            "users.jsonl",
+            "\n".join(json.dumps({"username": f"user{i}"}) for i in range(5)),
+        )
+        checkpoint = os.path.join(self.tmpdir.name, "checkpoint.json")
+        with open(checkpoint, "w") as fh:
+            json.dump({"line": 3}, fh)
+        out, _ = self._import(path, "--checkpoint", checkpoint, "--batch-size", "1")
+        self.assertIn("Resuming after line 3", out)
+        self.assertEqual(
+            sorted(User.objects.values_list("username", flat=True)), ["user3", "user4"]
+        )
+        with open(checkpoint) as fh:
+            self.assertEqual(json.load(fh), {"line": 5})
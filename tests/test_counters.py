@@ -0,0 +1,130 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from djust_auth import counters
+from djust_auth.models import AuthCounter
+
+pytest.importorskip("allauth")
+
+
+class AuthCountersTest(TestCase):
+    def setUp(self):
+        counters.connect_signals()
+        self.addCleanup(counters.disconnect_signals)
+
+    def _counter(self, scope=AuthCounter.GLOBAL):
+        return AuthCounter.objects.get(pk=scope)
+
+    def _link(self, user, provider, uid):
+        from allauth.socialaccount.models import SocialAccount
+
+        return SocialAccount.objects.create(user=user, provider=provider, uid=uid)
+
+    def _snapshot(self):
+        fields = ("users", "staff_users", "superusers", "social_accounts", "oauth_users")
+        return {
+            row["scope"]: tuple(row[f] for f in fields)
+            for row in AuthCounter.objects.values("scope", *fields)
+        }
+
+    def assertMatchesRebuild(self):
+        live = self._snapshot()
+        counters.rebuild_counters()
+        rebuilt = self._snapshot()
+        for scope, values in live.items():
+            self.assertEqual(values, rebuilt.get(scope, (0, 0, 0, 0, 0)), scope)
+
+    def test_user_counts(self):
+        alice = User.objects.create_user("alice")
+        User.objects.create_superuser("root", "root@example.com", "pw")
+        self.assertEqual(self._counter().users, 2)
+        self.assertEqual(self._counter().superusers, 1)
+
+        alice.is_staff = True
+        alice.save()
+        self.assertEqual(self._counter().staff_users, 2)
+
+        alice.save(update_fields=["last_login"])
+        alice.delete()
+        counter = self._counter()
+        self.assertEqual((counter.users, counter.staff_users), (1, 1))
+        self.assertMatchesRebuild()
+
+    def test_social_account_counts(self):
+        alice = User.objects.create_user("alice")
+        bob = User.objects.create_user("bob")
+        self._link(alice, "github", "1")
+        self._link(alice, "github", "2")
+        self._link(alice, "google", "3")
+        bob_account = self._link(bob, "github", "4")
+
+        self.assertEqual(self._counter().social_accounts, 4)
+        self.assertEqual(self._counter().oauth_users, 2)
+        self.assertEqual(self._counter("github").social_accounts, 3)
+        self.assertEqual(self._counter("github").oauth_users, 2)
+        self.assertIsNotNone(self._counter("github").last_linked)
+
+        bob_account.delete()
+        self.assertEqual(self._counter().oauth_users, 1)
+        self.assertMatchesRebuild()
+
+    def test_cascading_user_delete_counts_user_once(self):
+        alice = User.objects.create_user("alice")
+        self._link(alice, "github", "1")
+        self._link(alice, "github", "2")
+        self._link(alice, "google", "3")
+
+        alice.delete()
+        counter = self._counter()
+        self.assertEqual(
+            (counter.users, counter.social_accounts, counter.oauth_users), (0, 0, 0)
+        )
+        self.assertEqual(self._counter("github").oauth_users, 0)
+        self.assertEqual(self._counter("google").oauth_users, 0)
+
+    def test_last_linked_does_not_move_backwards(self):
+        from datetime import timedelta
+
+        alice = User.objects.create_user("alice")
+        latest = self._link(alice, "github", "1").date_joined
+        # e.g. an imported account linked before the existing ones
+        counters._bump(
+            "github", last_linked=latest - timedelta(days=30), social_accounts=1
+        )
+        self.assertEqual(self._counter("github").last_linked, latest)
+
+    def test_rolled_back_delete_is_forgotten(self):
+        from django.db import transaction
+        from django.db.models.signals import pre_delete
+
+        from allauth.socialaccount.models import SocialAccount
+
+        alice = User.objects.create_user("alice")
+        github = self._link(alice, "github", "1")
+        google = self._link(alice, "google", "2")
+
+        def fail(sender, **kwargs):
+            raise RuntimeError
+
+        pre_delete.connect(fail, sender=SocialAccount)
+        try:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                github.delete()
+        finally:
+            pre_delete.disconnect(fail, sender=SocialAccount)
+
+        google.delete()
+        self.assertEqual(counters._pending_deletes(), {})
+        github.delete()
+        self.assertEqual(self._counter().oauth_users, 0)
+        self.assertMatchesRebuild()
+
+    def test_rebuild_command(self):
+        counters.disconnect_signals()
+        User.objects.create_user("alice")
+        call_command("rebuild_auth_counters", stdout=StringIO())
+        self.assertEqual(self._counter().users, 1)
@@ -1,4 +1,9 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from djust_auth.forms import SignupForm
 
@@ -38,3 +43,61 @@ class SignupFormTest(TestCase):
         )
         self.assertFalse(form.is_valid())
         self.assertIn("password2", form.errors)
+
+
+class SignupFormUniquenessTest(TestCase):
+    def setUp(self):
+        User.objects.create_user("Existing", "Existing@Example.com", "x")
+
+    def _form(self, username="newuser", email="new@example.com"):
+        return SignupForm(
+            data={
+                "username": username,
+                "email": email,
+                "password1": "SecurePass123!",
+                "password2": "SecurePass123!",
+            }
+        )
+
+    def test_single_query(self):
+        form = self._form()
+        with self.assertNumQueries(1):
+            self.assertTrue(form.is_valid())
+
+    def test_username_case_insensitive(self):
+        form = self._form(username="existing")
+        self.assertFalse(form.is_valid())
+        self.assertEqual(list(form.errors), ["username"])
+
+    def test_email_case_insensitive(self):
+        form = self._form(email="existing@example.COM")
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["email"], [SignupForm.error_messages["duplicate_email"]])
+
+    def test_both_taken(self):
+        User.objects.create_user("other", "other@example.com", "x")
+        form = self._form(username="EXISTING", email="other@example.com")
+        with self.assertNumQueries(1):
+            self.assertFalse(form.is_valid())
+        self.assertEqual(sorted(form.errors), ["email", "username"])
+
+    def test_database_constraints(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user("EXISTING", "another@example.com", "x")
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.create_user("another", "existing@example.com", "x")
+        # Blank emails are not constrained
+        User.objects.create_user("blank1", "", "x")
+        User.objects.create_user("blank2", "", "x")
+
+    @skipUnless(connection.vendor == "sqlite", "checks SQLite's query plan")
+    def test_lookup_uses_indexes(self):
+        form = self._form()
+        self.assertTrue(form.is_valid())
+        with CaptureQueriesContext(connection) as queries:
+            form.validate_case_insensitive_unique()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + queries[0]["sql"])
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        self.assertIn("USING INDEX djust_auth_user_username_lower", plan)
+        self.assertIn("USING INDEX djust_auth_user_email_lower", plan)
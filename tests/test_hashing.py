@@ -0,0 +1,68 @@
+import threading
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+
+from djust_auth.hashing import HashingBusy, HashingLimiter, get_hashing_limiter
+
+
+class HashingLimiterTest(TestCase):
+    def test_full_queue_rejected_immediately(self):
+        limiter = HashingLimiter(1, max_queue=0, timeout=5)
+        with limiter.slot():
+            with self.assertRaises(HashingBusy):
+                with limiter.slot():
+                    pass
+        stats = limiter.stats()
+        self.assertEqual(stats["rejected"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_waiter_times_out(self):
+        limiter = HashingLimiter(1, max_queue=1, timeout=0.01)
+        with limiter.slot():
+            with self.assertRaises(HashingBusy):
+                with limiter.slot():
+                    pass
+        self.assertEqual(limiter.stats()["timed_out"], 1)
+        self.assertEqual(limiter.stats()["max_queue_depth"], 1)
+
+    def test_waiter_gets_released_slot(self):
+        limiter = HashingLimiter(1, max_queue=1, timeout=5)
+        entered = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with limiter.slot():
+                entered.set()
+                release.wait()
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        entered.wait()
+        threading.Timer(0.05, release.set).start()
+        with limiter.slot():
+            pass
+        thread.join()
+        stats = limiter.stats()
+        self.assertEqual(stats["acquired"], 2)
+        self.assertGreater(stats["wait_seconds_max"], 0)
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(get_hashing_limiter())
+
+
+@override_settings(
+    ROOT_URLCONF="djust_auth.urls",
+    LOGIN_REDIRECT_URL="/dashboard/",
+    DJUST_AUTH_HASHING_LIMIT=1,
+    DJUST_AUTH_HASHING_QUEUE=0,
+)
+class HashingLimitViewTest(TestCase):
+    def test_login_returns_503_when_busy(self):
+        User.objects.create_user(username="alice", password="testpass123")
+        data = {"username": "alice", "password": "testpass123"}
+        limiter = get_hashing_limiter()
+        with limiter.slot():
+            response = Client().post("/login/", data)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(Client().post("/login/", data).status_code, 302)
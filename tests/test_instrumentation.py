@@ -0,0 +1,86 @@
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from djust_auth import instrumentation
+from djust_auth.cache import get_or_refresh
+from djust_auth.instrumentation import hot_path_measured, instrument
+
+
+@instrument("test.path")
+def _cached_lookup():
+    User.objects.count()
+    return get_or_refresh("instrumentation-test", lambda: 1, ttl=60)
+
+
+@override_settings(DJUST_AUTH_INSTRUMENTATION=True)
+class InstrumentationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recorder = instrumentation.get_recorders()[0]
+        self.recorder.reset()
+
+    def test_records_timing_queries_and_cache(self):
+        samples = []
+
+        def listener(sender, sample, **kwargs):
+            samples.append(sample.as_dict())
+
+        hot_path_measured.connect(listener)
+        self.addCleanup(hot_path_measured.disconnect, listener)
+        _cached_lookup()
+        _cached_lookup()
+
+        self.assertEqual(
+            [(s["queries"], s["cache_hits"], s["cache_misses"]) for s in samples],
+            [(1, 0, 1), (1, 1, 0)],
+        )
+        (row,) = self.recorder.stats()
+        self.assertEqual((row["path"], row["calls"]), ("test.path", 2))
+        self.assertEqual(row["cache_hit_rate"], 50.0)
+        self.assertGreaterEqual(row["p99_ms"], row["p50_ms"])
+
+    def test_mixin_and_view_paths(self):
+        from djust_auth.mixins import LoginRequiredLiveViewMixin
+
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        LoginRequiredLiveViewMixin().check_login(request)
+        self.assertEqual(self.client.get("/logout/").status_code, 302)
+        paths = [row["path"] for row in self.recorder.stats()]
+        self.assertEqual(paths, ["mixins.login_required", "views.logout"])
+
+    async def test_async_permission_path(self):
+        from django.contrib.auth.models import Permission
+
+        from djust_auth.mixins import PermissionRequiredLiveViewMixin
+
+        class View(PermissionRequiredLiveViewMixin):
+            permission_required = "auth.view_user"
+
+        user = await User.objects.acreate(username="alice")
+        await user.user_permissions.aadd(
+            await Permission.objects.aget(codename="view_user")
+        )
+        request = RequestFactory().get("/")
+        request.user = await User.objects.aget(pk=user.pk)
+        self.assertTrue(await View().ahas_permission(request))
+        (row,) = self.recorder.stats()
+        self.assertEqual(row["path"], "mixins.permission_required")
+        # The user and group permission queries, run through sync_to_async
+        self.assertEqual(row["avg_queries"], 2)
+
+    def test_recorder_must_implement_record(self):
+        class Incomplete(instrumentation.BaseRecorder):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class InstrumentationDisabledTest(TestCase):
+    def test_nothing_recorded(self):
+        recorder = instrumentation.get_recorders()[0]
+        recorder.reset()
+        _cached_lookup()
+        self.assertEqual(recorder.stats(), [])
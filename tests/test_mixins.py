@@ -1,4 +1,8 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import AnonymousUser, User
+from django.core.exceptions import PermissionDenied
 from django.http import HttpResponse
 from django.test import RequestFactory, TestCase
 from django.views import View
@@ -83,3 +87,88 @@ class PermissionRequiredMixinTest(TestCase):
         request.user = self.user
         response = StubPermView.as_view()(request)
         self.assertEqual(response.status_code, 200)
+
+
+class MultiPermView(StubPermView):
+    permission_required = ["auth.view_user", "auth.change_user"]
+
+
+class PermissionListMixinTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import Permission
+
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="testuser")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_user"))
+
+    def _get(self, view_class, **initkwargs):
+        request = self.factory.get("/protected/")
+        request.user = User.objects.get(pk=self.user.pk)
+        return view_class.as_view(**initkwargs)(request)
+
+    def test_all_required_by_default(self):
+        with self.assertRaises(PermissionDenied):
+            self._get(MultiPermView)
+
+    def test_any_mode(self):
+        response = self._get(MultiPermView, permission_mode="any")
+        self.assertEqual(response.status_code, 200)
+
+    def test_object_level_check(self):
+        seen = []
+
+        class ObjectView(StubPermView):
+            def get_permission_object(self):
+                return "the-object"
+
+        with mock.patch.object(
+            User, "has_perm", side_effect=lambda perm, obj=None: seen.append(obj) or True
+        ):
+            response = self._get(ObjectView)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(seen, ["the-object"])
+
+
+class AsyncStubView(LoginRequiredLiveViewMixin, PermissionRequiredLiveViewMixin, View):
+    permission_required = "auth.view_user"
+
+    async def get(self, request):
+        return HttpResponse("OK")
+
+
+class AsyncMixinTest(TestCase):
+    def setUp(self):
+        from django.contrib.auth.models import Permission
+
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="testuser")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_user"))
+
+    def _request(self, user):
+        request = self.factory.get("/protected/page/")
+
+        async def auser():
+            return user
+
+        # request.user must not be touched on the async path
+        request.auser = auser
+        return request
+
+    def test_async_dispatch_uses_auser(self):
+        user = User.objects.get(pk=self.user.pk)
+        request = self._request(user)
+        response = async_to_sync(AsyncStubView.as_view())(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(request.user, user)
+
+    def test_async_anonymous_redirected_like_sync(self):
+        response = async_to_sync(AsyncStubView.as_view())(self._request(AnonymousUser()))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            response.url, "/accounts/login/?next=%2Fprotected%2Fpage%2F"
+        )
+
+    def test_async_permission_denied(self):
+        user = User.objects.create_user(username="other")
+        with self.assertRaises(PermissionDenied):
+            async_to_sync(AsyncStubView.as_view())(self._request(user))
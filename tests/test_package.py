@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+import djust_auth
+
+
+class LazyReexportTest(SimpleTestCase):
+    def test_all_matches_djust_auth(self):
+        import djust.auth
+
+        self.assertEqual(djust_auth.__all__, djust.auth.__all__)
+
+    def test_names_resolve_from_djust_auth(self):
+        import djust.auth
+
+        self.assertIs(djust_auth.check_view_auth, djust.auth.check_view_auth)
+        self.assertIs(djust_auth.SignupForm, djust.auth.SignupForm)
+        self.assertIn("SignupView", dir(djust_auth))
+
+    def test_unknown_name(self):
+        with self.assertRaises(AttributeError):
+            djust_auth.does_not_exist
+
+    def test_import_does_not_load_djust_auth(self):
+        src = os.path.dirname(os.path.dirname(djust_auth.__file__))
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-W", "ignore",
+                "-c", "import sys, djust_auth; print('djust.auth' in sys.modules)",
+            ],
+            env={**os.environ, "PYTHONPATH": src},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
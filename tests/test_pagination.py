@@ -0,0 +1,145 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from djust_auth.pagination import (
+    COUNT_CAPPED,
+    COUNT_ESTIMATED,
+    COUNT_NONE,
+    KeysetPaginator,
+    PageCache,
+    count_queryset,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        # Duplicate first names force the pk tie-breaker
+        for i in range(10):
+            User.objects.create_user(f"user{i}", first_name=f"name{i % 3}")
+
+    def _walk(self, ordering):
+        paginator = KeysetPaginator(User.objects.all(), ordering, per_page=3)
+        page = paginator.page()
+        pks = []
+        while True:
+            pks.extend(u.pk for u in page)
+            if not page.has_next():
+                return pks, page
+            page = paginator.page(page.next_cursor)
+
+    def test_walk_matches_full_ordering(self):
+        for ordering in ("first_name", "-first_name", "-date_joined", None):
+            pks, _ = self._walk(ordering)
+            field = ordering or "pk"
+            tie = "-pk" if field.startswith("-") else "pk"
+            expected = list(
+                User.objects.order_by(field, tie).values_list("pk", flat=True)
+            )
+            self.assertEqual(pks, expected, ordering)
+
+    def test_previous_cursor(self):
+        paginator = KeysetPaginator(User.objects.all(), "first_name", per_page=3)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual([u.pk for u in back], [u.pk for u in first])
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+
+    def test_invalid_cursor_returns_first_page(self):
+        paginator = KeysetPaginator(User.objects.all(), "pk", per_page=3)
+        self.assertEqual(
+            [u.pk for u in paginator.page("not-a-cursor")],
+            [u.pk for u in paginator.page()],
+        )
+        self.assertIsNone(decode_cursor("bm9wZQ=="))
+        self.assertEqual(decode_cursor(encode_cursor("next", "a", 1)), ("next", "a", 1))
+
+
+class CountQuerysetTest(TestCase):
+    def setUp(self):
+        for i in range(12):
+            User.objects.create_user(f"user{i}")
+
+    def test_exact(self):
+        self.assertEqual(count_queryset(User.objects.all()), (12, True, "12"))
+
+    def test_capped(self):
+        qs = User.objects.all()
+        self.assertEqual(count_queryset(qs, COUNT_CAPPED, cap=10), (10, False, "10+"))
+        self.assertEqual(count_queryset(qs, COUNT_CAPPED, cap=50), (12, True, "12"))
+
+    def test_estimated_falls_back_to_capped_on_sqlite(self):
+        qs = User.objects.all()
+        self.assertIsNone(estimate_count(qs))
+        self.assertEqual(count_queryset(qs, COUNT_ESTIMATED, cap=10), (10, False, "10+"))
+
+    def test_none(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(count_queryset(User.objects.all(), COUNT_NONE).value, None)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            count_queryset(User.objects.all(), "sometimes")
+
+
+class PageCacheTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_loads_once(self):
+        pages = PageCache("test")
+        load = mock.Mock(return_value=[1, 2])
+        self.assertIsNone(pages.get("a"))
+        self.assertEqual(pages.get_or_set("a", load, ttl=30), [1, 2])
+        self.assertEqual(pages.get_or_set("a", load, ttl=30), [1, 2])
+        self.assertEqual(pages.get("a"), [1, 2])
+        load.assert_called_once()
+
+    def test_bounded(self):
+        pages = PageCache("test", max_entries=4)
+        for i in range(20):
+            pages.get_or_set(i, lambda i=i: i, ttl=30)
+        cached = [i for i in range(20) if pages.get(i) is not None]
+        self.assertLessEqual(len(cached), 4)
+        self.assertIn(19, cached)
+        self.assertEqual([pages.get(i) for i in cached], cached)
+
+    def test_prefetch(self):
+        pages = PageCache("test")
+        spawned = []
+        load = mock.Mock(return_value=[1, 2])
+        with mock.patch("djust_auth.pagination._spawn", spawned.append):
+            self.assertTrue(pages.prefetch("a", load, ttl=30))
+            self.assertFalse(pages.prefetch("a", load, ttl=30))
+            (run,) = spawned
+            run()
+            self.assertFalse(pages.prefetch("a", load, ttl=30))
+        self.assertEqual(pages.get("a"), [1, 2])
+        load.assert_called_once()
+
+    def test_clear_reaches_other_instances(self):
+        # Two instances with one name stand in for two worker processes
+        pages, other = PageCache("test"), PageCache("test")
+        pages.get_or_set("a", lambda: 1, ttl=30)
+        self.assertEqual(other.get("a"), 1)
+        other.clear()
+        self.assertIsNone(pages.get("a"))
+        self.assertEqual(pages.get_or_set("a", lambda: 2, ttl=30), 2)
+
+    def test_clear_while_loading_retires_the_page(self):
+        pages = PageCache("test")
+        pages.clear()
+
+        def load():
+            pages.clear()
+            return "old"
+
+        self.assertEqual(pages.get_or_set("a", load, ttl=30), "old")
+        self.assertIsNone(pages.get("a"))
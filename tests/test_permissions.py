@@ -0,0 +1,106 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.contrib.auth.backends import BaseBackend
+from django.test import TestCase, override_settings
+
+from djust_auth.permissions import (
+    ahas_permissions,
+    get_permission_set,
+    has_permissions,
+)
+
+
+class HasPermOnlyBackend(BaseBackend):
+    """Grants one permission through has_perm() alone, like django-rules."""
+
+    def has_perm(self, user_obj, perm, obj=None):
+        return perm == "auth.view_user"
+
+    async def ahas_perm(self, user_obj, perm, obj=None):
+        return self.has_perm(user_obj, perm, obj)
+
+
+@override_settings(DJUST_AUTH_PERMISSION_CACHE_TTL=300)
+class PermissionCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("alice")
+        self.group = Group.objects.create(name="editors")
+        self.view_user = Permission.objects.get(codename="view_user")
+        self.change_user = Permission.objects.get(codename="change_user")
+        self.user.user_permissions.add(self.view_user)
+
+    def _perms(self):
+        # A fresh user object, as in a new request
+        return get_permission_set(User.objects.get(pk=self.user.pk))
+
+    def test_cached_across_user_objects(self):
+        self.assertEqual(self._perms(), {"auth.view_user"})
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(has_permissions(user, ["auth.view_user"]))
+            # Django's own check reuses the primed per-request cache
+            self.assertTrue(user.has_perm("auth.view_user"))
+
+    def test_user_permission_change_invalidates(self):
+        self._perms()
+        self.user.user_permissions.add(self.change_user)
+        self.assertEqual(self._perms(), {"auth.view_user", "auth.change_user"})
+
+    def test_group_changes_invalidate(self):
+        self._perms()
+        self.user.groups.add(self.group)
+        self.group.permissions.add(self.change_user)
+        self.assertIn("auth.change_user", self._perms())
+
+        self.group.user_set.remove(self.user)
+        self.assertNotIn("auth.change_user", self._perms())
+
+    def test_group_delete_invalidates(self):
+        self.user.groups.add(self.group)
+        self.group.permissions.add(self.change_user)
+        self.assertIn("auth.change_user", self._perms())
+        self.group.delete()
+        self.assertNotIn("auth.change_user", self._perms())
+
+
+class HasPermissionsTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_user"))
+        self.user = User.objects.get(pk=self.user.pk)
+
+    def test_all_and_any(self):
+        perms = ["auth.view_user", "auth.change_user"]
+        self.assertFalse(has_permissions(self.user, perms))
+        self.assertTrue(has_permissions(self.user, perms, require_all=False))
+        self.assertTrue(has_permissions(self.user, []))
+
+    def test_inactive_and_superuser(self):
+        self.user.is_active = False
+        self.assertFalse(has_permissions(self.user, "auth.view_user"))
+        root = User(username="root", is_superuser=True)
+        with self.assertNumQueries(0):
+            self.assertTrue(has_permissions(root, ["auth.delete_user"]))
+
+    @override_settings(
+        AUTHENTICATION_BACKENDS=[
+            "django.contrib.auth.backends.ModelBackend",
+            "tests.test_permissions.HasPermOnlyBackend",
+        ]
+    )
+    def test_has_perm_only_backend(self):
+        user = User.objects.create_user("bob")
+        self.assertTrue(has_permissions(user, ["auth.view_user"]))
+        self.assertFalse(has_permissions(user, ["auth.change_user"]))
+        with self.settings(DJUST_AUTH_PERMISSION_CACHE_TTL=300):
+            user = User.objects.get(pk=user.pk)
+            self.assertTrue(has_permissions(user, ["auth.view_user"]))
+
+    @override_settings(
+        AUTHENTICATION_BACKENDS=["tests.test_permissions.HasPermOnlyBackend"]
+    )
+    async def test_has_perm_only_backend_async(self):
+        user = User(username="bob")
+        self.assertTrue(await ahas_permissions(user, ["auth.view_user"]))
+        self.assertFalse(await ahas_permissions(user, ["auth.change_user"]))
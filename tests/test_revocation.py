@@ -0,0 +1,122 @@
+import asyncio
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+from django.contrib.sessions.backends.db import SessionStore
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.views import View
+from djust.decorators import event_handler
+
+from djust_auth.mixins import LoginRequiredLiveViewMixin
+from djust_auth.revocation import check_shared_cache, get_auth_version
+
+
+class BaseEventsView(View):
+    @event_handler
+    def inherited(self):
+        return "inherited"
+
+
+class EventsView(LoginRequiredLiveViewMixin, BaseEventsView):
+    def get(self, request):
+        return HttpResponse("OK")
+
+    @event_handler
+    def increment(self, amount: int = 1):
+        return amount
+
+    @event_handler
+    async def async_increment(self):
+        return "async"
+
+
+class EventAuthGuardTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("alice", password="secret123")
+        self.view = self._mount()
+
+    def _mount(self, session_key=None):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        if session_key is not None:
+            request.session = SessionStore(session_key)
+        view = EventsView()
+        view.setup(request)
+        view.dispatch(request)
+        return view
+
+    def test_events_pass_until_revoked(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.view.increment(amount=2), 2)
+        self.assertEqual(self.view.inherited(), "inherited")
+        self.assertEqual(asyncio.run(self.view.async_increment()), "async")
+
+    def test_handler_metadata_is_kept(self):
+        self.assertIn("event_handler", EventsView.increment._djust_decorators)
+
+    def test_password_change_revokes(self):
+        self.user.set_password("another-secret")
+        self.user.save()
+        with self.assertRaises(PermissionDenied):
+            self.view.increment()
+        with self.assertRaises(PermissionDenied):
+            asyncio.run(self.view.async_increment())
+
+    def test_logout_revokes_that_session(self):
+        self.client.force_login(self.user)
+        view = self._mount(self.client.session.session_key)
+        other = Client()
+        other.force_login(self.user)
+        other_view = self._mount(other.session.session_key)
+
+        self.client.logout()
+        with self.assertRaises(PermissionDenied):
+            view.inherited()
+        self.assertEqual(other_view.increment(), 1)
+
+    def test_privilege_change_revokes(self):
+        self.user.is_staff = True
+        self.user.save(update_fields=["is_staff"])
+        with self.assertRaises(PermissionDenied):
+            self.view.increment()
+
+        view = self._mount()
+        user = User.objects.get(pk=self.user.pk)
+        user.is_staff = False
+        user.save()
+        with self.assertRaises(PermissionDenied):
+            view.increment()
+
+    def test_permission_change_revokes(self):
+        self.user.user_permissions.add(Permission.objects.get(codename="view_user"))
+        with self.assertRaises(PermissionDenied):
+            self.view.increment()
+
+    def test_unrelated_save_keeps_session(self):
+        self.user.first_name = "Alice"
+        self.user.save()
+        self.assertEqual(self.view.increment(), 1)
+
+    def test_evicted_token_revokes(self):
+        before = get_auth_version(self.user.pk)
+        cache.clear()
+        self.assertNotEqual(get_auth_version(self.user.pk), before)
+        with self.assertRaises(PermissionDenied):
+            self.view.increment()
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    def test_warns_for_process_local_cache(self):
+        locmem = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        shared = {"BACKEND": "django.core.cache.backends.db.DatabaseCache"}
+        with override_settings(CACHES={"default": locmem}):
+            self.assertEqual(
+                [w.id for w in check_shared_cache()], ["djust_auth.W001"]
+            )
+        with override_settings(
+            CACHES={"default": locmem, "shared": shared}, DJUST_AUTH_CACHE="shared"
+        ):
+            self.assertEqual(check_shared_cache(), [])
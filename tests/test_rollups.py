@@ -0,0 +1,126 @@
+from datetime import timedelta
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from djust_auth import rollups, stats
+from djust_auth.models import AuthDailyRollup
+
+pytest.importorskip("allauth")
+
+
+def _rows():
+    return {
+        (row.day, row.scope): (row.signups, row.links, row.logins)
+        for row in AuthDailyRollup.objects.all()
+    }
+
+
+class RollupReceiversTest(TestCase):
+    def setUp(self):
+        rollups.connect_signals()
+        self.addCleanup(rollups.disconnect_signals)
+        self.today = timezone.localdate()
+
+    def test_events_are_counted(self):
+        from allauth.account import signals as account_signals
+        from allauth.socialaccount.models import SocialAccount
+
+        alice = User.objects.create_user("alice")
+        self.client.force_login(alice)
+        SocialAccount.objects.create(user=alice, provider="github", uid="1")
+        sociallogin = SimpleNamespace(account=SimpleNamespace(provider="github"))
+        account_signals.user_signed_up.send(
+            sender=User, request=None, user=alice, sociallogin=sociallogin
+        )
+        account_signals.user_logged_in.send(
+            sender=User, request=None, user=alice, sociallogin=sociallogin
+        )
+        # Local signups and logins are not attributed to a provider
+        account_signals.user_logged_in.send(sender=User, request=None, user=alice)
+
+        self.assertEqual(_rows(), {
+            (self.today, "global"): (1, 1, 1),
+            (self.today, "github"): (1, 1, 1),
+        })
+
+    def test_deletes_keep_history(self):
+        User.objects.create_user("alice").delete()
+        self.assertEqual(_rows(), {(self.today, "global"): (1, 0, 0)})
+
+
+class RollupBackfillTest(TestCase):
+    def test_rebuild_from_tables(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        now = timezone.now()
+        today = timezone.localdate()
+        alice = User.objects.create_user("alice", last_login=now)
+        bob = User.objects.create_user("bob")
+        User.objects.filter(pk=bob.pk).update(date_joined=now - timedelta(days=40))
+        SocialAccount.objects.create(user=alice, provider="github", uid="1")
+        SocialAccount.objects.create(user=bob, provider="google", uid="2")
+        out = StringIO()
+        call_command("rebuild_auth_rollups", stdout=out)
+        self.assertIn("Rebuilt 4 auth rollup row(s)", out.getvalue())
+        self.assertEqual(_rows(), {
+            (today, "global"): (1, 2, 1),
+            # SocialAccount.last_login is set on creation
+            (today, "github"): (1, 1, 1),
+            (today, "google"): (0, 1, 1),
+            (today - timedelta(days=40), "global"): (1, 0, 0),
+        })
+
+        # A partial rebuild leaves older days alone
+        AuthDailyRollup.objects.filter(day=today).update(signups=99)
+        self.assertEqual(rollups.rebuild_rollups(days=7), 3)
+        self.assertEqual(len(_rows()), 4)
+        self.assertEqual(_rows()[(today, "global")], (1, 2, 1))
+
+
+class RollupActivityTest(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        AuthDailyRollup.objects.bulk_create([
+            AuthDailyRollup(day=today, scope="global", signups=2, logins=5),
+            AuthDailyRollup(day=today - timedelta(days=10), scope="global", signups=3),
+            AuthDailyRollup(day=today - timedelta(days=60), scope="global", signups=4),
+            AuthDailyRollup(day=today - timedelta(days=100), scope="global", signups=50),
+            AuthDailyRollup(day=today - timedelta(days=1), scope="github", links=1),
+        ])
+
+    def test_windows_and_sparklines(self):
+        with self.assertNumQueries(1):
+            activity = rollups.get_activity()
+        self.assertEqual(
+            [(w["days"], w["signups"], w["logins"]) for w in activity["global"]["windows"]],
+            [(7, 2, 5), (30, 5, 5), (90, 9, 5)],
+        )
+        points = activity["global"]["sparklines"]["signups"].split()
+        self.assertEqual(len(points), rollups.SPARKLINE_DAYS)
+        self.assertEqual(points[-1], "100.0,6.7")
+        self.assertEqual(activity["github"]["windows"][0]["links"], 1)
+
+    @override_settings(DJUST_AUTH_ROLLUPS=True)
+    def test_summary_reads_rollups(self):
+        cache.clear()
+        summary = stats.compute_auth_summary()
+        self.assertEqual(summary["recent_signups"], 2)
+        self.assertEqual(summary["activity"]["windows"][1]["signups"], 5)
+
+    @override_settings(DJUST_AUTH_ROLLUPS=True)
+    def test_provider_stats_skip_activity_join(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        SocialAccount.objects.create(
+            user=User.objects.create_user("alice"), provider="github", uid="1"
+        )
+        with self.assertNumQueries(1):
+            provider_stats = stats.get_provider_stats()
+        self.assertNotIn("active_users_30d", provider_stats["github"])
@@ -0,0 +1,91 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from djust_auth import search
+from djust_auth.models import SocialAccountSearchKey
+
+pytest.importorskip("allauth")
+
+
+@override_settings(DJUST_AUTH_SEARCH_INDEX=True)
+class SearchBackendTest(TestCase):
+    def setUp(self):
+        from allauth.socialaccount.models import SocialAccount
+
+        self.SocialAccount = SocialAccount
+        search.connect_signals()
+        self.addCleanup(search.disconnect_signals)
+        alice = User.objects.create_user("Alice", email="Alice@Example.com")
+        bob = User.objects.create_user("bob", email="bob@example.org")
+        self.alice_gh = SocialAccount.objects.create(user=alice, provider="github", uid="A100")
+        self.bob_gh = SocialAccount.objects.create(user=bob, provider="github", uid="200")
+
+    def _search(self, backend, query):
+        qs = self.SocialAccount.objects.all()
+        return set(search.get_search_backend(backend).filter(qs, query))
+
+    def test_default_backend_is_case_insensitive_substring(self):
+        self.assertIsInstance(
+            search.get_search_backend(), search.IContainsSearchBackend
+        )
+        self.assertEqual(self._search(None, "alice"), {self.alice_gh})
+        self.assertEqual(self._search(None, "example"), {self.alice_gh, self.bob_gh})
+
+    def test_prefix_backend(self):
+        backend = search.PrefixSearchBackend
+        self.assertEqual(self._search(backend, "ali"), {self.alice_gh})
+        self.assertEqual(self._search(backend, "BOB@"), {self.bob_gh})
+        self.assertEqual(self._search(backend, "a100"), {self.alice_gh})
+        self.assertEqual(self._search(backend, "200"), {self.bob_gh})
+        self.assertEqual(self._search(backend, "lice"), set())
+
+    def test_backend_without_lookups(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        with self.assertRaises(ImproperlyConfigured):
+            self._search(search.BaseSearchBackend, "alice")
+
+    def test_search_key_backend_is_case_insensitive(self):
+        backend = "djust_auth.search.SearchKeySearchBackend"
+        self.assertEqual(self._search(backend, "alice@ex"), {self.alice_gh})
+        self.assertEqual(self._search(backend, "a1"), {self.alice_gh})
+        self.assertEqual(self._search(backend, "BO"), {self.bob_gh})
+
+    @override_settings(DJUST_AUTH_SEARCH_TRIGRAM=True)
+    def test_search_key_substring_mode(self):
+        backend = search.SearchKeySearchBackend
+        self.assertEqual(self._search(backend, "example.org"), {self.bob_gh})
+        # Too short for a trigram: prefix match instead
+        self.assertEqual(self._search(backend, "a1"), {self.alice_gh})
+        self.assertEqual(self._search(backend, "00"), set())
+
+    def test_search_key_backend_requires_index(self):
+        from django.core.exceptions import ImproperlyConfigured
+
+        with override_settings(DJUST_AUTH_SEARCH_INDEX=False):
+            with self.assertRaises(ImproperlyConfigured):
+                search.get_search_backend(search.SearchKeySearchBackend)
+
+    def test_keys_follow_user_and_account_changes(self):
+        user = self.alice_gh.user
+        user.email = "new@example.net"
+        user.save()
+        key = SocialAccountSearchKey.objects.get(account_id=self.alice_gh.pk)
+        self.assertEqual(key.email, "new@example.net")
+        self.assertEqual(key.text, "alice new@example.net a100")
+
+        self.alice_gh.delete()
+        self.assertFalse(
+            SocialAccountSearchKey.objects.filter(account_id=self.alice_gh.pk).exists()
+        )
+
+    def test_rebuild_command(self):
+        SocialAccountSearchKey.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_auth_search_index", "--batch-size", "1", stdout=out)
+        self.assertIn("Indexed 2", out.getvalue())
+        self.assertEqual(SocialAccountSearchKey.objects.count(), 2)
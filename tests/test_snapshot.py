@@ -0,0 +1,112 @@
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.views import View
+
+from djust_auth import snapshot
+from djust_auth.mixins import LoginRequiredLiveViewMixin
+
+
+class ProtectedView(LoginRequiredLiveViewMixin, View):
+    def get(self, request):
+        return HttpResponse(request.user.username)
+
+
+@override_settings(
+    AUTHENTICATION_BACKENDS=["django.contrib.auth.backends.ModelBackend"]
+)
+class UserSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        snapshot.connect_signals()
+        self.user = User.objects.create_user("alice", password="secret")
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def _request(self, session=None):
+        request = RequestFactory().get("/")
+        request.session = session or self.client.session
+        snapshot.UserSnapshotMiddleware(lambda r: None)(request)
+        return request
+
+    def test_snapshot_skips_user_table(self):
+        snapshot.get_user_snapshot(self.user.pk)
+        # Only the session is read
+        with self.assertNumQueries(1):
+            request = self._request()
+            response = ProtectedView.as_view()(request)
+        self.assertEqual(response.content, b"alice")
+        self.assertEqual(request.user.get_deferred_fields(), {"password"})
+
+    def test_async_user(self):
+        snapshot.get_user_snapshot(self.user.pk)
+        request = self._request()
+        user = async_to_sync(request.auser)()
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(request.user.pk, user.pk)
+
+    def test_save_invalidates(self):
+        snapshot.get_user_snapshot(self.user.pk)
+        User.objects.filter(pk=self.user.pk).update(first_name="Alice")
+        self.assertEqual(snapshot.get_user_snapshot(self.user.pk).first_name, "")
+        self.user.refresh_from_db()
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(snapshot.get_user_snapshot(self.user.pk).first_name, "Alice")
+
+    def test_password_change_ends_session(self):
+        snapshot.get_user_snapshot(self.user.pk)
+        self.user.set_password("changed")
+        self.user.save()
+        self.assertFalse(self._request().user.is_authenticated)
+
+    def test_password_change_keeps_own_session(self):
+        from django.contrib.auth import update_session_auth_hash
+        from django.contrib.sessions.backends.db import SessionStore
+
+        snapshot.get_user_snapshot(self.user.pk)
+        request = self._request()
+        user = request.user
+        self.assertTrue(user.is_authenticated)
+        # As PasswordChangeView does
+        user.set_password("changed")
+        user.save()
+        update_session_auth_hash(request, user)
+        request.session.save()
+
+        # The next requests: a snapshot miss, then a hit
+        for _ in range(2):
+            session = SessionStore(request.session.session_key)
+            self.assertEqual(self._request(session).user.pk, self.user.pk)
+
+    def test_inactive_user_rejected(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertFalse(self._request().user.is_authenticated)
+        self.assertIsNone(snapshot.CachedModelBackend().get_user(self.user.pk))
+
+    def test_logout_invalidates(self):
+        snapshot.get_user_snapshot(self.user.pk)
+        self.client.logout()
+        self.assertIsNone(cache.get(snapshot._version_key(self.user.pk)))
+
+    def test_missing_user(self):
+        self.assertIsNone(snapshot.get_user_snapshot(self.user.pk + 100))
+        self.assertIsNone(snapshot.get_user_snapshot("not-a-pk"))
+
+
+@override_settings(AUTHENTICATION_BACKENDS=["djust_auth.snapshot.CachedModelBackend"])
+class CachedModelBackendTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("bob", password="secret")
+
+    def test_session_user_from_snapshot(self):
+        client = Client()
+        client.force_login(self.user)
+        self.assertEqual(client.get("/signup/").status_code, 302)
+        # Warm: session read only, no user query
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get("/signup/").status_code, 302)
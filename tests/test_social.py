@@ -0,0 +1,229 @@
+from unittest import mock
+
+import pytest
+from django.conf import settings
+from django.test import RequestFactory, TestCase, override_settings
+
+from djust_auth import social
+
+pytest.importorskip("allauth")
+
+
+class SocialAuthProvidersTest(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        social.invalidate_provider_cache()
+
+    def test_lists_installed_providers(self):
+        providers = social.social_auth_providers(self.request)["oauth_providers"]
+        names = [p["name"] for p in providers]
+        self.assertEqual(sorted(names), ["github", "google"])
+        github = next(p for p in providers if p["name"] == "github")
+        self.assertEqual(github["label"], "GitHub")
+        self.assertIn("<svg", github["icon"])
+        self.assertTrue(github["login_url"])
+
+    def test_provider_list_is_shared_across_requests(self):
+        first = social.social_auth_providers(self.request)["oauth_providers"]
+        with mock.patch.object(
+            social, "_build_provider_list", wraps=social._build_provider_list
+        ) as build:
+            second = social.social_auth_providers(self.request)["oauth_providers"]
+        self.assertEqual(first, second)
+        build.assert_not_called()
+
+    def test_entries_are_copies(self):
+        providers = social.get_oauth_providers()
+        self.assertIsInstance(providers, tuple)
+        self.assertIs(type(providers[0]), dict)
+        providers[0]["label"] = "Changed"
+        self.assertNotEqual(social.get_oauth_providers()[0]["label"], "Changed")
+
+    def test_rebuilt_when_settings_change(self):
+        first = social.get_oauth_providers()
+        with override_settings(SOCIALACCOUNT_PROVIDERS={"github": {}}):
+            cached = social._provider_cache
+            self.assertEqual(social.get_oauth_providers(), first)
+            self.assertIsNot(social._provider_cache, cached)
+
+    def test_rebuilt_when_settings_edited_in_place(self):
+        with override_settings(SOCIALACCOUNT_PROVIDERS={"github": {}}):
+            social.get_oauth_providers()
+            cached = social._provider_cache
+            settings.SOCIALACCOUNT_PROVIDERS["github"]["SCOPE"] = ["user:email"]
+            social.get_oauth_providers()
+            self.assertIsNot(social._provider_cache, cached)
+
+    def test_invalidate_and_warm(self):
+        first = social.get_oauth_providers()
+        social.invalidate_provider_cache()
+        self.assertIsNone(social._provider_cache)
+        warmed = social.warm_provider_cache()
+        self.assertIsNotNone(social._provider_cache)
+        self.assertEqual(warmed, first)
+
+
+class LazySocialAuthProvidersTest(TestCase):
+    def setUp(self):
+        self.request = RequestFactory().get("/")
+        social.invalidate_provider_cache()
+
+    def test_unread_value_does_no_work(self):
+        with mock.patch.object(social, "get_oauth_providers") as get_providers:
+            context = social.lazy_social_auth_providers(self.request)
+        get_providers.assert_not_called()
+        self.assertIsInstance(context["oauth_providers"], social.LazyProviderList)
+
+    def test_resolves_once_on_iteration(self):
+        lazy = social.lazy_social_auth_providers(self.request)["oauth_providers"]
+        with mock.patch.object(
+            social, "get_oauth_providers", wraps=social.get_oauth_providers
+        ) as get_providers:
+            names = [p["name"] for p in lazy]
+            self.assertTrue(lazy)
+            self.assertEqual(len(lazy), len(names))
+            self.assertEqual(lazy[0]["name"], names[0])
+        get_providers.assert_called_once()
+
+    def test_renders_in_template(self):
+        from django.template import Context, Template
+
+        template = Template(
+            "{% if oauth_providers %}{% for p in oauth_providers %}"
+            "{{ p.label }};{% endfor %}{% endif %}"
+        )
+        context = social.lazy_social_auth_providers(self.request)
+        rendered = template.render(Context(context))
+        self.assertIn("GitHub;", rendered)
+        self.assertIn("Google;", rendered)
+
+
+def _templates(processor):
+    return [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "APP_DIRS": True,
+            "OPTIONS": {"context_processors": [f"djust_auth.social.{processor}"]},
+        }
+    ]
+
+
+class LiveViewRenderTest(TestCase):
+    def setUp(self):
+        social.invalidate_provider_cache()
+
+    def _render(self):
+        from djust import LiveView
+        from djust.testing import LiveViewTestClient
+
+        class ButtonsView(LiveView):
+            template = (
+                "<div dj-root>{% for p in oauth_providers %}"
+                '<a href="{{ p.login_url }}">{{ p.label }}</a>{% endfor %}</div>'
+            )
+
+        client = LiveViewTestClient(ButtonsView)
+        with self.assertNoLogs("djust.serialization", "WARNING"):
+            client.mount()
+            return client.render()
+
+    def test_renders_buttons(self):
+        with override_settings(TEMPLATES=_templates("social_auth_providers")):
+            html = self._render()
+        self.assertIn(">GitHub</a>", html)
+        self.assertIn(">Google</a>", html)
+
+    def test_lazy_renders_buttons(self):
+        with override_settings(TEMPLATES=_templates("lazy_social_auth_providers")):
+            html = self._render()
+        self.assertIn(">GitHub</a>", html)
+        self.assertIn(">Google</a>", html)
+
+    def test_lazy_value_unread_by_the_view(self):
+        from djust import LiveView
+        from djust.testing import LiveViewTestClient
+
+        class PlainView(LiveView):
+            template = "<div dj-root>hello</div>"
+
+        with override_settings(TEMPLATES=_templates("lazy_social_auth_providers")):
+            with mock.patch.object(social, "get_oauth_providers") as get_providers:
+                with self.assertNoLogs("djust.serialization", "WARNING"):
+                    client = LiveViewTestClient(PlainView)
+                    client.mount()
+                    client.render()
+        get_providers.assert_not_called()
+
+
+class IconSpriteTest(TestCase):
+    def setUp(self):
+        self.addCleanup(social.invalidate_provider_cache)
+        social.invalidate_provider_cache()
+
+    @override_settings(
+        DJUST_AUTH_ICON_MODE="sprite", DJUST_AUTH_ICON_SPRITE_URL="/auth/icons.svg"
+    )
+    def test_sprite_mode_references_symbols(self):
+        github = next(p for p in social.get_oauth_providers() if p["name"] == "github")
+        version = social.get_icon_sprite()[1]
+        self.assertIn(
+            f'<use href="/auth/icons.svg?v={version}#djust-auth-github"/>', github["icon"]
+        )
+        self.assertNotIn("<path", github["icon"])
+
+    def test_inline_without_resolvable_sprite_url(self):
+        with override_settings(DJUST_AUTH_ICON_MODE="sprite"):
+            github = next(
+                p for p in social.get_oauth_providers() if p["name"] == "github"
+            )
+        self.assertIn("<path", github["icon"])
+
+    def test_absolute_sprite_url_falls_back_to_inline(self):
+        # Even a host in ALLOWED_HOSTS may not be the one serving the page
+        for url in (
+            "https://cdn.example.net/icons.svg",
+            "//example.com/icons.svg",
+        ):
+            with self.subTest(url=url), override_settings(
+                DJUST_AUTH_ICON_MODE="sprite",
+                DJUST_AUTH_ICON_SPRITE_URL=url,
+                ALLOWED_HOSTS=["example.com", "cdn.example.net"],
+            ):
+                social.invalidate_provider_cache()
+                providers = social.get_oauth_providers()
+                icon = next(p for p in providers if p["name"] == "github")["icon"]
+                self.assertIn("<path", icon)
+                self.assertNotIn("<use", icon)
+
+    def test_sprite_view(self):
+        svg, version = social.get_icon_sprite()
+        response = self.client.get("/icons.svg")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/svg+xml")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response.content, svg)
+        self.assertEqual(svg.count(b"<symbol "), len(social._PROVIDER_META))
+        response = self.client.get("/icons.svg", HTTP_IF_NONE_MATCH=f'"{version}"')
+        self.assertEqual(response.status_code, 304)
+
+
+class OAuthButtonsFragmentTest(TestCase):
+    def setUp(self):
+        self.addCleanup(social.invalidate_provider_cache)
+        social.invalidate_provider_cache()
+
+    def test_fragment_cached_per_provider_set(self):
+        from django.template import Context, Template
+
+        template = Template("{% load djust_auth_social %}{% oauth_buttons %}")
+        html = template.render(Context())
+        self.assertIn("Continue with GitHub", html)
+        with mock.patch(
+            "django.template.loader.render_to_string", side_effect=AssertionError
+        ):
+            self.assertEqual(template.render(Context()), html)
+
+        github_only = [p for p in social.get_oauth_providers() if p["name"] == "github"]
+        html = social.render_oauth_buttons(github_only)
+        self.assertIn("Continue with GitHub", html)
+        self.assertNotIn("Google", html)
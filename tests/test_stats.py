@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from djust_auth import cache as auth_cache
+from djust_auth import stats
+
+pytest.importorskip("allauth")
+
+
+class AuthSummaryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        from allauth.socialaccount.models import SocialAccount
+
+        alice = User.objects.create_user("alice", is_staff=True)
+        User.objects.create_superuser("root", "root@example.com", "pw")
+        old = User.objects.create_user("old")
+        User.objects.filter(pk=old.pk).update(
+            date_joined=timezone.now() - timedelta(days=30)
+        )
+        SocialAccount.objects.create(user=alice, provider="github", uid="1")
+        SocialAccount.objects.create(user=alice, provider="google", uid="2")
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            summary = stats.compute_auth_summary()
+        self.assertEqual(summary, {
+            "total_users": 3,
+            "recent_signups": 2,
+            "staff_users": 2,
+            "superusers": 1,
+            "oauth_users": 1,
+            "oauth_providers": 2,
+        })
+
+    def test_summary_is_cached(self):
+        first = stats.get_auth_summary()
+        User.objects.create_user("bob")
+        with self.assertNumQueries(0):
+            second = stats.get_auth_summary()
+        self.assertEqual(first, second)
+        second["widget"] = object()
+        self.assertNotIn("widget", stats.get_auth_summary())
+
+    @override_settings(DJUST_AUTH_STATS_TTL=0)
+    def test_ttl_zero_disables_cache(self):
+        stats.get_auth_summary()
+        User.objects.create_user("bob")
+        self.assertEqual(stats.get_auth_summary()["total_users"], 4)
+
+
+class GetOrRefreshTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stale_value_served_while_refreshing_once(self):
+        compute = mock.Mock(side_effect=[1, 2])
+        self.assertEqual(auth_cache.get_or_refresh("k", compute, 10, 60), 1)
+        # Mark the entry as past its freshness deadline
+        cache.set("k", (0, 1), 60)
+
+        spawned = []
+        with mock.patch.object(auth_cache, "_spawn", spawned.append):
+            self.assertEqual(auth_cache.get_or_refresh("k", compute, 10, 60), 1)
+            self.assertEqual(auth_cache.get_or_refresh("k", compute, 10, 60), 1)
+        self.assertEqual(len(spawned), 1)
+
+        spawned[0]()
+        self.assertEqual(auth_cache.get_or_refresh("k", compute, 10, 60), 2)
+        self.assertEqual(compute.call_count, 2)
+
+
+@override_settings(DJUST_AUTH_COUNTERS=True)
+class CounterBackedStatsTest(TestCase):
+    def setUp(self):
+        from djust_auth.counters import rebuild_counters
+
+        cache.clear()
+        from allauth.socialaccount.models import SocialAccount
+
+        alice = User.objects.create_user("alice", is_staff=True)
+        SocialAccount.objects.create(user=alice, provider="github", uid="1")
+        rebuild_counters()
+
+    def test_summary_reads_counters(self):
+        with self.assertNumQueries(1):
+            summary = stats.compute_auth_summary()
+        self.assertEqual(summary["total_users"], 1)
+        self.assertEqual(summary["staff_users"], 1)
+        self.assertEqual(summary["oauth_users"], 1)
+        # No scan for the 7-day window without rollups
+        self.assertIsNone(summary["recent_signups"])
+
+    @override_settings(DJUST_AUTH_ROLLUPS=True)
+    def test_recent_signups_from_rollups(self):
+        from djust_auth.rollups import rebuild_rollups
+
+        rebuild_rollups()
+        with self.assertNumQueries(2):
+            summary = stats.compute_auth_summary()
+        self.assertEqual(summary["recent_signups"], 1)
+
+    def test_rollups_required(self):
+        from djust_auth.counters import check_rollups_enabled
+
+        self.assertEqual([w.id for w in check_rollups_enabled()], ["djust_auth.W002"])
+        with override_settings(DJUST_AUTH_ROLLUPS=True):
+            self.assertEqual(check_rollups_enabled(), [])
+        with override_settings(DJUST_AUTH_COUNTERS=False):
+            self.assertEqual(check_rollups_enabled(), [])
+
+    def test_provider_stats_read_counters(self):
+        provider_stats = stats.get_provider_stats()
+        self.assertEqual(provider_stats["github"]["account_count"], 1)
+        self.assertEqual(provider_stats["github"]["active_users_30d"], 0)
+
+
+class LinkedProvidersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        from allauth.socialaccount.models import SocialAccount
+
+        self.SocialAccount = SocialAccount
+        self.user = User.objects.create_user("alice")
+        SocialAccount.objects.create(user=self.user, provider="google", uid="1")
+
+    def test_cached_until_accounts_change(self):
+        self.assertEqual(stats.get_linked_providers(), ("google",))
+        with self.assertNumQueries(0):
+            self.assertEqual(stats.get_linked_providers(), ("google",))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            account = self.SocialAccount.objects.create(
+                user=self.user, provider="github", uid="2"
+            )
+        self.assertEqual(stats.get_linked_providers(), ("github", "google"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            account.delete()
+        self.assertEqual(stats.get_linked_providers(), ("google",))
+
+    def test_updates_do_not_invalidate(self):
+        account = self.SocialAccount.objects.get()
+        stats.get_linked_providers()
+        with self.captureOnCommitCallbacks() as callbacks:
+            account.save()
+        self.assertEqual(callbacks, [])
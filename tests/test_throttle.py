@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import Client, RequestFactory, TestCase, override_settings
+
+from djust_auth import throttle
+from djust_auth.throttle import LocalMemoryStore, Throttle, get_client_ip, parse_rate
+
+
+class ThrottleTest(TestCase):
+    def setUp(self):
+        self.throttle = Throttle("test", limit=3, window=60, store=LocalMemoryStore())
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/m"), (10, 60))
+        self.assertEqual(parse_rate("5/30s"), (5, 30))
+        with self.assertRaises(ValueError):
+            parse_rate("ten/m")
+
+    def test_limit_within_window(self):
+        for _ in range(3):
+            self.assertEqual(self.throttle.hit("a", now=600)["retry_after"], 0)
+        usage = self.throttle.hit("a", now=600)
+        self.assertGreater(usage["retry_after"], 0)
+        self.assertEqual(usage["remaining"], 0)
+        # Other identifiers are unaffected
+        self.assertEqual(self.throttle.hit("b", now=600)["count"], 1)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(4):
+            self.throttle.hit("a", now=659)
+        # 45s into the next window a quarter of the old hits still count
+        self.assertEqual(self.throttle.usage("a", now=705)["count"], 1)
+        self.assertEqual(self.throttle.usage("a", now=780)["count"], 0)
+
+    def test_store_must_implement_counters(self):
+        class IncompleteStore(throttle.BaseThrottleStore):
+            def incr(self, key, timeout):
+                return 1
+
+        with self.assertRaises(TypeError):
+            IncompleteStore()
+
+    def test_client_ip(self):
+        request = RequestFactory().get(
+            "/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="6.6.6.6, 1.2.3.4"
+        )
+        self.assertEqual(get_client_ip(request), "10.0.0.1")
+        with self.settings(DJUST_AUTH_THROTTLE_PROXY_COUNT=1):
+            self.assertEqual(get_client_ip(request), "1.2.3.4")
+        with self.settings(DJUST_AUTH_THROTTLE_PROXY_COUNT=2):
+            self.assertEqual(get_client_ip(request), "6.6.6.6")
+
+
+@override_settings(
+    ROOT_URLCONF="djust_auth.urls",
+    LOGIN_REDIRECT_URL="/dashboard/",
+    DJUST_AUTH_THROTTLE_STORE="djust_auth.throttle.LocalMemoryStore",
+    DJUST_AUTH_THROTTLE_RATES={"login:username": "2/m", "signup:ip": "1/h"},
+)
+class ThrottledViewsTest(TestCase):
+    def setUp(self):
+        throttle.get_store().clear()
+        self.addCleanup(throttle.get_store().clear)
+        User.objects.create_user(username="alice", password="testpass123")
+
+    def test_login_rejected_before_authentication(self):
+        client = Client()
+        for _ in range(2):
+            response = client.post(
+                "/login/", {"username": "alice", "password": "testpass123"}
+            )
+            self.assertEqual(response.status_code, 302)
+        # AuthenticationForm looks authenticate up in its own module
+        with mock.patch("django.contrib.auth.forms.authenticate") as authenticate:
+            response = client.post(
+                "/login/", {"username": "Alice", "password": "testpass123"}
+            )
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+        authenticate.assert_not_called()
+
+        usage = throttle.get_throttle_usage("login", {"username": "alice"})
+        self.assertEqual(usage["username"]["remaining"], 0)
+
+    def test_signup_per_ip(self):
+        data = {
+            "username": "newuser",
+            "email": "new@example.com",
+            "password1": "SecurePass123!",
+            "password2": "SecurePass123!",
+        }
+        self.assertEqual(Client().post("/signup/", data).status_code, 302)
+        data["username"] = "another"
+        self.assertEqual(Client().post("/signup/", data).status_code, 429)
+        self.assertFalse(User.objects.filter(username="another").exists())
+
+
+@override_settings(
+    ROOT_URLCONF="djust_auth.urls",
+    DJUST_AUTH_THROTTLE_STORE="djust_auth.throttle.LocalMemoryStore",
+)
+class ThrottleDefaultsTest(TestCase):
+    def test_off_by_default(self):
+        self.assertEqual(throttle.get_throttles("login"), {})
+        self.assertEqual(throttle.get_throttles("signup"), {})
@@ -1,3 +1,5 @@
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.test import Client, TestCase, override_settings
 
@@ -37,6 +39,32 @@ class SignupViewTest(TestCase):
         )
         self.assertRedirects(response, "/dashboard/", fetch_redirect_response=False)
 
+    def test_signup_race_reports_field_error(self):
+        from django.http import HttpResponse
+
+        from djust_auth.forms import SignupForm
+        from djust_auth.views import SignupView
+
+        User.objects.create_user("taken", "taken@example.com", "x")
+        # Simulate a concurrent signup winning after validation passed
+        with mock.patch.object(
+            SignupForm, "validate_unique", lambda self: None
+        ), mock.patch.object(
+            SignupView, "form_invalid", return_value=HttpResponse()
+        ) as form_invalid:
+            Client().post(
+                "/signup/",
+                {
+                    "username": "taken",
+                    "email": "new@example.com",
+                    "password1": "SecurePass123!",
+                    "password2": "SecurePass123!",
+                },
+            )
+        (form,), _ = form_invalid.call_args
+        self.assertEqual(list(form.errors), ["username"])
+        self.assertFalse(User.objects.filter(email="new@example.com").exists())
+
 
 @override_settings(
     ROOT_URLCONF="djust_auth.urls",